@@ -0,0 +1 @@
+"""Performance benchmarks for the feed tick and the strategy loop."""
@@ -0,0 +1,108 @@
+"""Compare dict-based and typed decoding of DEX Screener responses.
+
+The dict path is what the scanner did before ``src.api.schemas``:
+``json.loads`` the body, then walk every pair with ``.get()``/``float()``
+chains. The typed path decodes the bytes straight into ``Pair`` structs::
+
+    python -m benchmarks.decoding                  # 30, 1000 and 5000 pairs
+    python -m benchmarks.decoding --pairs 20000
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.api.schemas import decode_pairs
+from src.bot.feeds import TokenData, parse_pair
+
+from .fakes import FakeProviderTransport, mint
+from .run import measure
+
+PAIRS = (30, 1_000, 5_000)
+
+
+def response_body(pairs: int) -> bytes:
+    """A ``/dex/tokens`` style body with ``pairs`` realistic pairs."""
+    fake = FakeProviderTransport(pairs)
+    body = []
+    for i in range(pairs):
+        pair = fake._pair(mint(i))
+        # Fields real responses carry that the scanner never reads
+        pair.update({
+            "dexId": "raydium", "url": f"https://dexscreener.com/solana/{mint(i)}",
+            "pairAddress": f"Pair{i:08d}", "priceNative": pair["priceUsd"],
+            "quoteToken": {"address": "So11111111111111111111111111111111111111112",
+                           "name": "Wrapped SOL", "symbol": "SOL"},
+            "txns": {"m5": {"buys": i % 50, "sells": i % 40}, "h24": {"buys": i, "sells": i}},
+            "fdv": 1e6 + i, "marketCap": 1e6 + i, "pairCreatedAt": 1_700_000_000_000 + i,
+            "info": {"imageUrl": "https://example.invalid/x.png", "websites": [], "socials": []},
+        })
+        body.append(pair)
+    return json.dumps({"schemaVersion": "1.0.0", "pairs": body}).encode()
+
+
+def dict_pair_to_token(pair: Dict[str, Any]) -> Optional[TokenData]:
+    """The scanner's previous dict walk, kept as the benchmark reference."""
+    if pair.get("chainId") != "solana":
+        return None
+    base_token = pair.get("baseToken", {})
+    if not base_token or not base_token.get("address"):
+        return None
+    volume = pair.get("volume", {})
+    liquidity = pair.get("liquidity", {})
+    price_change = pair.get("priceChange", {})
+    return TokenData(
+        address=base_token.get("address", ""),
+        symbol=base_token.get("symbol", ""),
+        name=base_token.get("name", ""),
+        price=float(pair.get("priceUsd", 0) or 0),
+        price_change_5m=float(price_change.get("m5", 0) or 0) if isinstance(price_change, dict) else 0,
+        volume_5m=float(volume.get("m5", 0) or 0) if isinstance(volume, dict) else 0,
+        volume_24h=float(volume.get("h24", 0) or 0) if isinstance(volume, dict) else 0,
+        liquidity=float(liquidity.get("usd", 0) or 0) if isinstance(liquidity, dict) else 0,
+        created_at=(
+            datetime.fromtimestamp(pair["pairCreatedAt"] / 1000) if pair.get("pairCreatedAt") else None
+        ),
+    )
+
+
+def decode_dicts(body: bytes) -> List[TokenData]:
+    pairs = json.loads(body).get("pairs") or []
+    return [t for t in map(dict_pair_to_token, pairs) if t is not None]
+
+
+def decode_typed(body: bytes) -> List[TokenData]:
+    return [t for t in map(parse_pair, decode_pairs(body)) if t is not None]
+
+
+async def bench(pairs: int, iterations: int) -> Dict[str, Dict[str, float]]:
+    body = response_body(pairs)
+
+    async def dicts() -> None:
+        decode_dicts(body)
+
+    async def typed() -> None:
+        decode_typed(body)
+
+    return {"dict": await measure(dicts, iterations), "typed": await measure(typed, iterations)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, nargs="+", default=list(PAIRS))
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'pairs':>7} {'path':<6} {'p50 ms':>9} {'peak KB':>10} {'speedup':>8}")
+    for pairs in args.pairs:
+        results = asyncio.run(bench(pairs, args.iterations))
+        speedup = results["dict"]["p50_ms"] / max(results["typed"]["p50_ms"], 1e-9)
+        for path, r in results.items():
+            shown = f"{speedup:.1f}x" if path == "typed" else ""
+            print(f"{pairs:>7} {path:<6} {r['p50_ms']:>9.3f} {r['alloc_peak_kb']:>10.1f} {shown:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""In-process fake providers and a pre-populated token universe."""
+
+import random
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.api.transport import HttpTransport
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import Position, TradingEngine
+
+
+def mint(i: int) -> str:
+    return f"Mint{i:08d}"
+
+
+class FakeProviderTransport(HttpTransport):
+    """Answers DEX Screener and Jupiter requests without touching the network.
+
+    Prices follow a seeded random walk so every run sees the same market.
+    Unknown endpoints return an empty JSON object.
+    """
+
+    def __init__(self, size: int, seed: int = 7) -> None:
+        super().__init__()
+        self.size = size
+        self.rng = random.Random(seed)
+        self.prices: Dict[str, float] = {}
+        self.requests = 0
+
+    def _price(self, address: str) -> float:
+        price = self.prices.get(address, 1.0) * (1 + self.rng.uniform(-0.02, 0.02))
+        self.prices[address] = price
+        return price
+
+    def _pair(self, address: str) -> Dict[str, Any]:
+        i = int(address[4:]) if address.startswith("Mint") else 0
+        return {
+            "chainId": "solana",
+            "baseToken": {"address": address, "symbol": f"T{i}", "name": f"Token {i}"},
+            "priceUsd": str(self._price(address)),
+            "volume": {"m5": float(i % 200_000), "h24": float(i % 2_000_000)},
+            "liquidity": {"usd": float(5_000 + i % 95_000)},
+            "priceChange": {"m5": float(i % 30 - 10)},
+        }
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        self.requests += 1
+        request = httpx.Request(method, url, params=params)
+        path = urlsplit(url).path
+        if path.endswith("/dex/search"):
+            picks = [mint(self.rng.randrange(self.size)) for _ in range(30)]
+            body: Any = {"pairs": [self._pair(a) for a in picks]}
+        elif "/dex/tokens/" in path:
+            addresses = path.rsplit("/", 1)[1].split(",")
+            body = {"pairs": [self._pair(a) for a in addresses]}
+        elif path.endswith("/quote"):
+            body = {"outAmount": str(int((params or {}).get("amount", 0)))}
+        else:
+            body = {}
+        return httpx.Response(200, json=body, request=request)
+
+
+def build_universe(size: int, positions: int = 4, seed: int = 7) -> TradingEngine:
+    """FeedAggregator + TradingEngine tracking ``size`` tokens on fake providers."""
+    transport = FakeProviderTransport(size, seed)
+    feeds = FeedAggregator(transport=transport)
+    feeds.dex.limiter = None  # measure the code, not the provider quota
+    feeds.max_tokens = size
+    for i in range(size):
+        pair = transport._pair(mint(i))
+        token = TokenData(
+            address=mint(i),
+            symbol=pair["baseToken"]["symbol"],
+            volume_5m=pair["volume"]["m5"],
+            volume_24h=pair["volume"]["h24"],
+            liquidity=pair["liquidity"]["usd"],
+            price_change_5m=pair["priceChange"]["m5"],
+        )
+        token.base_price = float(pair["priceUsd"])
+        token.observe(token.base_price)
+        feeds.tokens[token.address] = token
+    feeds._touch(list(feeds.tokens))
+    feeds._score_tokens()
+
+    engine = TradingEngine(feeds)
+    engine.take_profit = 1e9  # keep the book stable across iterations
+    engine.risk.stop_loss_percent = 1e9
+    engine.risk.fast_drop_percent = 1e9
+    for token in list(feeds.tokens.values())[:positions]:
+        engine.positions[token.address] = Position(token, 10.0, 10.0)
+        feeds.pin(token.address)
+    return engine
@@ -0,0 +1,153 @@
+"""Benchmark feed ticks and the strategy loop at several universe sizes.
+
+Every scenario runs against in-process fake providers, so the numbers
+measure the bot's own CPU and allocation cost. Results can be saved as a
+baseline and later runs are compared against it::
+
+    python -m benchmarks.run                 # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save          # write a new baseline
+    python -m benchmarks.run --sizes 100 1000 --max-regression 25
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.bot.utils import percentile
+
+from .fakes import build_universe, mint
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = (100, 1_000, 10_000, 100_000)
+# Fewer timed iterations for large universes keep a full run in minutes
+ITERATIONS = {100: 200, 1_000: 50, 10_000: 10, 100_000: 3}
+# Tokens a typical feed tick hands the trade loop as changed
+CHANGED_PER_TICK = 50
+
+Step = Callable[[], Awaitable[Any]]
+
+
+async def measure(step: Step, iterations: int) -> Dict[str, float]:
+    """Latency percentiles (ms) over ``iterations`` runs plus one traced run."""
+    await step()  # warm-up
+    samples: List[float] = []
+    gc.collect()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await step()
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    await step()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+        "alloc_peak_kb": (peak - before) / 1024,
+        "alloc_retained_kb": (current - before) / 1024,
+        "iterations": iterations,
+    }
+
+
+async def bench_size(size: int, iterations: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    engine = build_universe(size)
+    feeds = engine.feeds
+    n = iterations or ITERATIONS.get(size, 10)
+
+    async def top_tokens() -> None:
+        feeds.get_top_tokens(10, min_liquidity=20000, min_score=60)
+
+    async def stats() -> None:
+        engine.get_stats()
+
+    # What the event-driven trade loop sees: held positions plus a spread of
+    # tokens the last tick changed
+    stride = max(1, size // CHANGED_PER_TICK)
+    changed = set(engine.positions) | {mint(i) for i in range(0, size, stride)}
+
+    async def strategy_changed() -> None:
+        await engine.execute_strategy(changed)
+
+    results = {
+        "fetch_feeds": await measure(feeds._fetch_feeds, n),
+        "get_top_tokens": await measure(top_tokens, n * 10),
+        "execute_strategy": await measure(engine.execute_strategy, n),
+        "execute_strategy_changed": await measure(strategy_changed, n * 10),
+        "get_stats": await measure(stats, n * 10),
+    }
+    await feeds.transport.close()
+    return results
+
+
+async def run(sizes, iterations: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results = {}
+    for size in sizes:
+        started = time.perf_counter()
+        results[str(size)] = await bench_size(size, iterations)
+        print(f"  {size:>7} tokens done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Print p50 deltas against ``baseline`` and return the regressions."""
+    regressions = []
+    print(f"{'tokens':>8} {'scenario':<24} {'p50 ms':>10} {'p99 ms':>10} {'peak KB':>10} {'vs base':>9}")
+    for size, scenarios in results.items():
+        for name, r in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+            delta = ""
+            if base and base["p50_ms"] > 0:
+                change = (r["p50_ms"] / base["p50_ms"] - 1) * 100
+                delta = f"{change:+.1f}%"
+                if change > max_regression:
+                    regressions.append(f"{name} @ {size}: p50 {change:+.1f}%")
+            print(
+                f"{size:>8} {name:<24} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} "
+                f"{r['alloc_peak_kb']:>10.1f} {delta:>9}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--iterations", type=int, help="override timed iterations per scenario")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="fail when a p50 is this many percent above the baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = asyncio.run(run(args.sizes, args.iterations))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.max_regression)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": baseline}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif regressions:
+        print("Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
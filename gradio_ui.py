@@ -5,6 +5,7 @@ import gradio as gr
 from datetime import datetime
 
 from src.bot import FeedAggregator, TradingEngine, setup_logging
+from src.bot.snapshot import RenderCache, Snapshot
 
 def launch_dashboard(share: bool = False) -> None:
     """Launch enhanced Gradio interface."""
@@ -23,40 +24,45 @@ def launch_dashboard(share: bool = False) -> None:
         await feeds.stop()
         return "🛑 Bot stopped"
     
-    def get_token_data() -> str:
+    # Displays render the published snapshots (safe from Gradio's worker
+    # threads) and each text is formatted once per snapshot version
+    def get_token_data(snapshot: Snapshot) -> str:
         """Format token data for display."""
-        tokens = feeds.get_top_tokens(10)
+        tokens = snapshot.data.get("tokens", ())[:10]
         if not tokens:
             return "No tokens found yet..."
             
-        lines = ["🎯 Top Trading Opportunities:\n"]
-        for i, token in enumerate(tokens, 1):
-            lines.append(f"{i}. {token.symbol} ({token.address[:8]}...)")
-            lines.append(f"   Price: ${token.price:.6f} | Change 5m: {token.price_change_5m:+.2f}%")
-            lines.append(f"   Volume 5m: ${token.volume_5m:,.0f} | Liquidity: ${token.liquidity:,.0f}")
-            opp = f" | Opportunity: {token.opportunity}" if token.opportunity else ""
-            lines.append(f"   Score: {token.score:.1f}/100{opp}\n")
+        lines = ["🎯 Top Trading Opportunities:\n"]
+        for i, token in enumerate(tokens, 1):
+            lines.append(f"{i}. {token['symbol']} ({token['address'][:8]}...)")
+            lines.append(f"   Price: ${token['price']:.6f} | Change 5m: {token['price_change_5m']:+.2f}%")
+            lines.append(f"   Volume 5m: ${token['volume_5m']:,.0f} | Liquidity: ${token['liquidity']:,.0f}")
+            opp = f" | Opportunity: {token['opportunity']}" if token['opportunity'] else ""
+            lines.append(f"   Score: {token['score']:.1f}/100{opp}\n")
             
         return "\n".join(lines)
     
-    def get_positions() -> str:
+    def get_positions(snapshot: Snapshot) -> str:
         """Format position data."""
-        if not engine.positions:
+        positions = snapshot.data.get("positions", ())
+        if not positions:
             return "No open positions"
             
         lines = ["📊 Open Positions:\n"]
-        for pos in engine.positions.values():
-            duration = (datetime.utcnow() - pos.entry_time).total_seconds() / 60
-            lines.append(f"• {pos.token.symbol}")
-            lines.append(f"  Entry: ${pos.entry_price:.6f} | Current: ${pos.token.price:.6f}")
-            lines.append(f"  PnL: ${pos.pnl:.2f} ({pos.pnl_percent:+.2f}%)")
-            lines.append(f"  Duration: {duration:.1f} minutes\n")
+        for pos in positions:
+            opened = datetime.fromisoformat(pos["entry_time"])
+            lines.append(f"• {pos['symbol']}")
+            lines.append(f"  Entry: ${pos['entry_price']:.6f} | Current: ${pos['price']:.6f}")
+            lines.append(f"  PnL: ${pos['pnl']:.2f} ({pos['pnl_percent']:+.2f}%)")
+            lines.append(f"  Opened: {opened:%H:%M:%S} UTC\n")
             
         return "\n".join(lines)
     
-    def get_stats() -> str:
+    def get_stats(snapshot: Snapshot) -> str:
         """Format trading statistics."""
-        stats = engine.get_stats()
+        stats = snapshot.data.get("stats")
+        if not stats:
+            return "No data"
         
         return f"""📈 Trading Statistics:
         
@@ -101,9 +107,21 @@ ROI: {stats['roi_percent']:+.2f}%
                     lines=7
                 )
         
-        # Auto-refresh displays
-        def refresh_displays():
-            return get_token_data(), get_positions(), get_stats()
+        token_text = RenderCache(get_token_data)
+        position_text = RenderCache(get_positions)
+        stats_text = RenderCache(get_stats)
+        # Snapshot versions this browser session last received
+        seen = gr.State((0, 0))
+
+        # Auto-refresh displays; unchanged versions send nothing
+        def refresh_displays(last):
+            scanner, book = feeds.snapshot, engine.snapshot
+            tokens = token_text.get(scanner) if scanner.version != last[0] else gr.update()
+            if book.version != last[1]:
+                positions, stats = position_text.get(book), stats_text.get(book)
+            else:
+                positions, stats = gr.update(), gr.update()
+            return tokens, positions, stats, (scanner.version, book.version)
         
         # Set up event handlers
         start_btn.click(start_bot, outputs=status)
@@ -112,7 +130,8 @@ ROI: {stats['roi_percent']:+.2f}%
         # Auto-refresh every 5 seconds
         demo.load(
             refresh_displays, 
-            outputs=[tokens_display, positions_display, stats_display],
+            inputs=seen,
+            outputs=[tokens_display, positions_display, stats_display, seen],
             every=5
         )
     
@@ -1,9 +1,18 @@
 """API wrappers used by the project."""
 
-"""API wrappers used by the project."""
-
 from .moralis import MoralisAPI
 from .helius import HeliusAPI
 from .dexscreener import DexScreenerAPI
+from .jupiter import JupiterPriceAPI
+from .rpc import RpcPool
+from .transport import HttpTransport, default_transport
 
-__all__ = ["MoralisAPI", "HeliusAPI", "DexScreenerAPI"]
+__all__ = [
+    "MoralisAPI",
+    "HeliusAPI",
+    "DexScreenerAPI",
+    "JupiterPriceAPI",
+    "RpcPool",
+    "HttpTransport",
+    "default_transport",
+]
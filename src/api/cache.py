@@ -0,0 +1,205 @@
+"""Two-tier response cache with per-endpoint TTLs and stale-while-revalidate.
+
+Entries live in an in-memory LRU in front of an optional SQLite store, so
+slow-moving data (holder counts, token metadata) survives restarts. Each
+lookup names a ``CachePolicy``:
+
+* younger than ``ttl``: served from cache;
+* younger than ``ttl + stale``: served from cache immediately while one
+  background task refreshes it;
+* older, or absent: fetched inline. Concurrent misses for the same key
+  share one fetch.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+import msgspec
+
+from .metrics import metrics
+
+logger = logging.getLogger("api.cache")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Freshness rules for one endpoint, in seconds."""
+
+    ttl: float
+    stale: float = 0.0
+
+
+Entry = Tuple[Any, float]  # (value, stored_at)
+
+
+class TieredCache:
+    """In-memory LRU of ``capacity`` entries over an optional on-disk store."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.capacity = capacity
+        self.clock = clock
+        self._memory: "OrderedDict[Tuple[str, str], Entry]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+        self._refreshing: Dict[Tuple[str, str], asyncio.Task] = {}
+        # Opened lazily from a worker thread, reopened after close()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.refresh_errors = 0
+
+    async def get(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        policy: CachePolicy,
+        type: Type[Any] = Any,
+    ) -> Any:
+        """Cached value for ``(namespace, key)``, calling ``fetch`` when needed.
+
+        ``type`` decodes entries read back from disk.
+        """
+        ident = (namespace, key)
+        entry = self._memory.get(ident)
+        if entry is not None:
+            self._memory.move_to_end(ident)
+        elif self.path:
+            entry = await asyncio.to_thread(self._disk_get, ident, type)
+            if entry is not None:
+                self._remember(ident, entry)
+
+        if entry is not None:
+            age = self.clock() - entry[1]
+            if age < policy.ttl:
+                self._count(namespace, "hit")
+                return entry[0]
+            if age < policy.ttl + policy.stale:
+                self._count(namespace, "stale")
+                if ident not in self._refreshing:
+                    task = asyncio.create_task(self._refresh(ident, fetch))
+                    self._refreshing[ident] = task
+                    task.add_done_callback(lambda _: self._refreshing.pop(ident, None))
+                return entry[0]
+
+        self._count(namespace, "miss")
+        pending = self._pending.get(ident)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._pending[ident] = future
+        try:
+            value = await fetch()
+            await self.put(namespace, key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise, nobody else needs to
+            raise
+        finally:
+            self._pending.pop(ident, None)
+
+    async def put(self, namespace: str, key: str, value: Any) -> None:
+        entry = (value, self.clock())
+        self._remember((namespace, key), entry)
+        if self.path:
+            await asyncio.to_thread(self._disk_put, (namespace, key), entry)
+
+    async def _refresh(self, ident: Tuple[str, str], fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self.put(*ident, await fetch())
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.debug(f"Background refresh of {ident[0]}/{ident[1]} failed: {e}")
+
+    def _remember(self, ident: Tuple[str, str], entry: Entry) -> None:
+        self._memory[ident] = entry
+        self._memory.move_to_end(ident)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _count(self, namespace: str, result: str) -> None:
+        counts = self.counts.setdefault(namespace, {"hit": 0, "stale": 0, "miss": 0})
+        counts[result] += 1
+        if metrics.enabled:
+            metrics.cache_requests.inc(cache=namespace, result=result)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Shared connection; callers hold ``_db_lock``."""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(SCHEMA)
+        return self._db
+
+    def _disk_get(self, ident: Tuple[str, str], type: Type[Any]) -> Optional[Entry]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?", ident
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return msgspec.json.decode(row[0], type=type), row[1]
+        except msgspec.DecodeError:
+            return None
+
+    def _disk_put(self, ident: Tuple[str, str], entry: Entry) -> None:
+        value = msgspec.json.encode(entry[0])
+        with self._db_lock:
+            with self._connection() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (*ident, value, entry[1])
+                )
+
+    def stats(self) -> dict:
+        """Lookups per namespace with the share answered from cache."""
+        report = {}
+        for namespace, counts in self.counts.items():
+            total = sum(counts.values())
+            served = counts["hit"] + counts["stale"]
+            report[namespace] = dict(counts, hit_ratio=round(served / total, 3) if total else 0.0)
+        return {
+            "namespaces": report,
+            "entries": len(self._memory),
+            "refresh_errors": self.refresh_errors,
+        }
+
+    async def close(self) -> None:
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
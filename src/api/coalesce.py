@@ -0,0 +1,119 @@
+"""Request coalescing: single-flight calls and micro-batching windows.
+
+``SingleFlight`` lets concurrent callers asking for the same thing share
+one in-flight call and its result (or error). ``MicroBatcher`` collects
+keys requested within a short window and resolves all of them with one
+batched call, so a hot token that several components ask about at once
+costs one provider request instead of a herd.
+
+The shared call runs in its own task: a caller that is cancelled stops
+waiting without cancelling the call for everyone else.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger("api.coalesce")
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+def _consume(task: "asyncio.Future") -> None:
+    # Mark the outcome as retrieved in case every waiter went away
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """At most one in-flight call per key; later callers join it."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def pending(self, key: Hashable) -> bool:
+        """True if a call for ``key`` is in flight (a new caller would join it)."""
+        return key in self._calls
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        _consume(task)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "shared": self.shared, "inflight": len(self._calls)}
+
+
+class MicroBatcher(Generic[K, R]):
+    """Merge keys submitted within ``window`` seconds into one ``fetch`` call.
+
+    Every caller in a window receives the combined result of ``fetch`` for
+    the union of keys and picks out its own entries. A window closes early
+    once ``max_keys`` distinct keys are pending.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[K]], Awaitable[R]],
+        window: float = 0.01,
+        max_keys: Optional[int] = None,
+    ) -> None:
+        self.fetch = fetch
+        self.window = window
+        self.max_keys = max_keys
+        self._keys: Dict[K, None] = {}
+        self._future: Optional["asyncio.Future[R]"] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.submits = 0
+        self.keys = 0
+
+    async def submit(self, keys: Iterable[K]) -> R:
+        loop = asyncio.get_running_loop()
+        if self._future is None:
+            self._future = loop.create_future()
+            self._timer = loop.call_later(self.window, self._flush)
+        self._keys.update(dict.fromkeys(keys))
+        self.submits += 1
+        future = self._future
+        if self.max_keys and len(self._keys) >= self.max_keys:
+            self._flush()
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        future, keys = self._future, list(self._keys)
+        if future is None:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._future, self._timer, self._keys = None, None, {}
+        self.batches += 1
+        self.keys += len(keys)
+        task = asyncio.ensure_future(self.fetch(keys))
+        task.add_done_callback(lambda t: self._resolve(future, t))
+
+    @staticmethod
+    def _resolve(future: "asyncio.Future[R]", task: asyncio.Task) -> None:
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+            _consume(future)
+        else:
+            future.set_result(task.result())
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "submits": self.submits, "keys": self.keys}
@@ -1,28 +1,109 @@
-import aiohttp
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, TypeVar
+
+import httpx
+
+from .coalesce import MicroBatcher
+from .schemas import Pair, decode_pairs
+from .transport import HttpTransport
+from .utils import chunked
+
+T = TypeVar("T")
 
 class DexScreenerAPI:
-    """Minimal async client for DEX Screener public endpoints."""
+    """Minimal async client for DEX Screener public endpoints.
+
+    ``search_tokens``/``get_token_pairs`` return raw dicts; ``search_pairs``
+    and ``get_pairs`` decode the body straight into typed ``Pair`` records,
+    which is what the scanner's hot paths use.
+
+    With ``batch_window`` > 0, ``get_pairs`` calls made within that many
+    seconds of each other are merged into one batched lookup.
+    """
 
     BASE_URL = "https://api.dexscreener.com/latest"
+    MAX_BATCH = 30  # addresses per /dex/tokens request
+
+    def __init__(
+        self,
+        transport: HttpTransport | None = None,
+        limiter: Any = None,
+        batch_window: float = 0.0,
+    ) -> None:
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        # Optional object with ``async acquire()`` awaited before every request
+        self.limiter = limiter
+        self.batcher: MicroBatcher[str, List[Pair]] | None = None
+        if batch_window > 0:
+            self.batcher = MicroBatcher(self._fetch_pairs, batch_window, max_keys=self.MAX_BATCH)
 
-    def __init__(self, session: aiohttp.ClientSession | None = None) -> None:
-        self.session = session
+    async def close(self) -> None:
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def _get(self, url: str, params: Dict[str, Any] | None = None) -> httpx.Response:
+        if self.limiter:
+            await self.limiter.acquire()
+        resp = await self.transport.get(url, params=params, timeout=10)
+        resp.raise_for_status()
+        return resp
 
     async def search_tokens(self, query: str) -> List[Dict[str, Any]]:
         """Search for pairs by query and return raw pair data."""
-        url = f"{self.BASE_URL}/dex/search"
-        params = {"q": query}
-        close_session = False
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            close_session = True
-        try:
-            async with self.session.get(url, params=params, timeout=10) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-                return data.get("pairs", []) if isinstance(data, dict) else []
-        finally:
-            if close_session:
-                await self.session.close()
-                self.session = None
+        resp = await self._get(f"{self.BASE_URL}/dex/search", params={"q": query})
+        data = resp.json()
+        return data.get("pairs", []) if isinstance(data, dict) else []
+
+    async def search_pairs(self, query: str) -> List[Pair]:
+        """Search for pairs by query, decoded into ``Pair`` records."""
+        resp = await self._get(f"{self.BASE_URL}/dex/search", params={"q": query})
+        return decode_pairs(resp.content)
+
+    async def get_token_pairs(self, addresses: Sequence[str]) -> List[Dict[str, Any]]:
+        """Return pairs for many token addresses using batched requests.
+
+        Addresses are split into chunks of ``MAX_BATCH`` which are fetched
+        concurrently. Failed chunks are skipped unless every chunk failed.
+        """
+        return await self._batched(addresses, self._get_pairs_chunk)
+
+    async def get_pairs(self, addresses: Sequence[str]) -> List[Pair]:
+        """Like ``get_token_pairs`` but decoded into ``Pair`` records."""
+        if self.batcher is None or not addresses:
+            return await self._fetch_pairs(addresses)
+        wanted = set(addresses)
+        pairs = await self.batcher.submit(addresses)
+        return [p for p in pairs if p.base_token is not None and p.base_token.address in wanted]
+
+    async def _fetch_pairs(self, addresses: Sequence[str]) -> List[Pair]:
+        return await self._batched(addresses, self._get_typed_chunk)
+
+    async def _batched(
+        self, addresses: Sequence[str], fetch: Callable[[List[str]], Awaitable[List[T]]]
+    ) -> List[T]:
+        chunks = list(chunked(addresses, self.MAX_BATCH))
+        if not chunks:
+            return []
+        results = await asyncio.gather(
+            *(fetch(chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        pairs: List[T] = []
+        for result in results:
+            if not isinstance(result, BaseException):
+                pairs.extend(result)
+        return pairs
+
+    async def _get_pairs_chunk(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        resp = await self._get(f"{self.BASE_URL}/dex/tokens/{','.join(addresses)}")
+        data = resp.json()
+        pairs = data.get("pairs") if isinstance(data, dict) else None
+        return pairs or []
+
+    async def _get_typed_chunk(self, addresses: List[str]) -> List[Pair]:
+        resp = await self._get(f"{self.BASE_URL}/dex/tokens/{','.join(addresses)}")
+        return decode_pairs(resp.content)
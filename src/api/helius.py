@@ -1,41 +1,73 @@
 """Async wrapper for Helius API endpoints used in the bot."""
 import os
-import httpx
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Type
+
+from .cache import CachePolicy, TieredCache
+from .schemas import Holders, decode_holders
+from .transport import HttpTransport
 
 class HeliusAPI:
-    """Minimal async client for Helius."""
+    """Minimal async client for Helius.
+
+    With a ``TieredCache`` holder counts are reused for a few minutes and
+    refreshed in the background afterwards; token metadata is effectively
+    immutable and cached for a week.
+    """
 
     BASE_URL = "https://api.helius.xyz"
+    CACHE_POLICIES = {
+        "helius_holders": CachePolicy(ttl=300.0, stale=3600.0),
+        "helius_metadata": CachePolicy(ttl=7 * 86400.0, stale=30 * 86400.0),
+    }
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        transport: Optional[HttpTransport] = None,
+        cache: Optional[TieredCache] = None,
+    ) -> None:
         self.api_key = api_key or os.getenv("HELIUS_KEY", "demo")
-        self.session: Optional[httpx.AsyncClient] = None
-
-    async def _client(self) -> httpx.AsyncClient:
-        if not self.session:
-            self.session = httpx.AsyncClient(timeout=10)
-        return self.session
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        self.cache = cache
 
     async def close(self) -> None:
-        if self.session:
-            await self.session.aclose()
-            self.session = None
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def _cached(
+        self, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]], type: Type[Any]
+    ) -> Any:
+        if self.cache is None:
+            return await fetch()
+        return await self.cache.get(namespace, key, fetch, self.CACHE_POLICIES[namespace], type)
+
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Any:
+        resp = await self.transport.get(url, params=params)
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_token_holders(self, mint: str) -> Dict[str, Any]:
         """Return holder information for a token mint."""
-        client = await self._client()
         url = f"{self.BASE_URL}/v0/tokens/{mint}/holders"
-        params = {"api-key": self.api_key}
-        resp = await client.get(url, params=params)
-        resp.raise_for_status()
-        return resp.json()
+        return await self._get_json(url, {"api-key": self.api_key})
+
+    async def get_holders(self, mint: str) -> Holders:
+        """Holder summary for a token mint, decoded into ``Holders``."""
+
+        async def fetch() -> Holders:
+            url = f"{self.BASE_URL}/v0/tokens/{mint}/holders"
+            resp = await self.transport.get(url, params={"api-key": self.api_key})
+            resp.raise_for_status()
+            return decode_holders(resp.content)
+
+        return await self._cached("helius_holders", mint, fetch, Holders)
 
     async def get_token_metadata(self, mint: str) -> Dict[str, Any]:
         """Return metadata for a token mint."""
-        client = await self._client()
-        url = f"{self.BASE_URL}/v0/tokens/metadata"
-        params = {"api-key": self.api_key, "mint": mint}
-        resp = await client.get(url, params=params)
-        resp.raise_for_status()
-        return resp.json()
+
+        async def fetch() -> Dict[str, Any]:
+            url = f"{self.BASE_URL}/v0/tokens/metadata"
+            return await self._get_json(url, {"api-key": self.api_key, "mint": mint})
+
+        return await self._cached("helius_metadata", mint, fetch, Any)
@@ -0,0 +1,51 @@
+"""Async wrapper for the Jupiter price endpoint."""
+import asyncio
+from typing import Any, Dict, List, Sequence
+
+from .schemas import decode_jupiter_prices
+from .transport import HttpTransport
+from .utils import chunked
+
+
+class JupiterPriceAPI:
+    """Minimal async client for Jupiter's multi-mint USD price lookup."""
+
+    BASE_URL = "https://api.jup.ag/price/v2"
+    MAX_BATCH = 100  # mints per request
+
+    def __init__(self, transport: HttpTransport | None = None, limiter: Any = None) -> None:
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        # Optional object with ``async acquire()`` awaited before every request
+        self.limiter = limiter
+
+    async def close(self) -> None:
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def get_prices(self, addresses: Sequence[str]) -> Dict[str, float]:
+        """USD price per mint; mints Jupiter cannot price are left out.
+
+        Failed chunks are skipped unless every chunk failed.
+        """
+        chunks = list(chunked(addresses, self.MAX_BATCH))
+        if not chunks:
+            return {}
+        results = await asyncio.gather(
+            *(self._get_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        prices: Dict[str, float] = {}
+        for result in results:
+            if isinstance(result, dict):
+                prices.update(result)
+        return prices
+
+    async def _get_chunk(self, addresses: List[str]) -> Dict[str, float]:
+        if self.limiter:
+            await self.limiter.acquire()
+        resp = await self.transport.get(self.BASE_URL, params={"ids": ",".join(addresses)}, timeout=10)
+        resp.raise_for_status()
+        return decode_jupiter_prices(resp.content)
@@ -0,0 +1,127 @@
+"""Headless bot service: runs the bot and streams its state.
+
+Endpoints:
+    GET /state    full snapshot of top tokens, positions and stats
+    WS  /ws       snapshot, then one JSON delta per change
+    GET /events   the same stream as Server-Sent Events
+    GET /metrics  Prometheus metrics
+
+Run with ``python -m src.api.main --port 8000`` or
+``uvicorn src.api.main:create_app --factory``.
+"""
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+
+from .metrics import metrics
+
+# Seconds between SSE comments sent while no delta is pending
+SSE_KEEPALIVE = 15.0
+
+
+def create_app(feeds=None, engine=None, start_bot: bool = True) -> FastAPI:
+    """Build the service around ``feeds``/``engine`` (created when omitted).
+
+    With ``start_bot=False`` the bot is assumed to be managed by the caller
+    and only the broadcaster is started. Metrics are recorded by the bot's
+    own hooks and lag monitor, in this process either way.
+    """
+    from src.bot.broadcast import StateBroadcaster
+    from src.bot.config import settings
+    from src.bot.feeds import FeedAggregator
+    from src.bot.trading import TradingEngine
+
+    feeds = feeds or FeedAggregator()
+    engine = engine or TradingEngine(feeds)
+    broadcaster = StateBroadcaster(
+        feeds, engine, interval=settings.broadcast_interval, top=settings.broadcast_top
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if start_bot:
+            await feeds.start()
+            await engine.start()
+        await broadcaster.start()
+        yield
+        await broadcaster.stop()
+        if start_bot:
+            await engine.stop()
+            await feeds.stop()
+
+    app = FastAPI(title="Solana Sniper Bot", lifespan=lifespan)
+    app.state.feeds = feeds
+    app.state.engine = engine
+    app.state.broadcaster = broadcaster
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def get_metrics() -> PlainTextResponse:
+        """Prometheus scrape endpoint. The first scrape turns recording on."""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/state")
+    async def get_state() -> Response:
+        return Response(broadcaster.snapshot_message(), media_type="application/json")
+
+    @app.websocket("/ws")
+    async def stream_ws(websocket: WebSocket) -> None:
+        await websocket.accept()
+        subscriber = broadcaster.subscribe()
+
+        async def forward() -> None:
+            while True:
+                await websocket.send_text(await subscriber.get())
+
+        # Sending alone never notices a client that went away; the receive
+        # side does, and then stops the sender
+        sender = asyncio.create_task(forward())
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+            broadcaster.unsubscribe(subscriber)
+
+    @app.get("/events")
+    async def stream_sse(request: Request) -> StreamingResponse:
+        subscriber = broadcaster.subscribe()
+
+        async def events() -> AsyncIterator[str]:
+            try:
+                while not await request.is_disconnected():
+                    try:
+                        message = await asyncio.wait_for(subscriber.get(), SSE_KEEPALIVE)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"  # also lets a disconnect be noticed
+                        continue
+                    yield f"data: {message}\n\n"
+            finally:
+                broadcaster.unsubscribe(subscriber)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    from src.bot.utils import setup_logging
+
+    parser = argparse.ArgumentParser(description="Run the headless bot service")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    setup_logging()
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Minimal Prometheus text-format metrics for the bot's hot paths.
+
+Recording is switched off until the first scrape and switches itself off
+again when nobody has scraped for ``idle_after`` seconds, so with no
+scraper attached every hook costs one attribute check.
+
+The registry lives in the bot's process: the FeedAggregator runs the
+``LoopLagMonitor`` (which also does the idle check) and, when
+``METRICS_PORT`` is set, a ``MetricsServer`` for front-ends such as the
+Gradio UI that have no HTTP API of their own.
+"""
+import asyncio
+import bisect
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+logger = logging.getLogger("api.metrics")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket (non-cumulative) + overflow, sum]
+        self.series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(labels, 'le="%g"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _format_labels(labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total[0]:g}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+def provider_name(url: str) -> str:
+    """Map a request URL to the provider label used in metrics."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if "dexscreener" in host:
+        return "dexscreener"
+    if "moralis" in host:
+        return "moralis"
+    if "jup.ag" in host:
+        if parts.path.endswith("/quote"):
+            return "jupiter_quote"
+        if parts.path.endswith("/swap"):
+            return "jupiter_swap"
+        return "jupiter"
+    if "helius-rpc" in host or "solana.com" in host or "rpc" in host:
+        return "rpc"
+    if "helius" in host:
+        return "helius"
+    return host or "unknown"
+
+
+class MetricsRegistry:
+    """Process-wide metrics shared by the transport, feeds and engine."""
+
+    def __init__(self, idle_after: float = 300.0) -> None:
+        self.enabled = False
+        self.idle_after = idle_after
+        self.last_scrape = 0.0
+        self.provider_latency = Histogram(
+            "provider_request_seconds", "Latency of provider HTTP calls"
+        )
+        self.feed_tick = Histogram("feed_tick_seconds", "Duration of one FeedAggregator tick")
+        self.strategy_cycle = Histogram(
+            "strategy_cycle_seconds", "Duration of one TradingEngine strategy cycle"
+        )
+        self.loop_lag = Histogram(
+            "event_loop_lag_seconds", "Delay between a scheduled wake-up and the actual one"
+        )
+        self.errors = Counter("provider_errors_total", "Failed provider calls (exceptions and HTTP errors)")
+        self.rate_limited = Counter("provider_rate_limited_total", "HTTP 429 responses per provider")
+        self.timeouts = Counter("provider_timeouts_total", "Timed out provider calls")
+        self.cache_requests = Counter(
+            "cache_requests_total", "Response cache lookups by result (hit, stale, miss)"
+        )
+
+    def observe_response(self, url: str, seconds: float, status: Optional[int]) -> None:
+        provider = provider_name(url)
+        self.provider_latency.observe(seconds, provider=provider)
+        if status == 429:
+            self.rate_limited.inc(provider=provider)
+        if status is None or status >= 400:
+            self.errors.inc(provider=provider)
+
+    def observe_timeout(self, url: str, seconds: float) -> None:
+        provider = provider_name(url)
+        self.provider_latency.observe(seconds, provider=provider)
+        self.timeouts.inc(provider=provider)
+        self.errors.inc(provider=provider)
+
+    def render(self) -> str:
+        """Prometheus text exposition; the first call enables recording."""
+        self.last_scrape = time.monotonic()
+        if not self.enabled:
+            self.enabled = True
+            logger.info("Metrics scraper attached, recording enabled")
+        lines: List[str] = []
+        for metric in (
+            self.provider_latency, self.feed_tick, self.strategy_cycle, self.loop_lag,
+            self.errors, self.rate_limited, self.timeouts, self.cache_requests,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def check_idle(self) -> None:
+        if self.enabled and time.monotonic() - self.last_scrape > self.idle_after:
+            self.enabled = False
+            logger.info("No metrics scrape recently, recording disabled")
+
+
+metrics = MetricsRegistry()
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag by sleeping ``interval`` and timing the overshoot."""
+
+    def __init__(self, registry: MetricsRegistry = metrics, interval: float = 0.5) -> None:
+        self.registry = registry
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            if self.registry.enabled:
+                lag = time.perf_counter() - start - self.interval
+                self.registry.loop_lag.observe(max(0.0, lag))
+            self.registry.check_idle()
+
+
+class MetricsServer:
+    """Standalone ``GET /metrics`` endpoint for processes without the API app."""
+
+    def __init__(self, registry: MetricsRegistry = metrics, host: str = "0.0.0.0", port: int = 9100) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving metrics on {self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.registry.render(), content_type="text/plain", charset="utf-8"
+        )
@@ -1,24 +1,46 @@
+import asyncio
 import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
 import httpx
-from typing import Any, Dict, Optional
+
+from .schemas import TokenPrice, decode_prices
+from .transport import HttpTransport
+from .utils import chunked
 
 class MoralisAPI:
     """Simple async wrapper for Moralis Solana endpoints."""
 
     BASE_URL = "https://solana-gateway.moralis.io"
+    MAX_BATCH = 100  # addresses per multi-price request
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None, transport: Optional[HttpTransport] = None) -> None:
         self.api_key = api_key or os.getenv("MORALIS_KEY")
         if not self.api_key:
             raise ValueError("Moralis API key not provided")
         self.headers = {"X-API-Key": self.api_key}
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+
+    async def close(self) -> None:
+        if self._owns_transport:
+            await self.transport.close()
 
     async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = f"{self.BASE_URL}{path}"
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(url, params=params, headers=self.headers)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self.transport.get(url, params=params, headers=self.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        return (await self._post_raw(path, payload)).json()
+
+    async def _post_raw(self, path: str, payload: Dict[str, Any]) -> httpx.Response:
+        url = f"{self.BASE_URL}{path}"
+        # Price lookups are reads: identical concurrent ones share a request
+        resp = await self.transport.post(url, json=payload, headers=self.headers, coalesce=True)
+        resp.raise_for_status()
+        return resp
 
     async def get_token_metadata(self, network: str, address: str) -> Dict[str, Any]:
         """Retrieve metadata for a SPL token."""
@@ -28,6 +50,43 @@ class MoralisAPI:
         """Retrieve token price information."""
         return await self._get(f"/token/{network}/{address}/price")
 
+    async def get_token_prices(self, network: str, addresses: Sequence[str]) -> List[Dict[str, Any]]:
+        """Retrieve prices for many tokens, ``MAX_BATCH`` per request, concurrently.
+
+        Failed chunks are skipped unless every chunk failed.
+        """
+        return await self._batched(network, addresses, self._post)
+
+    async def get_prices(self, network: str, addresses: Sequence[str]) -> List[TokenPrice]:
+        """Like ``get_token_prices`` but decoded into ``TokenPrice`` records."""
+
+        async def fetch(path: str, payload: Dict[str, Any]) -> List[TokenPrice]:
+            return decode_prices((await self._post_raw(path, payload)).content)
+
+        return await self._batched(network, addresses, fetch)
+
+    async def _batched(
+        self,
+        network: str,
+        addresses: Sequence[str],
+        post: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+    ) -> List[Any]:
+        chunks = list(chunked(addresses, self.MAX_BATCH))
+        if not chunks:
+            return []
+        results = await asyncio.gather(
+            *(post(f"/token/{network}/prices", {"addresses": chunk}) for chunk in chunks),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if len(errors) == len(results):
+            raise errors[0]
+        prices: List[Any] = []
+        for result in results:
+            if isinstance(result, list):
+                prices.extend(result)
+        return prices
+
     async def get_wallet_tokens(self, network: str, address: str) -> Dict[str, Any]:
         """Retrieve SPL token balances for a wallet."""
         return await self._get(f"/account/{network}/{address}/tokens")
@@ -42,6 +101,7 @@ async def main() -> None:
     print("Metadata:", metadata)
     price = await api.get_token_price("mainnet", sol_address)
     print("Price:", price)
+    await api.close()
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,229 @@
+"""Capture provider responses to a compressed log and serve them back."""
+import bisect
+import gzip
+import json
+import logging
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from .transport import HttpTransport
+
+logger = logging.getLogger("api.recording")
+
+RecordKey = Tuple[str, str, str, str]
+
+# Query params that vary per call without changing which market is asked
+VOLATILE_PARAMS = ("amount",)
+
+# Query params carrying credentials; their values never reach the log
+SECRET_PARAMS = ("api-key", "api_key", "apikey", "access_token", "secret")
+REDACTED = "REDACTED"
+
+
+def redact(url: str, params: Any = None) -> Tuple[str, Any]:
+    """Mask credential values in ``url``'s query string and in ``params``."""
+    parts = urlsplit(url)
+    if parts.query:
+        query = [
+            (k, REDACTED if k.lower() in SECRET_PARAMS else v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        ]
+        url = urlunsplit(parts._replace(query=urlencode(query, safe="*")))
+    if isinstance(params, dict):
+        params = {k: REDACTED if str(k).lower() in SECRET_PARAMS else v for k, v in params.items()}
+    return url, params
+
+
+def record_key(method: str, url: str, params: Any = None, body: Any = None) -> RecordKey:
+    """Canonical lookup key for a request."""
+    return (
+        method.upper(),
+        url,
+        json.dumps(params, sort_keys=True, default=str) if params else "",
+        json.dumps(body, sort_keys=True, default=str) if body is not None else "",
+    )
+
+
+class ResponseRecorder:
+    """Append-only gzip JSONL log of raw provider responses.
+
+    Each line holds the wall-clock time, the request (method, url, params,
+    JSON body) and the response status and body text. Credentials in the
+    query are redacted first. Reopening the same path appends a new gzip
+    member, which readers handle transparently.
+
+    The stream is sync-flushed every ``flush_every`` records or
+    ``flush_interval`` seconds, so a crash loses at most that much and
+    leaves a readable prefix.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.time,
+        flush_every: int = 100,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.path = path
+        self.clock = clock
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self.records = 0
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        params: Any,
+        body: Any,
+        response: httpx.Response,
+    ) -> None:
+        url, params = redact(url, params)
+        entry = {
+            "t": self.clock(),
+            "method": method.upper(),
+            "url": url,
+            "params": params,
+            "json": body,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "body": response.text,
+        }
+        self._file.write(json.dumps(entry, default=str) + "\n")
+        self.records += 1
+        self._pending += 1
+        if (
+            self._pending >= self.flush_every
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Push buffered records to disk as a complete deflate block."""
+        if self._file.closed:
+            return
+        self._file.flush()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield recorded entries in file order.
+
+    A log cut short by a crash ends in an unterminated gzip member and
+    possibly a partial line; reading stops cleanly at the last whole entry.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    logger.warning("Ignoring partial record at end of %s", path)
+                    return
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            logger.warning("Recording %s is truncated (%s); stopping at last whole entry", path, e)
+
+
+class ReplayTransport(HttpTransport):
+    """Transport answering requests from a recorded log.
+
+    A request is served the latest recording made at or before ``clock()``
+    for the same method, URL, params and body. When there is no exact match
+    (e.g. a Jupiter quote for a different amount) the latest recording that
+    only differs in ``VOLATILE_PARAMS`` is used. Credentials are redacted
+    on both sides before matching, so live keys find their recordings. Unknown requests get a 404, unless a
+    stub was registered for their method and path.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], clock: Callable[[], float]) -> None:
+        super().__init__()
+        self.clock = clock
+        self.exact: Dict[RecordKey, List[Dict[str, Any]]] = {}
+        self.loose: Dict[RecordKey, List[Dict[str, Any]]] = {}
+        for entry in sorted(entries, key=lambda e: e["t"]):
+            url, params = redact(entry["url"], entry.get("params"))
+            request = (entry["method"], url, params, entry.get("json"))
+            self.exact.setdefault(record_key(*request), []).append(entry)
+            self.loose.setdefault(self._loose_key(*request), []).append(entry)
+        # Recording times per list, for bisecting on the clock
+        self._times = {
+            id(group): [e["t"] for e in group]
+            for index in (self.exact, self.loose)
+            for group in index.values()
+        }
+        self.stubs: Dict[Tuple[str, str], Any] = {}
+        self.served = 0
+        self.misses = 0
+
+    @staticmethod
+    def _loose_key(method: str, url: str, params: Any, body: Any) -> RecordKey:
+        if isinstance(params, dict):
+            params = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+        return record_key(method, url, params, body)
+
+    @classmethod
+    def from_file(cls, path: str, clock: Callable[[], float]) -> "ReplayTransport":
+        return cls(list(read_log(path)), clock)
+
+    def stub(self, method: str, path: str, payload: Any) -> None:
+        """Answer ``method path`` (any host) with ``payload`` when not recorded."""
+        self.stubs[(method.upper(), path)] = payload
+
+    def _latest(self, entries: Optional[List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        if not entries:
+            return None
+        i = bisect.bisect_right(self._times[id(entries)], self.clock())
+        return entries[i - 1] if i else None
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        method = method.upper()
+        request = httpx.Request(method, url, params=params)
+        url, params = redact(url, params)
+        entry = self._latest(self.exact.get(record_key(method, url, params, json)))
+        if entry is None:
+            entry = self._latest(self.loose.get(self._loose_key(method, url, params, json)))
+        if entry is not None:
+            self.served += 1
+            return httpx.Response(
+                entry["status"],
+                content=entry["body"].encode("utf-8"),
+                headers={"content-type": entry.get("content_type") or "application/json"},
+                request=request,
+            )
+        stub = self.stubs.get((method, urlsplit(url).path))
+        if stub is not None:
+            self.served += 1
+            return httpx.Response(200, json=stub, request=request)
+        self.misses += 1
+        return httpx.Response(404, json={"error": "not recorded"}, request=request)
+
+    @property
+    def start_time(self) -> Optional[float]:
+        times = [entries[0]["t"] for entries in self.loose.values()]
+        return min(times) if times else None
+
+    @property
+    def end_time(self) -> Optional[float]:
+        times = [entries[-1]["t"] for entries in self.loose.values()]
+        return max(times) if times else None
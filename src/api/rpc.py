@@ -0,0 +1,271 @@
+"""Pool of Solana JSON-RPC endpoints ranked by latency and slot lag.
+
+Every endpoint is probed with ``getSlot`` every ``probe_interval``
+seconds. Latency is tracked as an EWMA over probes and real calls, and an
+endpoint is healthy while its last ``failure_limit`` calls did not all
+fail and it is no more than ``max_slot_lag`` slots behind the best one.
+
+Reads go to the fastest healthy endpoint and fail over down the ranking
+on transport errors. Critical calls (balance, blockhash, send, signature
+status) are hedged: sent to the top ``hedge`` endpoints at once, the first
+successful answer wins and the others are cancelled.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .recording import redact
+from .transport import HttpTransport, default_transport
+
+logger = logging.getLogger("api.rpc")
+
+# JSON-RPC error codes meaning "this node cannot serve you right now"
+NODE_UNHEALTHY_CODES = (-32005, -32004, -32014)
+
+
+class RpcError(Exception):
+    """Error object returned by a JSON-RPC endpoint."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+    @property
+    def node_unhealthy(self) -> bool:
+        return self.code in NODE_UNHEALTHY_CODES
+
+
+@dataclass
+class Endpoint:
+    url: str
+    latency: Optional[float] = None  # EWMA, seconds
+    slot: int = 0
+    failures: int = 0  # consecutive
+    requests: int = 0
+    errors: int = 0
+    hedge_wins: int = 0
+
+    def record_success(self, latency: float) -> None:
+        self.failures = 0
+        self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.errors += 1
+
+
+class RpcPool:
+    """Latency-ranked Solana RPC endpoints with failover and hedged calls."""
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        transport: Optional[HttpTransport] = None,
+        probe_interval: float = 2.0,
+        max_slot_lag: int = 20,
+        failure_limit: int = 3,
+        hedge: int = 2,
+        timeout: float = 5.0,
+    ) -> None:
+        if not urls:
+            raise ValueError("RpcPool needs at least one endpoint")
+        self.endpoints = [Endpoint(url) for url in dict.fromkeys(urls)]
+        self.transport = transport or default_transport()
+        self.probe_interval = probe_interval
+        self.max_slot_lag = max_slot_lag
+        self.failure_limit = failure_limit
+        self.hedge = hedge
+        self.timeout = timeout
+        self.best_slot = 0
+        self.hedged = 0
+        self.failovers = 0
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+
+    async def start(self) -> None:
+        self.running = True
+        await self.probe()
+        self._task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _probe_loop(self) -> None:
+        while self.running:
+            await asyncio.sleep(self.probe_interval)
+            await self.probe()
+
+    async def probe(self) -> None:
+        """Measure latency and slot of every endpoint once, concurrently."""
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+        self.best_slot = max(endpoint.slot for endpoint in self.endpoints)
+
+    async def _probe(self, endpoint: Endpoint) -> None:
+        try:
+            endpoint.slot = int(await self._post(endpoint, "getSlot", [{"commitment": "processed"}]))
+        except Exception as e:
+            logger.debug(f"Probe of {self._name(endpoint)} failed: {e}")
+
+    def lag(self, endpoint: Endpoint) -> int:
+        return max(0, self.best_slot - endpoint.slot) if endpoint.slot else 0
+
+    def healthy(self, endpoint: Endpoint) -> bool:
+        return endpoint.failures < self.failure_limit and self.lag(endpoint) <= self.max_slot_lag
+
+    def ranked(self) -> List[Endpoint]:
+        """Healthy endpoints by latency, then the rest as a last resort."""
+        return sorted(
+            self.endpoints,
+            key=lambda e: (
+                not self.healthy(e),
+                e.latency if e.latency is not None else math.inf,
+            ),
+        )
+
+    async def _post(self, endpoint: Endpoint, method: str, params: Optional[list]) -> Any:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params or []}
+        endpoint.requests += 1
+        started = time.monotonic()
+        try:
+            resp = await self.transport.post(endpoint.url, json=payload, timeout=self.timeout)
+            resp.raise_for_status()
+            body = resp.json()
+        except Exception:
+            endpoint.record_failure()
+            raise
+        error = body.get("error") if isinstance(body, dict) else None
+        if error:
+            rpc_error = RpcError(error.get("code", 0), error.get("message", ""))
+            if rpc_error.node_unhealthy:
+                endpoint.record_failure()
+            else:
+                endpoint.record_success(time.monotonic() - started)
+            raise rpc_error
+        endpoint.record_success(time.monotonic() - started)
+        return body.get("result")
+
+    async def call(self, method: str, params: Optional[list] = None, hedged: bool = False) -> Any:
+        """Send ``method`` to the best endpoint, failing over down the ranking.
+
+        With ``hedged`` the top endpoints race first; the rest are only
+        tried if all of them failed. An ``RpcError`` about the request
+        itself (not the node) is raised at once: another endpoint would
+        give the same answer.
+        """
+        ranked = self.ranked()
+        error: Optional[BaseException] = None
+        if hedged and self.hedge > 1 and len(ranked) > 1:
+            try:
+                return await self._hedged(ranked[: self.hedge], method, params)
+            except RpcError as e:
+                if not e.node_unhealthy:
+                    raise
+                error = e
+            except Exception as e:
+                error = e
+            ranked = ranked[self.hedge:]
+        for endpoint in ranked:
+            if error is not None:
+                self.failovers += 1
+            try:
+                return await self._post(endpoint, method, params)
+            except RpcError as e:
+                if not e.node_unhealthy:
+                    raise
+                error = e
+            except Exception as e:
+                error = e
+            logger.debug(f"{method} on {self._name(endpoint)} failed: {error}")
+        assert error is not None
+        raise error
+
+    async def _hedged(self, endpoints: List[Endpoint], method: str, params: Optional[list]) -> Any:
+        self.hedged += 1
+        pending = {
+            asyncio.ensure_future(self._post(endpoint, method, params)): endpoint
+            for endpoint in endpoints
+        }
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        endpoint.hedge_wins += 1
+                        return task.result()
+                    if isinstance(error, RpcError) and not error.node_unhealthy:
+                        raise error
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_slot(self) -> int:
+        return int(await self.call("getSlot"))
+
+    async def get_balance(self, pubkey: str, commitment: str = "confirmed") -> int:
+        """Lamports held by ``pubkey``."""
+        result = await self.call("getBalance", [pubkey, {"commitment": commitment}], hedged=True)
+        return int(result["value"])
+
+    async def get_latest_blockhash(self, commitment: str = "confirmed") -> Dict[str, Any]:
+        """``{"blockhash": ..., "lastValidBlockHeight": ...}``"""
+        result = await self.call("getLatestBlockhash", [{"commitment": commitment}], hedged=True)
+        return result["value"]
+
+    async def get_block_height(self, commitment: str = "confirmed") -> int:
+        return int(await self.call("getBlockHeight", [{"commitment": commitment}]))
+
+    async def get_recent_prioritization_fees(self, accounts: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """``[{"slot": ..., "prioritizationFee": ...}]`` for recent slots."""
+        return await self.call("getRecentPrioritizationFees", [list(accounts)] if accounts else [])
+
+    async def send_transaction(self, transaction: str, skip_preflight: bool = True) -> str:
+        """Broadcast a base64 signed transaction; returns its signature."""
+        options = {"encoding": "base64", "skipPreflight": skip_preflight, "maxRetries": 0}
+        return await self.call("sendTransaction", [transaction, options], hedged=True)
+
+    async def get_signature_statuses(self, signatures: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        result = await self.call("getSignatureStatuses", [list(signatures)], hedged=True)
+        return result["value"]
+
+    async def get_transaction(self, signature: str, commitment: str = "confirmed") -> Optional[Dict[str, Any]]:
+        """Parsed transaction, or None while the node does not have it yet."""
+        options = {"encoding": "jsonParsed", "commitment": commitment, "maxSupportedTransactionVersion": 0}
+        return await self.call("getTransaction", [signature, options])
+
+    @staticmethod
+    def _name(endpoint: Endpoint) -> str:
+        return redact(endpoint.url)[0]
+
+    def stats(self) -> dict:
+        return {
+            "best_slot": self.best_slot,
+            "hedged": self.hedged,
+            "failovers": self.failovers,
+            "endpoints": [
+                {
+                    "url": self._name(endpoint),
+                    "healthy": self.healthy(endpoint),
+                    "latency_ms": round(endpoint.latency * 1000, 1) if endpoint.latency is not None else None,
+                    "slot_lag": self.lag(endpoint),
+                    "requests": endpoint.requests,
+                    "errors": endpoint.errors,
+                    "hedge_wins": endpoint.hedge_wins,
+                }
+                for endpoint in self.ranked()
+            ],
+        }
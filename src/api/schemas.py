@@ -0,0 +1,148 @@
+"""Typed provider payloads decoded straight from response bytes.
+
+``msgspec`` validates and builds these compact structs in one pass over the
+JSON, without intermediate dicts; fields the bot does not read are skipped
+by the parser. Decoding is lax about numbers (``"0.12"`` is accepted as a
+float) because DEX Screener sends prices as strings.
+
+A payload that does not fit the schema as a whole is re-decoded item by
+item so one malformed pair or price only drops that entry.
+"""
+import logging
+from typing import Dict, List, Optional, Type, TypeVar
+
+import msgspec
+
+logger = logging.getLogger("api.schemas")
+
+T = TypeVar("T")
+
+
+class BaseToken(msgspec.Struct, gc=False):
+    address: str = ""
+    symbol: str = ""
+    name: str = ""
+
+
+class Volume(msgspec.Struct, gc=False):
+    m5: Optional[float] = None
+    h24: Optional[float] = None
+
+
+class Liquidity(msgspec.Struct, gc=False):
+    usd: Optional[float] = None
+
+
+class PriceChange(msgspec.Struct, gc=False):
+    m5: Optional[float] = None
+
+
+class Pair(msgspec.Struct, rename="camel", gc=False):
+    """One DEX Screener pair, limited to the fields the scanner uses."""
+
+    chain_id: str = ""
+    base_token: Optional[BaseToken] = None
+    price_usd: Optional[float] = None
+    volume: Optional[Volume] = None
+    liquidity: Optional[Liquidity] = None
+    price_change: Optional[PriceChange] = None
+    pair_created_at: Optional[int] = None
+
+    @property
+    def liquidity_usd(self) -> float:
+        return (self.liquidity.usd or 0.0) if self.liquidity else 0.0
+
+
+class PairsResponse(msgspec.Struct):
+    """Body of ``/dex/search`` and ``/dex/tokens/...``; ``pairs`` may be null."""
+
+    pairs: Optional[List[Pair]] = None
+
+
+class TokenPrice(msgspec.Struct, rename="camel", gc=False):
+    """One entry of the Moralis multi-price response."""
+
+    token_address: str = ""
+    usd_price: Optional[float] = None
+
+
+class Holders(msgspec.Struct):
+    """Helius holder summary."""
+
+    total: int = 0
+
+
+class JupiterPrice(msgspec.Struct, gc=False):
+    """One entry of the Jupiter price response; unknown mints map to null."""
+
+    id: str = ""
+    price: Optional[float] = None
+
+
+class JupiterPrices(msgspec.Struct):
+    data: Dict[str, Optional[JupiterPrice]] = {}
+
+
+_pairs = msgspec.json.Decoder(PairsResponse, strict=False)
+_prices = msgspec.json.Decoder(List[TokenPrice], strict=False)
+_holders = msgspec.json.Decoder(Holders, strict=False)
+_jupiter_prices = msgspec.json.Decoder(JupiterPrices, strict=False)
+_raw = msgspec.json.Decoder()
+
+
+def _salvage(raw: object, item_type: Type[T]) -> List[T]:
+    """Convert the valid items of an already-parsed list, dropping the rest."""
+    items: List[T] = []
+    for item in raw if isinstance(raw, list) else ():
+        try:
+            items.append(msgspec.convert(item, item_type, strict=False))
+        except msgspec.ValidationError:
+            continue
+    if isinstance(raw, list) and len(items) < len(raw):
+        logger.debug(f"Dropped {len(raw) - len(items)} malformed {item_type.__name__} entries")
+    return items
+
+
+def decode_pairs(content: bytes) -> List[Pair]:
+    """Pairs from a DEX Screener response body."""
+    try:
+        return _pairs.decode(content).pairs or []
+    except msgspec.ValidationError:
+        raw = _raw.decode(content)
+        return _salvage(raw.get("pairs") if isinstance(raw, dict) else None, Pair)
+
+
+def decode_prices(content: bytes) -> List[TokenPrice]:
+    """Prices from a Moralis ``/token/{network}/prices`` response body."""
+    try:
+        return _prices.decode(content)
+    except msgspec.ValidationError:
+        return _salvage(_raw.decode(content), TokenPrice)
+
+
+def decode_holders(content: bytes) -> Holders:
+    """Holder summary from a Helius holders response body.
+
+    A body that does not fit raises ``msgspec.ValidationError``: there is
+    nothing to salvage, and an empty summary would be cached and applied as
+    a successful enrichment.
+    """
+    return _holders.decode(content)
+
+
+def decode_jupiter_prices(content: bytes) -> Dict[str, float]:
+    """Mint -> USD price from a Jupiter ``/price`` response body."""
+    try:
+        items = _jupiter_prices.decode(content).data
+    except msgspec.ValidationError:
+        raw = _raw.decode(content)
+        data = raw.get("data") if isinstance(raw, dict) else None
+        items = {}
+        for mint, item in data.items() if isinstance(data, dict) else ():
+            salvaged = _salvage([item], JupiterPrice)
+            items[mint] = salvaged[0] if salvaged else None
+    return {
+        mint: item.price
+        for mint, item in items.items()
+        if item is not None and item.price is not None
+    }
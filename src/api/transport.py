@@ -0,0 +1,220 @@
+"""Shared pooled HTTP transport used by every API client."""
+import importlib.util
+import json as jsonlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .coalesce import SingleFlight
+from .metrics import metrics
+
+logger = logging.getLogger("api.transport")
+
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class HostStats:
+    """Connection counters for a single origin."""
+
+    requests: int = 0
+    new_connections: int = 0
+    http2_responses: int = 0
+    coalesced: int = 0  # calls answered by another caller's identical request
+
+    @property
+    def reused_connections(self) -> int:
+        """Requests served over an already open connection."""
+        return max(0, self.requests - self.new_connections)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "http2_responses": self.http2_responses,
+            "coalesced": self.coalesced,
+        }
+
+
+class HttpTransport:
+    """Keep-alive connection pools, one per host, shared by the API clients.
+
+    Each origin gets its own ``httpx.AsyncClient`` so a slow host can never
+    exhaust the pool of another one. HTTP/2 is negotiated via ALPN when the
+    ``h2`` package is installed and the host supports it.
+
+    Identical concurrent GETs (same URL, params and headers) are coalesced:
+    one request goes out and every caller gets its response. Read-only POSTs
+    opt in with ``coalesce=True``. Subclasses answering requests themselves
+    override ``_send`` and keep the coalescing.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        coalesce: bool = True,
+    ) -> None:
+        self.timeout = timeout
+        self.coalesce = coalesce
+        self.flights = SingleFlight()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.stats: Dict[str, HostStats] = {}
+        # Optional ResponseRecorder capturing every response for replay
+        self.recorder = None
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _client(self, origin: str) -> httpx.AsyncClient:
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[origin] = client
+            logger.debug(f"Opened connection pool for {origin}")
+        return client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+        coalesce: Optional[bool] = None,
+    ) -> httpx.Response:
+        """Send a request through the pool of the target host.
+
+        ``coalesce`` defaults to True for GET; the response object is shared
+        by every caller that joined the flight, so treat it as read-only.
+        """
+        method = method.upper()
+        if coalesce is None:
+            coalesce = method == "GET"
+        async def send() -> httpx.Response:
+            return await self._send(
+                method, url, params=params, headers=headers, json=json, timeout=timeout
+            )
+
+        if not (coalesce and self.coalesce):
+            return await send()
+        key = (
+            method,
+            url,
+            jsonlib.dumps(params, sort_keys=True, default=str) if params else "",
+            jsonlib.dumps(headers, sort_keys=True) if headers else "",
+            jsonlib.dumps(json, sort_keys=True, default=str) if json is not None else "",
+        )
+        if self.flights.pending(key):
+            self.stats.setdefault(self._origin(url), HostStats()).coalesced += 1
+        return await self.flights.do(key, send)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        origin = self._origin(url)
+        stats = self.stats.setdefault(origin, HostStats())
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+
+        kwargs: Dict[str, Any] = {
+            "params": params,
+            "headers": headers,
+            "extensions": {"trace": trace},
+        }
+        if json is not None:
+            kwargs["json"] = json
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        stats.requests += 1
+        started = time.perf_counter() if metrics.enabled else 0.0
+        try:
+            resp = await self._client(origin).request(method, url, **kwargs)
+        except httpx.TimeoutException:
+            if started:
+                metrics.observe_timeout(url, time.perf_counter() - started)
+            raise
+        except httpx.HTTPError:
+            if started:
+                metrics.observe_response(url, time.perf_counter() - started, None)
+            raise
+        if started:
+            metrics.observe_response(url, time.perf_counter() - started, resp.status_code)
+        if resp.http_version == "HTTP/2":
+            stats.http2_responses += 1
+        if self.recorder is not None:
+            self.recorder.record(method, url, params, json, resp)
+        return resp
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return reuse/new connection counters per host."""
+        return {origin: s.as_dict() for origin, s in self.stats.items()}
+
+    async def close(self) -> None:
+        """Close every pool. The transport can be reused afterwards."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    async def __aenter__(self) -> "HttpTransport":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+
+_default_transport: Optional[HttpTransport] = None
+
+
+def default_transport() -> HttpTransport:
+    """Process-wide transport for callers that do not own one."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = HttpTransport()
+    return _default_transport
+
+
+async def close_default_transport() -> None:
+    global _default_transport
+    if _default_transport is not None:
+        await _default_transport.close()
+        _default_transport = None
@@ -0,0 +1,10 @@
+"""Small helpers shared by the API clients."""
+from typing import Iterator, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    """Yield consecutive chunks of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
@@ -0,0 +1,144 @@
+"""Push scanner, position and stats changes to many subscribers as deltas."""
+
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple
+
+from src.bot.snapshot import jsonable
+
+if TYPE_CHECKING:
+    from src.bot.feeds import FeedAggregator
+    from src.bot.trading import TradingEngine
+
+logger = logging.getLogger("bot.broadcast")
+
+SECTIONS = ("tokens", "positions", "stats")
+
+
+def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Entries added or changed in ``new`` and keys that disappeared."""
+    upsert = {key: value for key, value in new.items() if old.get(key) != value}
+    remove = [key for key in old if key not in new]
+    return {"upsert": upsert, "remove": remove} if upsert or remove else {}
+
+
+class Subscriber:
+    """Bounded outbox of pre-serialised messages for one client.
+
+    A client that falls ``maxsize`` messages behind loses its backlog and
+    is sent a fresh snapshot instead, so a slow reader never holds memory
+    or slows down the broadcaster.
+    """
+
+    def __init__(self, broadcaster: "StateBroadcaster", maxsize: int = 64) -> None:
+        self.broadcaster = broadcaster
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize)
+        self.resyncs = 0
+
+    def offer(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resyncs += 1
+            self.queue.put_nowait(self.broadcaster.snapshot_message())
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class StateBroadcaster:
+    """Diffs bot state once per ``interval`` and fans the delta out.
+
+    State is the top ``top`` tokens, the open positions and the engine
+    stats, read from the feeds' and engine's published snapshots; a tick
+    where neither snapshot version moved does no work. Each delta is
+    serialised once and shared by every subscriber; the per-tick cost does
+    not depend on the number of clients.
+    """
+
+    def __init__(
+        self,
+        feeds: "FeedAggregator",
+        engine: "TradingEngine",
+        interval: float = 1.0,
+        top: int = 20,
+    ) -> None:
+        self.feeds = feeds
+        self.engine = engine
+        self.interval = interval
+        self.top = top
+        self.version = 0
+        self.state: Dict[str, Dict[str, Any]] = {section: {} for section in SECTIONS}
+        self.subscribers: Set[Subscriber] = set()
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[str] = None
+        self._seen: Tuple[int, int] = (-1, -1)
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def subscribe(self, maxsize: int = 64) -> Subscriber:
+        subscriber = Subscriber(self, maxsize)
+        subscriber.offer(self.snapshot_message())
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    async def _loop(self) -> None:
+        while self.running:
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Broadcast error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        feeds, engine = self.feeds.snapshot, self.engine.snapshot
+        return {
+            "tokens": {t["address"]: t for t in feeds.data.get("tokens", ())[:self.top]},
+            "positions": {p["address"]: p for p in engine.data.get("positions", ())},
+            "stats": dict(engine.data.get("stats", {})),
+        }
+
+    def tick(self) -> Optional[str]:
+        """Publish the changes since the last tick; returns the message sent."""
+        seen = (self.feeds.snapshot.version, self.engine.snapshot.version)
+        if seen == self._seen:
+            return None
+        self._seen = seen
+        state = self.collect()
+        changes = {section: diff(self.state[section], state[section]) for section in SECTIONS}
+        self.state = state
+        changes = {section: change for section, change in changes.items() if change}
+        if not changes:
+            return None
+        self.version += 1
+        self._snapshot = None
+        message = json.dumps(
+            {"type": "delta", "version": self.version, **changes}, default=jsonable
+        )
+        for subscriber in list(self.subscribers):
+            subscriber.offer(message)
+        return message
+
+    def snapshot_message(self) -> str:
+        """Full state at the current version, serialised once per version."""
+        if self._snapshot is None:
+            self._snapshot = json.dumps(
+                {"type": "snapshot", "version": self.version, **self.state}, default=jsonable
+            )
+        return self._snapshot
@@ -3,6 +3,24 @@ import os
 import json
 from solders.keypair import Keypair
 from dataclasses import dataclass
+from functools import lru_cache
+
+PUBLIC_RPC = "https://api.mainnet-beta.solana.com"
+
+
+@lru_cache(maxsize=4)
+def load_keys(secret: str) -> tuple[tuple[Keypair, str], ...]:
+    """(keypair, public key) pairs from one JSON byte array or a list of them.
+
+    Cached per secret string, so repeated lookups never re-parse.
+    """
+    try:
+        data = json.loads(secret)
+        secrets = data if data and isinstance(data[0], list) else [data]
+        keypairs = [Keypair.from_bytes(bytes(item)) for item in secrets]
+    except Exception:
+        return ()
+    return tuple((kp, str(kp.pubkey())) for kp in keypairs)
 
 @dataclass
 class Settings:
@@ -11,22 +29,132 @@ class Settings:
     helius_key: str = os.getenv("HELIUS_KEY", "demo")
     moralis_key: str | None = os.getenv("MORALIS_KEY")
     sol_secret: str | None = os.getenv("SOL_SECRET")
+
+    # Provider quotas used by the enrichment scheduler
+    moralis_rps: float = float(os.getenv("MORALIS_RPS", "5"))
+    moralis_concurrency: int = int(os.getenv("MORALIS_CONCURRENCY", "4"))
+    helius_rps: float = float(os.getenv("HELIUS_RPS", "10"))
+    helius_concurrency: int = int(os.getenv("HELIUS_CONCURRENCY", "4"))
+
+    # Bounded token universe: hard cap, optional memory cap (MB) and TTL (s)
+    max_tokens: int = int(os.getenv("MAX_TOKENS", "5000"))
+    max_universe_mb: float = float(os.getenv("MAX_UNIVERSE_MB", "0"))
+    token_ttl: float = float(os.getenv("TOKEN_TTL", "1800"))
+
+    # Price samples kept per token. Ticks closer together than 300s / capacity
+    # are merged, so the ring spans the 5m window at any cadence (held
+    # tokens are re-priced every 0.5s)
+    history_capacity: int = int(os.getenv("HISTORY_CAPACITY", "64"))
+
+    # SQLite journal for positions, PnL and the token universe (empty = off)
+    journal_path: str | None = os.getenv("JOURNAL_PATH")
+    # On-disk tier of the Helius holders/metadata cache (unset = memory only)
+    cache_path: str | None = os.getenv("CACHE_PATH")
+
+    # Standalone Prometheus endpoint for front-ends without the API app (0 = off)
+    metrics_port: int = int(os.getenv("METRICS_PORT", "0"))
+
+    # Warm exit quotes: max age (s) a prefetched quote may have, refresh interval (s)
+    exit_quote_ttl: float = float(os.getenv("EXIT_QUOTE_TTL", "2.0"))
+    exit_quote_interval: float = float(os.getenv("EXIT_QUOTE_INTERVAL", "1.0"))
+
+    # DEX Screener quota (req/s) and the share reserved for the position monitor
+    dexscreener_rps: float = float(os.getenv("DEXSCREENER_RPS", "5"))
+    position_rps: float = float(os.getenv("POSITION_RPS", "2"))
+    # Batched price refreshes (30 tokens each) per second, out of discovery's share
+    dex_refresh_rps: float = float(os.getenv("DEX_REFRESH_RPS", "2"))
+    # Window (s) in which concurrent DexScreener pair lookups are merged; 0 disables
+    dex_batch_window: float = float(os.getenv("DEX_BATCH_WINDOW", "0.02"))
+    # Jupiter price lookups per second, used only as the last price fallback
+    jupiter_price_rps: float = float(os.getenv("JUPITER_PRICE_RPS", "1"))
+    # Shares of the Moralis and Jupiter quotas reserved for pricing held
+    # positions while DEX Screener is down (taken out of the other lanes)
+    position_moralis_rps: float = float(os.getenv("POSITION_MORALIS_RPS", "1"))
+    position_jupiter_rps: float = float(os.getenv("POSITION_JUPITER_RPS", "0.5"))
+    # Provider health: failures before a breaker opens, first/longest open period (s)
+    breaker_failures: int = int(os.getenv("BREAKER_FAILURES", "3"))
+    breaker_reset: float = float(os.getenv("BREAKER_RESET", "5"))
+    breaker_max_reset: float = float(os.getenv("BREAKER_MAX_RESET", "120"))
+    # Longest a provider call may take before it counts as failed and is skipped (s)
+    provider_timeout: float = float(os.getenv("PROVIDER_TIMEOUT", "5"))
+    # Streamed prices younger than this (s) are used without asking a provider
+    stream_price_age: float = float(os.getenv("STREAM_PRICE_AGE", "2"))
+    # How often (s) held mints are re-priced by the position monitor
+    position_poll_interval: float = float(os.getenv("POSITION_POLL_INTERVAL", "0.5"))
+
+    # Number of position exits allowed to run at the same time
+    max_parallel_exits: int = int(os.getenv("MAX_PARALLEL_EXITS", "5"))
+
+    # Headless service: seconds between state deltas and number of top tokens streamed
+    broadcast_interval: float = float(os.getenv("BROADCAST_INTERVAL", "1.0"))
+    broadcast_top: int = int(os.getenv("BROADCAST_TOP", "20"))
+    # Top tokens kept in the published scanner snapshot
+    snapshot_top: int = int(os.getenv("SNAPSHOT_TOP", "20"))
+
+    # Score the universe with NumPy arrays instead of per-token loops
+    columnar_scoring: bool = os.getenv("COLUMNAR_SCORING", "0") == "1"
+
+    # Append every raw provider response to this gzip JSONL file for replay
+    record_path: str | None = os.getenv("RECORD_PATH")
+
+    # Streaming pool discovery (logsSubscribe on ``ws_url``), off unless asked for
+    stream_discovery: bool = os.getenv("STREAM_DISCOVERY", "0") == "1"
+    # WebSocket RPC endpoint (defaults to Helius)
+    solana_ws_url: str | None = os.getenv("SOLANA_WS_URL")
+
+    # Comma separated JSON-RPC endpoints (defaults to Helius, then the public node)
+    solana_rpc_urls: str = os.getenv("SOLANA_RPC_URLS", "")
+    # Seconds between latency/slot probes and slots an endpoint may fall behind
+    rpc_probe_interval: float = float(os.getenv("RPC_PROBE_INTERVAL", "2"))
+    rpc_max_slot_lag: int = int(os.getenv("RPC_MAX_SLOT_LAG", "20"))
+
+    # Sign and send swaps on chain (off = paper trading on quotes only)
+    live_trading: bool = os.getenv("LIVE_TRADING", "0") == "1"
+    # Priority fee: percentile of recent fees, clamped to [min, max] micro-lamports/CU
+    priority_fee_percentile: float = float(os.getenv("PRIORITY_FEE_PERCENTILE", "75"))
+    priority_fee_min: int = int(os.getenv("PRIORITY_FEE_MIN", "1000"))
+    priority_fee_max: int = int(os.getenv("PRIORITY_FEE_MAX", "1000000"))
+    # Seconds between re-broadcasts of a pending transaction and blockhash refreshes
+    rebroadcast_interval: float = float(os.getenv("REBROADCAST_INTERVAL", "2"))
+    blockhash_refresh_interval: float = float(os.getenv("BLOCKHASH_REFRESH_INTERVAL", "2"))
+    # Wallets holding fewer lamports than this get no new swaps (fees and rent)
+    wallet_min_lamports: int = int(os.getenv("WALLET_MIN_LAMPORTS", "5000000"))
+
+    @property
+    def rpc_urls(self) -> list[str]:
+        """JSON-RPC endpoints for the RPC pool."""
+        urls = [url.strip() for url in self.solana_rpc_urls.split(",") if url.strip()]
+        if urls:
+            return urls
+        if self.helius_key and self.helius_key != "demo":
+            urls.append(f"https://mainnet.helius-rpc.com/?api-key={self.helius_key}")
+        urls.append(PUBLIC_RPC)
+        return urls
+
+    @property
+    def ws_url(self) -> str | None:
+        """WebSocket RPC endpoint for subscriptions, if any."""
+        if self.solana_ws_url:
+            return self.solana_ws_url
+        if self.helius_key and self.helius_key != "demo":
+            return f"wss://mainnet.helius-rpc.com/?api-key={self.helius_key}"
+        return None
     
+    @property
+    def keypairs(self) -> list[Keypair]:
+        """All wallets in SOL_SECRET."""
+        return [kp for kp, _ in load_keys(self.sol_secret)] if self.sol_secret else []
+
     @property
     def keypair(self) -> Keypair | None:
-        """Create Keypair from secret."""
-        if not self.sol_secret:
-            return None
-        try:
-            secret_list = json.loads(self.sol_secret)
-            return Keypair.from_bytes(bytes(secret_list))
-        except:
-            return None
+        """Primary wallet keypair."""
+        keys = load_keys(self.sol_secret) if self.sol_secret else ()
+        return keys[0][0] if keys else None
     
     @property
     def public_key(self) -> str | None:
-        """Get public key as string."""
-        kp = self.keypair
-        return str(kp.pubkey()) if kp else None
+        """Primary wallet public key as string."""
+        keys = load_keys(self.sol_secret) if self.sol_secret else ()
+        return keys[0][1] if keys else None
 
 settings = Settings()
@@ -0,0 +1,278 @@
+"""Streaming token discovery from Raydium / Pump.fun program logs."""
+
+import asyncio
+import base64
+import json
+import logging
+import struct
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import base58
+import websockets
+from solders.pubkey import Pubkey
+
+from src.api.rpc import RpcPool
+from src.bot.feeds import TokenData
+
+logger = logging.getLogger("bot.discovery")
+
+RAYDIUM_AMM_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+PUMP_FUN = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+
+# Anchor event discriminator: sha256("event:CreateEvent")[:8]
+PUMP_CREATE_EVENT = bytes.fromhex("1b72a94ddeeb6376")
+
+# First data byte of the Raydium AMM v4 ``initialize2`` instruction
+RAYDIUM_INITIALIZE2 = bytes([1])
+
+# Mints that are never "the new token" in a pool
+QUOTE_MINTS = {
+    "So11111111111111111111111111111111111111112",
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+}
+
+TokenCallback = Callable[[TokenData], Awaitable[None]]
+MintResolver = Callable[[str], Awaitable[Optional[TokenData]]]
+
+
+def _read_string(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    return data[offset:offset + length].decode("utf-8", "replace"), offset + length
+
+
+def parse_pump_create(logs: List[str]) -> Optional[TokenData]:
+    """Decode a Pump.fun CreateEvent from a transaction's log lines."""
+    if not any("Instruction: Create" in line for line in logs):
+        return None
+    for line in logs:
+        if not line.startswith("Program data: "):
+            continue
+        try:
+            data = base64.b64decode(line[len("Program data: "):])
+        except ValueError:
+            continue
+        if data[:8] != PUMP_CREATE_EVENT:
+            continue
+        try:
+            name, offset = _read_string(data, 8)
+            symbol, offset = _read_string(data, offset)
+            _uri, offset = _read_string(data, offset)
+            mint = Pubkey.from_bytes(data[offset:offset + 32])
+        except (struct.error, ValueError):
+            return None
+        return TokenData(
+            address=str(mint),
+            symbol=symbol,
+            name=name,
+            decimals=6,
+            created_at=datetime.utcnow(),
+        )
+    return None
+
+
+def is_raydium_pool_init(logs: List[str]) -> bool:
+    """Raydium AMM v4 logs ``initialize2`` when a new pool is created."""
+    return any("initialize2" in line for line in logs)
+
+
+def raydium_init_mints(transaction: Dict[str, Any]) -> Optional[tuple[str, str]]:
+    """Return (coin mint, pc mint) from a Raydium ``initialize2`` instruction.
+
+    Works on a ``jsonParsed`` transaction, looking at top-level and inner
+    instructions. ``initialize2`` accounts 8 and 9 are the coin and pc mints
+    (account 7 is the LP mint).
+    """
+    message = (transaction.get("transaction") or {}).get("message") or {}
+    instructions = list(message.get("instructions") or [])
+    for inner in (transaction.get("meta") or {}).get("innerInstructions") or []:
+        instructions.extend(inner.get("instructions") or [])
+    for ix in instructions:
+        accounts = ix.get("accounts") or []
+        if ix.get("programId") != RAYDIUM_AMM_V4 or len(accounts) < 10:
+            continue
+        try:
+            data = base58.b58decode(ix.get("data", ""))
+        except ValueError:
+            continue
+        if data[:1] == RAYDIUM_INITIALIZE2:
+            return accounts[8], accounts[9]
+    return None
+
+
+class RpcMintResolver:
+    """Resolve the new mint of a pool-creation transaction via ``getTransaction``.
+
+    The listener sees transactions at ``processed``; they are fetched at
+    ``confirmed`` and retried with backoff until the node has them.
+    """
+
+    def __init__(self, rpc: RpcPool, retries: int = 4, retry_delay: float = 0.5) -> None:
+        self.rpc = rpc
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    async def __call__(self, signature: str) -> Optional[TokenData]:
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            result = await self.rpc.get_transaction(signature)
+            if result is not None:
+                return self._token_from(result)
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+        logger.debug(f"Transaction {signature} still unavailable after {self.retries} retries")
+        return None
+
+    @staticmethod
+    def _token_from(result: Dict[str, Any]) -> Optional[TokenData]:
+        mints = raydium_init_mints(result)
+        if mints is None:
+            return None
+        coin, pc = mints
+        mint = coin if coin not in QUOTE_MINTS else pc
+        if mint in QUOTE_MINTS:
+            return None
+        decimals = 9
+        for balance in (result.get("meta") or {}).get("postTokenBalances") or []:
+            if balance.get("mint") == mint:
+                decimals = (balance.get("uiTokenAmount") or {}).get("decimals", 9)
+                break
+        return TokenData(address=mint, decimals=int(decimals), created_at=datetime.utcnow())
+
+
+class PoolListener:
+    """``logsSubscribe`` listener turning pool creations into TokenData.
+
+    Reconnects with exponential backoff and re-subscribes every program on
+    each new connection. Pump.fun creations are decoded straight from the
+    logs; Raydium pools need ``resolver`` to look up the mint.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        on_token: TokenCallback,
+        programs: Optional[List[str]] = None,
+        resolver: Optional[MintResolver] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        self.ws_url = ws_url
+        self.on_token = on_token
+        self.programs = programs or [PUMP_FUN, RAYDIUM_AMM_V4]
+        self.resolver = resolver
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, str] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._resolving: Set[asyncio.Task] = set()
+        self._seen: Set[str] = set()
+        self._seen_order: Deque[str] = deque()
+        self.stats = {"connections": 0, "notifications": 0, "tokens": 0, "errors": 0}
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self.run())
+        logger.info(f"Pool listener started for {len(self.programs)} programs")
+
+    async def stop(self) -> None:
+        self.running = False
+        tasks = list(self._resolving)
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self) -> None:
+        delay = self.reconnect_delay
+        while self.running:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    self.stats["connections"] += 1
+                    await self._subscribe(ws)
+                    delay = self.reconnect_delay
+                    async for raw in ws:
+                        await self._handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Pool listener disconnected: {e}")
+            if self.running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _subscribe(self, ws: Any) -> None:
+        self._subscriptions.clear()
+        self._pending.clear()
+        for request_id, program in enumerate(self.programs, 1):
+            self._pending[request_id] = program
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "logsSubscribe",
+                "params": [{"mentions": [program]}, {"commitment": "processed"}],
+            }))
+
+    def _remember(self, signature: str) -> bool:
+        """Return False if the signature was already handled."""
+        if signature in self._seen:
+            return False
+        self._seen.add(signature)
+        self._seen_order.append(signature)
+        if len(self._seen_order) > 10000:
+            self._seen.discard(self._seen_order.popleft())
+        return True
+
+    async def _handle_message(self, raw: Any) -> None:
+        msg = json.loads(raw)
+        if "id" in msg and "result" in msg:
+            program = self._pending.get(msg["id"])
+            if program:
+                self._subscriptions[msg["result"]] = program
+            return
+        if msg.get("method") != "logsNotification":
+            return
+
+        self.stats["notifications"] += 1
+        params = msg.get("params", {})
+        value = params.get("result", {}).get("value", {})
+        if value.get("err") is not None:
+            return
+        signature = value.get("signature", "")
+        logs = value.get("logs") or []
+        program = self._subscriptions.get(params.get("subscription"))
+        if not signature or not self._remember(signature):
+            return
+
+        if program in (PUMP_FUN, None):
+            token = parse_pump_create(logs)
+            if token:
+                await self._emit(token, signature)
+                return
+        if program in (RAYDIUM_AMM_V4, None) and self.resolver and is_raydium_pool_init(logs):
+            # The mint is not in the logs; resolve it without stalling the stream
+            task = asyncio.create_task(self._resolve(signature))
+            self._resolving.add(task)
+            task.add_done_callback(self._resolving.discard)
+
+    async def _resolve(self, signature: str) -> None:
+        try:
+            token = await self.resolver(signature)
+        except Exception as e:
+            logger.debug(f"Could not resolve pool mint for {signature}: {e}")
+            return
+        if token:
+            await self._emit(token, signature)
+
+    async def _emit(self, token: TokenData, signature: str) -> None:
+        self.stats["tokens"] += 1
+        logger.debug(f"Discovered {token.symbol or token.address} from {signature[:8]}")
+        await self.on_token(token)
@@ -0,0 +1,105 @@
+"""Asyncio publish/subscribe channel for token updates."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+
+
+@dataclass
+class TokenUpdate:
+    """A token changed. ``published_at`` is a ``time.monotonic()`` stamp."""
+
+    address: str
+    source: str = ""
+    published_at: float = field(default_factory=time.monotonic)
+
+
+class Subscription:
+    """Bounded, coalescing inbox for one subscriber.
+
+    Pending updates are keyed by token address, so a burst of updates for
+    the same token collapses into one entry. The oldest ``published_at`` is
+    kept so latency is measured from the first unprocessed update. When the
+    inbox holds ``maxsize`` distinct tokens, publishers either wait (``block``)
+    or the oldest pending token is dropped (``drop_oldest``).
+    """
+
+    def __init__(self, maxsize: int = 1024, overflow: str = BLOCK) -> None:
+        if overflow not in (BLOCK, DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.pending: "OrderedDict[str, TokenUpdate]" = OrderedDict()
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    async def put(self, event: TokenUpdate) -> None:
+        self.received += 1
+        current = self.pending.get(event.address)
+        if current is not None:
+            current.source = event.source
+            self.coalesced += 1
+            return
+        while len(self.pending) >= self.maxsize:
+            if self.overflow == DROP_OLDEST:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+                break
+            self._space.clear()
+            await self._space.wait()
+            if event.address in self.pending:
+                self.pending[event.address].source = event.source
+                self.coalesced += 1
+                return
+        self.pending[event.address] = event
+        self._ready.set()
+
+    async def get_batch(self) -> Dict[str, TokenUpdate]:
+        """Wait for updates and take everything pending at once."""
+        while not self.pending:
+            self._ready.clear()
+            await self._ready.wait()
+        batch = dict(self.pending)
+        self.pending.clear()
+        self._ready.clear()
+        self._space.set()
+        return batch
+
+
+class EventBus:
+    """Fan-out of TokenUpdate events to every subscriber."""
+
+    def __init__(self) -> None:
+        self.subscribers: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, maxsize: int = 1024, overflow: str = BLOCK) -> Subscription:
+        sub = Subscription(maxsize, overflow)
+        self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
+
+    async def publish(self, event: TokenUpdate) -> None:
+        self.published += 1
+        for sub in list(self.subscribers):
+            await sub.put(event)
+
+    async def publish_many(self, addresses: Iterable[str], source: str) -> None:
+        now = time.monotonic()
+        for address in addresses:
+            await self.publish(TokenUpdate(address, source, now))
@@ -0,0 +1,452 @@
+"""Transaction send pipeline for live trading.
+
+``TransactionSender`` takes the unsigned swap transaction Jupiter builds
+and gets it on chain with as little latency as possible:
+
+* a ``BlockhashCache`` keeps a recent blockhash and the current block
+  height refreshed in the background, so no RPC round trip sits between
+  the swap response and the first broadcast;
+* signing runs on a dedicated thread, off the event loop;
+* the compute-unit price passed to Jupiter comes from a rolling
+  ``PriorityFeeEstimator`` over ``getRecentPrioritizationFees``;
+* the signed transaction is re-broadcast every ``rebroadcast_interval``
+  until it lands or its blockhash expires;
+* a ``SignatureTracker`` confirms any number of pending signatures at
+  once through ``signatureSubscribe``, with batched
+  ``getSignatureStatuses`` polls as a fallback.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import websockets
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message, MessageV0
+from solders.transaction import VersionedTransaction
+
+from src.api.rpc import RpcPool
+from src.bot.utils import percentile
+
+logger = logging.getLogger("bot.execution")
+
+# A blockhash is valid for 150 blocks of ~400ms; past this (plus a margin)
+# a transaction can no longer land even if no block height was observed
+BLOCKHASH_LIFETIME = 150 * 0.4
+
+
+def restamp(message: Any, blockhash: Hash) -> Any:
+    """Copy of ``message`` with ``blockhash`` as its recent blockhash."""
+    if isinstance(message, MessageV0):
+        return MessageV0(
+            message.header,
+            message.account_keys,
+            blockhash,
+            message.instructions,
+            message.address_table_lookups,
+        )
+    header = message.header
+    return Message.new_with_compiled_instructions(
+        header.num_required_signatures,
+        header.num_readonly_signed_accounts,
+        header.num_readonly_unsigned_accounts,
+        message.account_keys,
+        blockhash,
+        message.instructions,
+    )
+
+
+def sign_transaction(raw: bytes, keypair: Keypair, blockhash: Optional[str] = None) -> Tuple[bytes, str]:
+    """Sign a serialized transaction, optionally re-stamping its blockhash.
+
+    Returns the signed wire bytes and the transaction signature.
+    """
+    message = VersionedTransaction.from_bytes(raw).message
+    if blockhash:
+        message = restamp(message, Hash.from_string(blockhash))
+    signed = VersionedTransaction(message, [keypair])
+    return bytes(signed), str(signed.signatures[0])
+
+
+class BlockhashCache:
+    """Latest blockhash and block height, refreshed every ``interval`` seconds."""
+
+    def __init__(self, rpc: RpcPool, interval: float = 2.0, commitment: str = "confirmed") -> None:
+        self.rpc = rpc
+        self.interval = interval
+        self.commitment = commitment
+        self.blockhash: Optional[str] = None
+        self.last_valid_block_height = 0
+        self.block_height = 0
+        self.fetched_at = 0.0
+        self.refreshes = 0
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Blockhash refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> None:
+        latest, height = await asyncio.gather(
+            self.rpc.get_latest_blockhash(self.commitment),
+            self.rpc.get_block_height(self.commitment),
+        )
+        self.blockhash = latest["blockhash"]
+        self.last_valid_block_height = int(latest["lastValidBlockHeight"])
+        self.block_height = max(self.block_height, int(height))
+        self.fetched_at = time.monotonic()
+        self.refreshes += 1
+
+    async def get(self) -> Tuple[str, int]:
+        """(blockhash, last valid block height), fetched inline only when stale."""
+        if self.blockhash is None or time.monotonic() - self.fetched_at > self.interval * 3:
+            await self.refresh()
+        assert self.blockhash is not None
+        return self.blockhash, self.last_valid_block_height
+
+    def stats(self) -> dict:
+        return {
+            "age_ms": (time.monotonic() - self.fetched_at) * 1000 if self.fetched_at else None,
+            "block_height": self.block_height,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+        }
+
+
+class PriorityFeeEstimator:
+    """Percentile of recent non-zero prioritization fees (micro-lamports per CU).
+
+    Keeps the fees of the last ``window`` slots; the estimate is clamped to
+    ``[min_fee, max_fee]`` and is ``min_fee`` until samples arrive.
+    """
+
+    def __init__(
+        self,
+        rpc: RpcPool,
+        q: float = 75.0,
+        window: int = 150,
+        min_fee: int = 1_000,
+        max_fee: int = 1_000_000,
+        interval: float = 10.0,
+    ) -> None:
+        self.rpc = rpc
+        self.q = q
+        self.window = window
+        self.min_fee = min_fee
+        self.max_fee = max_fee
+        self.interval = interval
+        self.fees: Dict[int, int] = {}  # slot -> fee
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"Priority fee refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self, accounts: Optional[List[str]] = None) -> None:
+        for sample in await self.rpc.get_recent_prioritization_fees(accounts):
+            self.fees[int(sample["slot"])] = int(sample["prioritizationFee"])
+        for slot in sorted(self.fees)[: max(0, len(self.fees) - self.window)]:
+            del self.fees[slot]
+
+    def estimate(self) -> int:
+        paying = [fee for fee in self.fees.values() if fee > 0]
+        if not paying:
+            return self.min_fee
+        return int(min(self.max_fee, max(self.min_fee, percentile(paying, self.q))))
+
+    def stats(self) -> dict:
+        return {"estimate": self.estimate(), "samples": len(self.fees), "errors": self.errors}
+
+
+class SignatureTracker:
+    """Waits for many signatures at once.
+
+    Each tracked signature gets a ``signatureSubscribe`` on one shared
+    WebSocket (re-subscribed after reconnects); a poll of
+    ``getSignatureStatuses`` over everything pending resolves whatever the
+    socket missed. Futures resolve to the status value, whose ``err`` is
+    None for a successful transaction.
+    """
+
+    def __init__(
+        self,
+        rpc: RpcPool,
+        ws_url: Optional[str] = None,
+        poll_interval: float = 1.0,
+        commitment: str = "confirmed",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.rpc = rpc
+        self.ws_url = ws_url
+        self.poll_interval = poll_interval
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.pending: Dict[str, asyncio.Future] = {}
+        self._ws: Any = None
+        self._ids = 0
+        self._requests: Dict[int, str] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._subscribing: Set[asyncio.Task] = set()
+        self.stats_counts = {"via_ws": 0, "via_poll": 0, "reconnects": 0}
+
+    async def start(self) -> None:
+        self._tasks.append(asyncio.create_task(self._poll_loop()))
+        if self.ws_url:
+            self._tasks.append(asyncio.create_task(self._ws_loop()))
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._subscribing)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def track(self, signature: str) -> "asyncio.Future[Dict[str, Any]]":
+        future = self.pending.get(signature)
+        if future is None:
+            future = self.pending[signature] = asyncio.get_running_loop().create_future()
+            if self._ws is not None:
+                task = asyncio.create_task(self._subscribe(self._ws, signature))
+                self._subscribing.add(task)
+                task.add_done_callback(self._subscribing.discard)
+        return future
+
+    def forget(self, signature: str) -> None:
+        future = self.pending.pop(signature, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _resolve(self, signature: str, status: Dict[str, Any], via: str) -> None:
+        future = self.pending.get(signature)
+        if future is not None and not future.done():
+            future.set_result(status)
+            self.stats_counts[via] += 1
+
+    async def _subscribe(self, ws: Any, signature: str) -> None:
+        self._ids += 1
+        self._requests[self._ids] = signature
+        try:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": self._ids,
+                "method": "signatureSubscribe",
+                "params": [signature, {"commitment": self.commitment}],
+            }))
+        except Exception as e:
+            logger.debug(f"signatureSubscribe for {signature[:8]} failed: {e}")
+
+    async def _ws_loop(self) -> None:
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    self._ws = ws
+                    self._requests.clear()
+                    self._subscriptions.clear()
+                    for signature in list(self.pending):
+                        await self._subscribe(ws, signature)
+                    async for raw in ws:
+                        self._handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Signature socket disconnected: {e}")
+            finally:
+                self._ws = None
+            self.stats_counts["reconnects"] += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _handle_message(self, raw: Any) -> None:
+        msg = json.loads(raw)
+        if "id" in msg and "result" in msg:
+            signature = self._requests.pop(msg["id"], None)
+            if signature is not None:
+                self._subscriptions[msg["result"]] = signature
+            return
+        if msg.get("method") != "signatureNotification":
+            return
+        params = msg.get("params", {})
+        signature = self._subscriptions.pop(params.get("subscription"), None)
+        value = params.get("result", {}).get("value")
+        if signature is not None and isinstance(value, dict):
+            self._resolve(signature, value, "via_ws")
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self.pending:
+                try:
+                    await self.poll()
+                except Exception as e:
+                    logger.debug(f"Signature status poll failed: {e}")
+
+    async def poll(self) -> None:
+        signatures = list(self.pending)
+        for start in range(0, len(signatures), 256):  # RPC limit per call
+            chunk = signatures[start:start + 256]
+            statuses = await self.rpc.get_signature_statuses(chunk)
+            for signature, status in zip(chunk, statuses):
+                if status and (
+                    status.get("err") is not None
+                    or status.get("confirmationStatus") in ("confirmed", "finalized")
+                ):
+                    self._resolve(signature, status, "via_poll")
+
+    def stats(self) -> dict:
+        return dict(self.stats_counts, pending=len(self.pending), connected=self._ws is not None)
+
+
+@dataclass
+class SendResult:
+    signature: str
+    landed: bool
+    error: Any = None
+    time_to_land: Optional[float] = None  # seconds from submit to confirmation
+    broadcasts: int = 0
+    wallet: Optional[str] = None  # signing wallet's public key
+
+
+class TransactionSender:
+    """Sign, broadcast and confirm swap transactions (see module docstring)."""
+
+    def __init__(
+        self,
+        rpc: RpcPool,
+        ws_url: Optional[str] = None,
+        rebroadcast_interval: float = 2.0,
+        blockhash_interval: float = 2.0,
+        fees: Optional[PriorityFeeEstimator] = None,
+        max_pending: float = BLOCKHASH_LIFETIME + 15.0,
+    ) -> None:
+        self.rpc = rpc
+        self.rebroadcast_interval = rebroadcast_interval
+        self.max_pending = max_pending
+        self.blockhash = BlockhashCache(rpc, blockhash_interval)
+        self.fees = fees or PriorityFeeEstimator(rpc)
+        self.tracker = SignatureTracker(rpc, ws_url)
+        self._signer: Optional[ThreadPoolExecutor] = None
+        self.land_times: Deque[float] = deque(maxlen=1000)
+        self.landed = 0
+        self.failed = 0
+        self.expired = 0
+
+    async def start(self) -> None:
+        self._signer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="signer")
+        await self.blockhash.start()
+        await self.fees.start()
+        await self.tracker.start()
+
+    async def stop(self) -> None:
+        await self.tracker.stop()
+        await self.fees.stop()
+        await self.blockhash.stop()
+        if self._signer is not None:
+            self._signer.shutdown(wait=False)
+            self._signer = None
+
+    async def sign(self, raw: bytes, keypair: Keypair) -> Tuple[bytes, str, int]:
+        """Sign ``raw`` with the cached blockhash on the signer thread.
+
+        Returns the signed bytes, the signature and the last valid block height.
+        """
+        blockhash, last_valid = await self.blockhash.get()
+        signed, signature = await asyncio.get_running_loop().run_in_executor(
+            self._signer, sign_transaction, raw, keypair, blockhash
+        )
+        return signed, signature, last_valid
+
+    async def submit(self, raw: bytes, keypair: Keypair) -> SendResult:
+        """Sign and send ``raw`` until it lands, fails on chain or expires.
+
+        Expiry is the block height passing the blockhash's last valid one,
+        or ``max_pending`` seconds without a confirmation: during an RPC
+        outage the height stops moving and only the clock still bounds
+        the wait.
+        """
+        started = time.monotonic()
+        deadline = started + self.max_pending
+        signed, signature, last_valid = await self.sign(raw, keypair)
+        encoded = base64.b64encode(signed).decode()
+        confirmation = self.tracker.track(signature)
+        result = SendResult(signature, landed=False, wallet=str(keypair.pubkey()))
+        try:
+            while True:
+                try:
+                    await self.rpc.send_transaction(encoded)
+                    result.broadcasts += 1
+                except Exception as e:
+                    logger.debug(f"Broadcast of {signature[:8]} failed: {e}")
+                try:
+                    status = await asyncio.wait_for(
+                        asyncio.shield(confirmation), self.rebroadcast_interval
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    if self.blockhash.block_height > last_valid or time.monotonic() >= deadline:
+                        self.expired += 1
+                        result.error = "blockhash expired"
+                        return result
+        finally:
+            self.tracker.forget(signature)
+
+        result.time_to_land = time.monotonic() - started
+        if status.get("err") is not None:
+            self.failed += 1
+            result.error = status["err"]
+            return result
+        result.landed = True
+        self.landed += 1
+        self.land_times.append(result.time_to_land)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "landed": self.landed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "time_to_land_ms": {
+                "p50": percentile(self.land_times, 50) * 1000,
+                "p99": percentile(self.land_times, 99) * 1000,
+                "samples": len(self.land_times),
+            },
+            "priority_fee": self.fees.stats(),
+            "blockhash": self.blockhash.stats(),
+            "confirmations": self.tracker.stats(),
+        }
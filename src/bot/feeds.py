@@ -1,20 +1,36 @@
 """Data feed aggregation from Helius, Moralis and DEX Screener."""
 
 import asyncio
-import aiohttp
-import httpx
-from dataclasses import dataclass, field
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 import logging
 import os
 
+from src.api.cache import TieredCache
 from src.api.helius import HeliusAPI
 from src.api.dexscreener import DexScreenerAPI
+from src.api.jupiter import JupiterPriceAPI
+from src.api.metrics import LoopLagMonitor, MetricsServer, metrics
+from src.api.moralis import MoralisAPI
+from src.api.rpc import RpcPool
+from src.api.schemas import Pair
+from src.api.transport import HttpTransport, default_transport
+from src.bot.config import settings
+from src.bot.events import EventBus, TokenUpdate
+from src.bot.health import CircuitOpen, ProviderHealth
+from src.bot.history import WINDOWS, PriceHistory
+from src.bot.prices import PriceChain, StreamPrices
+from src.bot.ranking import RankedIndex
+from src.bot.scheduler import EnrichmentScheduler, TokenBucket
+from src.bot.snapshot import Snapshot, token_view
 
 logger = logging.getLogger("bot.feeds")
 
-@dataclass
+@dataclass(slots=True)
 class TokenData:
     """Enhanced token information."""
     
@@ -34,8 +50,25 @@ class TokenData:
     decimals: int = 9  # Default for SOL tokens
     base_price: float = 0.0
     opportunity: str = ""
+    history: Optional[PriceHistory] = field(default=None, repr=False, compare=False)
+
+    def observe(self, price: float, volume: float = 0.0) -> None:
+        """Set the latest price and record it in the tick history."""
+        self.price = price
+        if self.history is None:
+            self.history = PriceHistory(
+                settings.history_capacity, resolution=max(WINDOWS) / settings.history_capacity
+            )
+        self.history.record(price, volume)
+
+    @property
+    def momentum_5m(self) -> float:
+        """5m change from local ticks when they span 5 minutes, else DEX Screener's m5."""
+        if self.history is not None and self.history.covers(300):
+            return self.history.return_pct(300)
+        return self.price_change_5m
     
-    def calculate_score(self) -> float:
+    def calculate_score(self, now: Optional[datetime] = None) -> float:
         """Calculate trading score based on metrics."""
         score = 0.0
         
@@ -48,11 +81,12 @@ class TokenData:
             score += 10
             
         # Price momentum (0-30 points)
-        if self.price_change_5m > 10:
+        momentum = self.momentum_5m
+        if momentum > 10:
             score += 30
-        elif self.price_change_5m > 5:
+        elif momentum > 5:
             score += 20
-        elif self.price_change_5m > 2:
+        elif momentum > 2:
             score += 10
             
         # Liquidity score (0-20 points)
@@ -63,7 +97,7 @@ class TokenData:
             
         # Age penalty (0-20 points)
         if self.created_at:
-            age_hours = (datetime.utcnow() - self.created_at).total_seconds() / 3600
+            age_hours = ((now or datetime.utcnow()) - self.created_at).total_seconds() / 3600
             if age_hours < 1:  # Less than 1 hour old
                 score += 20
             elif age_hours < 6:
@@ -75,180 +109,646 @@ class TokenData:
     def analyze_opportunity(self) -> None:
         """Tag potential 3x/5x/10x opportunities based on simple heuristics."""
         opp = ""
-        if self.volume_5m > 100000 and self.price_change_5m > 100:
+        momentum = self.momentum_5m
+        if self.volume_5m > 100000 and momentum > 100:
             opp = "10x"
-        elif self.volume_5m > 50000 and self.price_change_5m > 50:
+        elif self.volume_5m > 50000 and momentum > 50:
             opp = "5x"
-        elif self.volume_5m > 20000 and self.price_change_5m > 20:
+        elif self.volume_5m > 20000 and momentum > 20:
             opp = "3x"
         self.opportunity = opp
 
 class FeedAggregator:
     """Aggregates token data from multiple services."""
     
-    def __init__(self) -> None:
-        self.session: Optional[aiohttp.ClientSession] = None
+    def __init__(self, transport: Optional[HttpTransport] = None) -> None:
+        # One pooled transport shared by every provider and the trading engine
+        self.transport = transport or HttpTransport()
+        if settings.record_path and self.transport.recorder is None:
+            from src.api.recording import ResponseRecorder
+            self.transport.recorder = ResponseRecorder(settings.record_path)
         self.tokens: Dict[str, TokenData] = {}
+        # Score ranking kept in step with self.tokens for cheap top-K queries
+        self.ranking = RankedIndex()
+        # Token updates are pushed to subscribers such as the TradingEngine
+        self.events = EventBus()
+        # Streaming discovery source, created on start when STREAM_DISCOVERY is on
+        self.listener = None
+        # Solana RPC pool, shared by the TradingEngine; resolves streamed pool mints
+        self.rpc: Optional[RpcPool] = None
+        # Read-only view of the top of the scanner, swapped once per tick
+        self.snapshot = Snapshot()
+        # Durable state (opened on start when JOURNAL_PATH is set), shared with the engine
+        self.journal = None
+        # Loop lag and the metrics idle check run wherever the bot runs
+        self.lag_monitor = LoopLagMonitor(metrics)
+        self.metrics_server = None
+        if settings.metrics_port:
+            self.metrics_server = MetricsServer(metrics, port=settings.metrics_port)
+
+        # Optional columnar store; only tokens touched since the last tick are re-synced
+        self.table = None
+        # Tokens with unpublished changes -> monotonic time the data arrived
+        self._dirty: Dict[str, float] = {}
+
+        # Bounded universe: LRU order of last update, pinned tokens are never evicted
+        self.max_tokens = settings.max_tokens
+        self.max_universe_mb = settings.max_universe_mb
+        self.token_ttl = settings.token_ttl
+        self.pinned: Set[str] = set()
+        self._touched: "OrderedDict[str, float]" = OrderedDict()
+        self.evicted = 0
+        if settings.columnar_scoring:
+            try:
+                from src.bot.table import TokenTable
+                self.table = TokenTable()
+            except ImportError as e:
+                logger.warning(f"Columnar scoring disabled: {e}")
         self.running = False
         self.helius_key = os.getenv("HELIUS_KEY", "demo")
         self.moralis_key = os.getenv("MORALIS_KEY")
-        self.helius = HeliusAPI(self.helius_key)
-        self.dex = DexScreenerAPI()
-        
+        # Holder counts move slowly: memory LRU over an optional on-disk store
+        self.cache = TieredCache(settings.cache_path)
+        self.helius = HeliusAPI(self.helius_key, transport=self.transport, cache=self.cache)
+        # Discovery gets what is left of the DEX Screener quota after the
+        # share reserved for the position monitor
+        self.dex = DexScreenerAPI(
+            transport=self.transport,
+            limiter=TokenBucket(max(0.1, settings.dexscreener_rps - settings.position_rps)),
+            batch_window=settings.dex_batch_window,
+        )
+        self.moralis = (
+            MoralisAPI(self.moralis_key, transport=self.transport)
+            if self.moralis_key else None
+        )
+        self.jupiter = JupiterPriceAPI(transport=self.transport)
+        # Fallback quota left after the share reserved for the position monitor
+        self.jupiter_budget = TokenBucket(
+            max(0.1, settings.jupiter_price_rps - settings.position_jupiter_rps)
+        )
+        # One circuit breaker per provider, shared by every lane that calls it
+        self.health = ProviderHealth(
+            settings.breaker_failures, settings.breaker_reset, settings.breaker_max_reset
+        )
+        self.stream_prices = StreamPrices(settings.stream_price_age)
+
+        # Enrichment runs continuously over the whole universe within quotas
+        self.scheduler = EnrichmentScheduler(lambda: self.tokens)
+        self.scheduler.register(
+            "dexscreener",
+            self._enrich_dexscreener,
+            rate=settings.dex_refresh_rps,
+            concurrency=2,
+            batch_size=DexScreenerAPI.MAX_BATCH,
+        )
+        if self.moralis_key:
+            self.scheduler.register(
+                "moralis",
+                self._enrich_moralis,
+                rate=max(0.1, settings.moralis_rps - settings.position_moralis_rps),
+                concurrency=settings.moralis_concurrency,
+                batch_size=MoralisAPI.MAX_BATCH,
+            )
+        if self.helius_key and self.helius_key != "demo":
+            self.scheduler.register(
+                "helius",
+                self._enrich_helius,
+                rate=settings.helius_rps,
+                concurrency=settings.helius_concurrency,
+            )
+        self.prices = self.price_chain(self.dex)
+
+    def price_chain(
+        self,
+        dex: DexScreenerAPI,
+        moralis_budget: Optional[TokenBucket] = None,
+        jupiter_budget: Optional[TokenBucket] = None,
+    ) -> PriceChain:
+        """Price lookups in fallback order: stream, DEX Screener (through ``dex``),
+        Moralis, Jupiter.
+
+        The fallbacks only run on their budgets, by default the spare quota
+        of the enrichment lanes; a lane with its own reserved quota passes
+        its own buckets.
+        """
+        chain = PriceChain(self.health, timeout=settings.provider_timeout)
+        chain.add("stream", self.stream_prices.fetch, guarded=False)
+
+        async def dexscreener(addresses: List[str]) -> Dict[str, TokenData]:
+            best = deepest_pairs(await dex.get_pairs(addresses), set(addresses))
+            return {address: token for address, token in best.items() if token.price > 0}
+
+        chain.add("dexscreener", dexscreener)
+        if self.moralis is not None:
+            moralis = self.moralis
+
+            async def moralis_prices(addresses: List[str]) -> Dict[str, float]:
+                prices = await moralis.get_prices("mainnet", addresses)
+                return {p.token_address: p.usd_price for p in prices if p.usd_price}
+
+            chain.add(
+                "moralis",
+                moralis_prices,
+                budget=moralis_budget or self.scheduler.limiters["moralis"].bucket,
+            )
+        chain.add("jupiter", self.jupiter.get_prices, budget=jupiter_budget or self.jupiter_budget)
+        return chain
+
     async def start(self) -> None:
-        self.session = aiohttp.ClientSession()
         self.running = True
+        if settings.journal_path and self.journal is None:
+            from src.bot.journal import Journal
+
+            self.journal = Journal(settings.journal_path)
+            self.restore(self.journal.load().tokens)
+        await self.lag_monitor.start()
+        if self.metrics_server:
+            await self.metrics_server.start()
+        await self.scheduler.start()
+        if settings.stream_discovery and settings.ws_url and self.listener is None:
+            from src.bot.discovery import PoolListener, RpcMintResolver
+
+            rpc = self.rpc or RpcPool(settings.rpc_urls, self.transport)
+            self.listener = PoolListener(
+                settings.ws_url,
+                self.add_token,
+                resolver=RpcMintResolver(rpc),
+            )
+        if self.listener:
+            await self.listener.start()
         asyncio.create_task(self._fetch_loop())
         logger.info("Feed aggregator started")
         
     async def stop(self) -> None:
         self.running = False
-        if self.session:
-            await self.session.close()
-        await self.helius.close()
+        if self.listener:
+            await self.listener.stop()
+        await self.scheduler.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        await self.lag_monitor.stop()
+        await self.transport.close()
+        if self.transport.recorder is not None:
+            self.transport.recorder.close()
+        await self.cache.close()
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.close)
+            self.journal = None
         logger.info("Feed aggregator stopped")
         
     async def _fetch_loop(self) -> None:
+        # Provider failures are handled per provider by the circuit breakers,
+        # so a failed tick never delays the next one
         while self.running:
+            started = time.perf_counter()
             try:
                 await self._fetch_feeds()
-                await asyncio.sleep(5)  # Update every 5 seconds
             except Exception as e:
                 logger.error(f"Error in fetch loop: {e}")
-                await asyncio.sleep(10)
+            else:
+                if metrics.enabled:
+                    metrics.feed_tick.observe(time.perf_counter() - started)
+            await asyncio.sleep(5)  # Update every 5 seconds
                 
     async def _fetch_feeds(self) -> None:
         """Fetch data from all sources."""
-        tasks = []
-        
-        # Fetch new tokens from DEX Screener
-        tasks.append(self._fetch_dex_screener())
-        
-        # Update existing tokens with Moralis data
-        if self.moralis_key:
-            for address in list(self.tokens.keys())[:5]:  # Rate limit: 5 at a time
-                tasks.append(self._update_token_moralis(address))
-                tasks.append(self._update_token_helius(address))
-                
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Discover new tokens here; price refreshes and Moralis/Helius enrichment
+        # run in the background scheduler, most overdue tokens first, within quota.
+        discovered = await self._fetch_dex_screener()
+        self._touch(discovered)
+
+        # Publish everything that changed since the last tick, once scored
+        changed = dict(self._dirty)
+        self._score_tokens()
+        self._evict()
+
+        self.publish_snapshot()
+        if self.journal is not None:
+            self.journal.save_tokens(self.tokens[a] for a in changed if a in self.tokens)
+        await self._emit(changed, "dexscreener")
+
+    async def _publish_changes(self, addresses: Iterable[str], source: str) -> None:
+        """Score and publish ``addresses`` now rather than at the next tick.
+
+        Used by the enrichment lanes as each batch is applied. Updates are
+        stamped with the time the data arrived, so the feed->decision
+        latency includes any wait before publishing.
+        """
+        now = datetime.utcnow()
+        changed: Dict[str, float] = {}
+        for address in addresses:
+            arrived = self._dirty.pop(address, None)
+            token = self.tokens.get(address)
+            if arrived is None or token is None:
+                continue
+            changed[address] = arrived
+            token.calculate_score(now)
+            token.analyze_opportunity()
+            if is_pump(token):
+                token.score += 10
+            if self.table is not None:
+                self.table.upsert(token)
+            self.ranking.update(address, token.score)
+        if not changed:
+            return
+        self.publish_snapshot()
+        if self.journal is not None:
+            self.journal.save_tokens(self.tokens[a] for a in changed)
+        await self._emit(changed, source)
+
+    async def _emit(self, changed: Dict[str, float], source: str) -> None:
+        for address, arrived in changed.items():
+            if address in self.tokens:
+                await self.events.publish(TokenUpdate(address, source, arrived))
+
+    def publish_snapshot(self) -> Snapshot:
+        """Swap in a frozen view of the top tokens (same version if unchanged)."""
+        tokens = [token_view(t) for t in self.get_top_tokens(settings.snapshot_top)]
+        self.snapshot = self.snapshot.next({"tokens": tokens})
+        return self.snapshot
+
+    def _score_tokens(self) -> None:
+        """Score, tag and pump-check every token with a single clock read."""
+        now = datetime.utcnow()
+        dirty, self._dirty = self._dirty, {}
+        if self.table is not None:
+            for address in dirty:
+                token = self.tokens.get(address)
+                if token is not None:
+                    self.table.upsert(token)
+            changed = {token.address: token for token in self.table.score(now)}
+            for address in dirty:
+                if address in self.tokens:
+                    changed[address] = self.tokens[address]
+            for address, token in changed.items():
+                self.ranking.update(address, token.score)
+            return
 
         # Calculate scores for all tokens
         for token in self.tokens.values():
-            token.calculate_score()
+            token.calculate_score(now)
             token.analyze_opportunity()
 
         # Extra pump detection
         self._detect_pump_opportunities()
+
+        for address, token in self.tokens.items():
+            self.ranking.update(address, token.score)
             
-    async def _fetch_dex_screener(self) -> None:
-        """Fetch new tokens from DEX Screener."""
+    async def _fetch_dex_screener(self) -> Set[str]:
+        """Fetch new tokens from DEX Screener. Returns the updated addresses."""
+        updated: Set[str] = set()
         try:
-            pairs = await self.dex.search_tokens("solana")
+            pairs = await self.health.call(
+                "dexscreener", self.dex.search_pairs, "solana", timeout=settings.provider_timeout
+            )
             if not pairs:
                 logger.debug("No pairs found in DEX Screener response")
-                return
+                return updated
 
             # Procesăm primele 20 perechi
             for pair in pairs[:20]:
-                # Verificăm că e pe Solana
-                if pair.get("chainId") != "solana":
-                    continue
-
-                base_token = pair.get("baseToken", {})
-                if not base_token or not base_token.get("address"):
-                    continue
-
-                volume_m5 = 0
-                volume_h24 = 0
-                liquidity_usd = 0
-                price_change_m5 = 0
-
-                volume = pair.get("volume", {})
-                if isinstance(volume, dict):
-                    volume_m5 = float(volume.get("m5", 0) or 0)
-                    volume_h24 = float(volume.get("h24", 0) or 0)
-
-                liquidity = pair.get("liquidity", {})
-                if isinstance(liquidity, dict):
-                    liquidity_usd = float(liquidity.get("usd", 0) or 0)
-
-                price_change = pair.get("priceChange", {})
-                if isinstance(price_change, dict):
-                    price_change_m5 = float(price_change.get("m5", 0) or 0)
-
-                token = TokenData(
-                    address=base_token.get("address", ""),
-                    symbol=base_token.get("symbol", ""),
-                    name=base_token.get("name", ""),
-                    price=float(pair.get("priceUsd", 0) or 0),
-                    price_change_5m=price_change_m5,
-                    volume_5m=volume_m5,
-                    volume_24h=volume_h24,
-                    liquidity=liquidity_usd,
-                    created_at=datetime.fromtimestamp(pair.get("pairCreatedAt", 0) / 1000) if pair.get("pairCreatedAt") else None,
-                )
-
-                if token.address and (token.volume_5m > 0 or token.liquidity > 0):
-                    token.base_price = token.price
-                    token.analyze_opportunity()
-                    self.tokens[token.address] = token
-                    logger.debug(f"Added token {token.symbol} from DEX Screener")
+                token = parse_pair(pair)
+                if token and (token.volume_5m > 0 or token.liquidity > 0):
+                    current = self.tokens.get(token.address)
+                    if current is not None:
+                        # Keep the tracked object: positions hold a reference to it
+                        self._merge(current, token)
+                        current.analyze_opportunity()
+                    else:
+                        token.base_price = token.price
+                        token.observe(token.price)
+                        token.analyze_opportunity()
+                        self.tokens[token.address] = token
+                        logger.debug(f"Added token {token.symbol} from DEX Screener")
+                    updated.add(token.address)
 
+        except CircuitOpen:
+            logger.debug("DEX Screener unhealthy, skipping discovery this tick")
         except asyncio.TimeoutError:
             logger.error("DEX Screener timeout")
         except Exception as e:
             logger.error(f"DEX Screener error: {e}")
+        return updated
 
-    async def _update_token_moralis(self, address: str) -> None:
-        """Update token with Moralis data."""
-        if not self.moralis_key:
-            return
-            
-        try:
-            data = await fetch_moralis(address, self.moralis_key)
-            if address in self.tokens and "usdPrice" in data:
-                self.tokens[address].price = float(data["usdPrice"])
-                self.tokens[address].last_updated = datetime.utcnow()
-                self.tokens[address].analyze_opportunity()
-        except Exception as e:
-            logger.debug(f"Moralis update error for {address}: {e}")
+    async def add_token(self, token: TokenData, source: str = "stream") -> None:
+        """Add a token discovered outside the polling loop and publish it."""
+        if token.address in self.tokens:
+            return
+        token.base_price = token.price
+        if token.price:
+            token.observe(token.price)
+            self.stream_prices.push(token.address, token.price)
+        token.calculate_score()
+        token.analyze_opportunity()
+        self.tokens[token.address] = token
+        self.ranking.update(token.address, token.score)
+        self._touch([token.address])
+        logger.info(f"New token {token.symbol or token.address[:8]} from {source}")
+        await self.events.publish_many([token.address], source)
+
+    def push_price(self, address: str, price: float) -> None:
+        """Apply a streamed price; the provider lookups skip it while it is fresh."""
+        self.stream_prices.push(address, price)
+        token = self.tokens.get(address)
+        if token is not None and price > 0:
+            self._touch([address], changed=apply_price(token, price))
+
+    async def _refresh_prices(self, addresses: List[str]) -> Set[str]:
+        """Refresh ``addresses`` through the price chain, DEX Screener batches first.
+
+        Returns the addresses whose market data actually changed. Raises the
+        last provider error if no source could price anything.
+        """
+        if not addresses:
+            return set()
+        lookup = await self.prices.fetch(addresses)
+        if not lookup.found and lookup.errors:
+            raise list(lookup.errors.values())[-1]
+
+        priced, changed = set(), set()
+        for _, address, value in lookup.items():
+            token = self.tokens.get(address)
+            if token is None:
+                continue
+            priced.add(address)
+            if apply_price(token, value):
+                changed.add(address)
+        self._touch(priced - changed, changed=False)
+        self._touch(changed)
+        sources = {name: len(values) for name, values in lookup.found.items()}
+        logger.debug(
+            f"Batch refreshed {len(priced)}/{len(addresses)} tokens {sources}, {len(changed)} changed"
+        )
+        return changed
+
+    async def _enrich_dexscreener(self, addresses: List[str]) -> None:
+        await self._publish_changes(await self._refresh_prices(addresses), "dexscreener")
+
+    @staticmethod
+    def _merge(token: TokenData, fresh: TokenData) -> bool:
+        """Copy market fields from a freshly parsed pair into a tracked token.
+
+        Returns True if price, volume or liquidity changed.
+        """
+        changed = (
+            token.price != fresh.price
+            or token.volume_5m != fresh.volume_5m
+            or token.volume_24h != fresh.volume_24h
+            or token.liquidity != fresh.liquidity
+            or token.price_change_5m != fresh.price_change_5m
+        )
+        # Traded volume since the last observation, from the rolling 24h total
+        volume = fresh.volume_24h - token.volume_24h if token.volume_24h else 0.0
+        token.observe(fresh.price, max(0.0, volume))
+        token.price_change_5m = fresh.price_change_5m
+        token.volume_5m = fresh.volume_5m
+        token.volume_24h = fresh.volume_24h
+        token.liquidity = fresh.liquidity
+        token.last_updated = fresh.last_updated
+        return changed
+
+    def _touch(self, addresses, changed: bool = True) -> None:
+        """Move tokens to the LRU tail; ``changed`` ones are re-scored and published."""
+        now = time.monotonic()
+        for address in addresses:
+            if changed:
+                self._dirty.setdefault(address, now)
+            self._touched[address] = now
+            self._touched.move_to_end(address)
+
+    def pin(self, address: str) -> None:
+        """Protect a token from eviction (e.g. while a position is open)."""
+        self.pinned.add(address)
+
+    def unpin(self, address: str) -> None:
+        self.pinned.discard(address)
+
+    def restore(self, tokens: Dict[str, TokenData]) -> None:
+        """Seed the universe from a journal; tokens are re-scored on the next tick."""
+        for address, token in tokens.items():
+            if address in self.tokens:
+                continue
+            self.tokens[address] = token
+            self.ranking.update(address, token.score)
+        self._touch(tokens)
+        self.publish_snapshot()
+        if tokens:
+            logger.info(f"Restored {len(tokens)} tokens from the journal")
+
+    def _remove_token(self, address: str) -> None:
+        if self.journal is not None and address in self.tokens:
+            self.journal.remove_tokens([address])
+        self.tokens.pop(address, None)
+        self.stream_prices.forget(address)
+        self.ranking.remove(address)
+        self.scheduler.forget(address)
+        self._touched.pop(address, None)
+        self._dirty.pop(address, None)
+        if self.table is not None:
+            self.table.remove(address)
+        self.evicted += 1
+
+    def _token_cap(self) -> int:
+        cap = self.max_tokens
+        if self.max_universe_mb > 0 and self.tokens:
+            per_token = self.memory_report()["bytes_per_token"]
+            if per_token > 0:
+                cap = min(cap, int(self.max_universe_mb * 1_000_000 / per_token))
+        return cap
+
+    def _evict(self) -> None:
+        """Drop expired tokens, then the lowest scores while over the cap."""
+        expired_before = time.monotonic() - self.token_ttl
+        for address, touched in list(self._touched.items()):
+            if touched >= expired_before:
+                break  # LRU order: everything after is fresher
+            if address not in self.pinned:
+                self._remove_token(address)
+
+        excess = len(self.tokens) - self._token_cap()
+        if excess > 0:
+            for address in self.ranking.lowest(excess, lambda a: a not in self.pinned):
+                self._remove_token(address)
+
+    def memory_report(self, sample: int = 200) -> dict:
+        """Estimate memory used per tracked token (record plus index entries)."""
+        count = len(self.tokens)
+        if not count:
+            return {"tokens": 0, "bytes_per_token": 0, "total_bytes": 0}
+        tokens = list(self.tokens.values())[:sample]
+        record = sum(_record_size(token) for token in tokens) / len(tokens)
+        # Per-token share of the containers that index the universe
+        index = (
+            sys.getsizeof(self.tokens)
+            + sys.getsizeof(self._touched)
+            + sys.getsizeof(self.ranking._scores)
+        ) / count
+        per_token = record + index
+        return {
+            "tokens": count,
+            "bytes_per_token": round(per_token),
+            "record_bytes": round(record),
+            "index_bytes": round(index),
+            "total_bytes": round(per_token * count),
+        }
+
+    async def _enrich_moralis(self, addresses: List[str]) -> None:
+        """Update a batch of tokens with Moralis multi-price data."""
+        if not self.moralis:
+            return
+        prices = await self.moralis.get_prices("mainnet", addresses)
+        now = datetime.utcnow()
+        updated = []
+        for item in prices:
+            token = self.tokens.get(item.token_address)
+            if token is None or item.usd_price is None:
+                continue
+            token.observe(item.usd_price)
+            token.last_updated = now
+            token.analyze_opportunity()
+            updated.append(token.address)
+        self._touch(updated)
+        await self._publish_changes(updated, "moralis")
 
-    async def _update_token_helius(self, address: str) -> None:
-        """Update token with Helius holder data."""
-        try:
-            data = await self.helius.get_token_holders(address)
-            if address in self.tokens and isinstance(data, dict):
-                holders = data.get("total", 0)
-                if holders:
-                    self.tokens[address].holders = int(holders)
-        except Exception as e:
-            logger.debug(f"Helius update error for {address}: {e}")
+    async def _update_token_helius(self, address: str) -> bool:
+        """Update token with Helius holder data; True if the count changed.
+
+        Errors propagate so the scheduler counts them and retries the token.
+        """
+        data = await self.helius.get_holders(address)
+        token = self.tokens.get(address)
+        if token is None or not data.total or token.holders == data.total:
+            return False
+        token.holders = data.total
+        self._touch([address])
+        return True
+
+    async def _enrich_helius(self, addresses: List[str]) -> None:
+        changed = await asyncio.gather(*(self._update_token_helius(a) for a in addresses))
+        await self._publish_changes([a for a, c in zip(addresses, changed) if c], "helius")
 
     def _detect_pump_opportunities(self) -> None:
         """Add bonus score for tokens that look like pumps."""
         for token in self.tokens.values():
-            if (
-                token.volume_5m > 50000
-                and token.liquidity > 10000
-                and token.price_change_5m > 5
-            ):
+            if is_pump(token):
                 token.score += 10
             
-    def get_top_tokens(self, limit: int = 10) -> list[TokenData]:
-        """Get top tokens by score."""
-        sorted_tokens = sorted(
-            self.tokens.values(), 
-            key=lambda x: x.score, 
-            reverse=True
-        )
-        return sorted_tokens[:limit]
+    def get_stats(self) -> dict:
+        """Get feed statistics."""
+        return {
+            "tokens": len(self.tokens),
+            "evicted": self.evicted,
+            "enrichment": self.scheduler.stats(),
+            "memory": self.memory_report(),
+            "journal": self.journal.stats() if self.journal is not None else None,
+            "cache": self.cache.stats(),
+            "providers": self.health.stats(),
+            "prices": self.prices.stats(),
+            "coalescing": {
+                "flights": self.transport.flights.stats(),
+                "dex_batches": self.dex.batcher.stats() if self.dex.batcher else None,
+            },
+        }
+
+    def get_top_tokens(
+        self,
+        limit: int = 10,
+        min_liquidity: Optional[float] = None,
+        min_score: Optional[float] = None,
+        where: Optional[Callable[[TokenData], bool]] = None,
+    ) -> list[TokenData]:
+        """Get top tokens by score, optionally filtered.
+
+        Served from the ranked index, so only the head of the ranking is
+        visited instead of sorting the whole universe.
+        """
+        tokens = self.tokens
+
+        def accept(address: str) -> bool:
+            token = tokens.get(address)
+            if token is None:
+                return False
+            if min_liquidity is not None and token.liquidity <= min_liquidity:
+                return False
+            return where is None or where(token)
+
+        addresses = self.ranking.top(limit, accept, min_score)
+        return [tokens[address] for address in addresses]
+
+def _record_size(token: TokenData) -> int:
+    """Shallow size of a TokenData plus the objects its fields own."""
+    size = sys.getsizeof(token)
+    for f in fields(token):
+        value = getattr(token, f.name)
+        if isinstance(value, (str, datetime)):
+            size += sys.getsizeof(value)
+        elif isinstance(value, PriceHistory):
+            size += sys.getsizeof(value) + value.nbytes()
+    return size
+
+def parse_pair(pair: Pair) -> Optional[TokenData]:
+    """Build a TokenData from a decoded DEX Screener pair, or None if unusable."""
+    # Verificăm că e pe Solana
+    if pair.chain_id != "solana":
+        return None
+
+    base_token = pair.base_token
+    if base_token is None or not base_token.address:
+        return None
+
+    volume, change = pair.volume, pair.price_change
+    return TokenData(
+        address=base_token.address,
+        symbol=base_token.symbol,
+        name=base_token.name,
+        price=pair.price_usd or 0.0,
+        price_change_5m=(change.m5 or 0.0) if change else 0.0,
+        volume_5m=(volume.m5 or 0.0) if volume else 0.0,
+        volume_24h=(volume.h24 or 0.0) if volume else 0.0,
+        liquidity=pair.liquidity_usd,
+        created_at=datetime.fromtimestamp(pair.pair_created_at / 1000) if pair.pair_created_at else None,
+    )
+
+def is_pump(token: TokenData) -> bool:
+    """Heavy 5m volume on a liquid pool that is moving up; worth a score bonus."""
+    return token.volume_5m > 50000 and token.liquidity > 10000 and token.momentum_5m > 5
+
+
+def apply_price(token: TokenData, fresh: Any) -> bool:
+    """Merge a price-chain result (a parsed pair or a bare USD price) into ``token``.
+
+    Returns True if the market data changed.
+    """
+    if isinstance(fresh, TokenData):
+        return FeedAggregator._merge(token, fresh)
+    changed = token.price != fresh
+    token.observe(fresh)
+    token.last_updated = datetime.utcnow()
+    return changed
+
+
+def deepest_pairs(pairs: List[Pair], wanted) -> Dict[str, TokenData]:
+    """Keep the deepest pool for every address in ``wanted`` and parse only those."""
+    best: Dict[str, Pair] = {}
+    for pair in pairs:
+        base = pair.base_token
+        if base is None or base.address not in wanted or pair.chain_id != "solana":
+            continue
+        current = best.get(base.address)
+        if current is None or pair.liquidity_usd > current.liquidity_usd:
+            best[base.address] = pair
+    parsed = {address: parse_pair(pair) for address, pair in best.items()}
+    return {address: token for address, token in parsed.items() if token is not None}
 
-async def fetch_moralis(address: str, api_key: str) -> dict:
+async def fetch_moralis(
+    address: str, api_key: str, transport: Optional[HttpTransport] = None
+) -> dict:
     """Fetch token price info from Moralis."""
     url = f"https://deep-index.moralis.io/api/v2/erc20/{address}/price?chain=solana"
     headers = {"X-API-Key": api_key}
     
-    async with httpx.AsyncClient(timeout=5) as client:
-        resp = await client.get(url, headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    transport = transport or default_transport()
+    resp = await transport.get(url, headers=headers, timeout=5)
+    resp.raise_for_status()
+    return resp.json()
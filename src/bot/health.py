@@ -0,0 +1,191 @@
+"""Provider health tracking and circuit breakers.
+
+Every provider gets a ``CircuitBreaker``. After ``failure_threshold``
+consecutive failures (exceptions, HTTP errors or calls slower than the
+timeout) the breaker opens and calls to that provider are skipped at once
+instead of waiting on it. Once the open period elapses a single probe is
+let through; if it fails the breaker re-opens for twice as long, up to
+``max_reset_timeout``, and a success closes it again.
+
+A 429 opens the breaker straight away for the provider's ``Retry-After``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.bot.scheduler import is_rate_limited
+
+logger = logging.getLogger("bot.health")
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with exponential open periods."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self._state = CLOSED
+        self.open_for = reset_timeout
+        self.opened_at = 0.0
+        self._probing = False
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self.latency = 0.0  # EWMA of successful calls, seconds
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.clock() >= self.opened_at + self.open_for:
+            self._state = HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """True if a call may go out now; a half-open breaker admits one probe."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency: float = 0.0) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.latency = latency if not self.latency else 0.8 * self.latency + 0.2 * latency
+        if self._state != CLOSED:
+            logger.info(f"{self.name} recovered, circuit closed")
+        self._state = CLOSED
+        self._probing = False
+        self.open_for = self.reset_timeout
+
+    def record_failure(self, error: BaseException) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        if is_rate_limited(error):
+            retry_after = error.response.headers.get("retry-after", "")
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                wait = self.open_for
+            self._open(min(max(wait, self.reset_timeout), self.max_reset_timeout))
+        elif self._state == HALF_OPEN:
+            # The probe failed: back off further
+            self._open(min(self.open_for * 2, self.max_reset_timeout))
+        elif self.consecutive_failures >= self.failure_threshold:
+            self._open(self.open_for)
+
+    def release(self) -> None:
+        """Give back a probe slot whose call neither succeeded nor failed."""
+        self._probing = False
+
+    def _open(self, seconds: float) -> None:
+        if self._state == CLOSED:
+            self.opened += 1
+            logger.warning(f"{self.name} unhealthy ({self.last_error}), skipping it for {seconds:.1f}s")
+        else:
+            logger.debug(f"{self.name} still unhealthy, next probe in {seconds:.1f}s")
+        self._state = OPEN
+        self._probing = False
+        self.open_for = seconds
+        self.opened_at = self.clock()
+
+    async def call(
+        self, fn: Callable[..., Awaitable[T]], *args: Any, timeout: Optional[float] = None
+    ) -> T:
+        """Run ``fn(*args)`` through the breaker; a timeout counts as a failure."""
+        if not self.allow():
+            raise CircuitOpen(self.name)
+        started = time.monotonic()
+        try:
+            if timeout:
+                result = await asyncio.wait_for(fn(*args), timeout)
+            else:
+                result = await fn(*args)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def stats(self) -> dict:
+        state = self.state
+        retry_in = self.opened_at + self.open_for - self.clock() if state == OPEN else 0.0
+        return {
+            "state": state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+            "latency_ms": round(self.latency * 1000, 1),
+            "retry_in": round(max(0.0, retry_in), 1),
+            "last_error": self.last_error,
+        }
+
+
+class ProviderHealth:
+    """One breaker per provider name, created on first use."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(
+                name,
+                self.failure_threshold,
+                self.reset_timeout,
+                self.max_reset_timeout,
+                clock=self.clock,
+            )
+        return breaker
+
+    async def call(
+        self, name: str, fn: Callable[..., Awaitable[T]], *args: Any, timeout: Optional[float] = None
+    ) -> T:
+        return await self.breaker(name).call(fn, *args, timeout=timeout)
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
@@ -0,0 +1,212 @@
+"""Per-token ring buffer of price observations with rolling statistics."""
+
+import math
+import time
+from array import array
+from typing import Dict, Optional, Tuple
+
+WINDOWS: Tuple[float, ...] = (10.0, 30.0, 60.0, 300.0)
+
+
+class _Window:
+    """Running sums over the samples younger than ``span`` seconds."""
+
+    __slots__ = ("span", "start", "n", "sum_p", "sum_pv", "sum_v", "n_r", "sum_r", "sum_r2")
+
+    def __init__(self, span: float) -> None:
+        self.span = span
+        self.start = 0  # sequence number of the oldest sample in the window
+        self.n = 0
+        self.sum_p = 0.0
+        self.sum_pv = 0.0
+        self.sum_v = 0.0
+        self.n_r = 0
+        self.sum_r = 0.0
+        self.sum_r2 = 0.0
+
+
+class PriceHistory:
+    """Array-backed ring buffer of (time, price, volume) observations.
+
+    Every window keeps running sums that are updated when a sample enters
+    or leaves it, so returns, VWAP and volatility are O(1) per query and
+    amortised O(1) per observation. Arrays grow up to ``capacity`` and then
+    wrap around.
+
+    With a ``resolution``, observations less than that many seconds after
+    the newest sample opened are merged into it (latest price, summed
+    volume) instead of taking a slot, so the buffer spans at least
+    ``capacity * resolution`` seconds however fast ticks arrive.
+    """
+
+    __slots__ = (
+        "capacity", "resolution", "seq", "opened_at", "times", "prices", "volumes",
+        "log_returns", "windows",
+    )
+
+    def __init__(
+        self, capacity: int = 64, windows: Tuple[float, ...] = WINDOWS, resolution: float = 0.0
+    ) -> None:
+        self.capacity = capacity
+        self.resolution = resolution
+        self.seq = 0  # number of samples ever recorded
+        self.opened_at = 0.0  # first observation merged into the newest sample
+        self.times = array("d")
+        self.prices = array("d")
+        self.volumes = array("d")
+        self.log_returns = array("d")  # return from the previous sample
+        self.windows: Dict[float, _Window] = {span: _Window(span) for span in windows}
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def _idx(self, seq: int) -> int:
+        return seq % self.capacity
+
+    def record(self, price: float, volume: float = 0.0, ts: Optional[float] = None) -> None:
+        """Add an observation. Non-positive prices are ignored."""
+        if price <= 0:
+            return
+        ts = time.time() if ts is None else ts
+        seq = self.seq
+        ret = math.nan
+        if seq:
+            ts = max(ts, self.times[self._idx(seq - 1)])
+            if ts - self.opened_at < self.resolution:
+                self._merge(price, volume, ts)
+                return
+            prev = self.prices[self._idx(seq - 1)]
+            ret = math.log(price / prev)
+        self.opened_at = ts
+
+        # Samples about to be overwritten must leave every window first
+        if seq >= self.capacity:
+            for window in self.windows.values():
+                while window.start <= seq - self.capacity:
+                    self._expire(window)
+
+        if seq < self.capacity:
+            self.times.append(ts)
+            self.prices.append(price)
+            self.volumes.append(volume)
+            self.log_returns.append(ret)
+        else:
+            i = self._idx(seq)
+            self.times[i] = ts
+            self.prices[i] = price
+            self.volumes[i] = volume
+            self.log_returns[i] = ret
+        self.seq = seq + 1
+
+        for window in self.windows.values():
+            window.n += 1
+            window.sum_p += price
+            window.sum_pv += price * volume
+            window.sum_v += volume
+            if window.n > 1:
+                window.n_r += 1
+                window.sum_r += ret
+                window.sum_r2 += ret * ret
+        self._slide(ts)
+
+    def _merge(self, price: float, volume: float, ts: float) -> None:
+        """Fold an observation into the newest sample."""
+        seq = self.seq
+        i = self._idx(seq - 1)
+        old_price, old_volume, old_ret = self.prices[i], self.volumes[i], self.log_returns[i]
+        total = old_volume + volume
+        ret = math.log(price / self.prices[self._idx(seq - 2)]) if seq > 1 else math.nan
+        for window in self.windows.values():
+            window.sum_p += price - old_price
+            window.sum_pv += price * total - old_price * old_volume
+            window.sum_v += volume
+            if window.n > 1:  # the newest sample's return is inside the window
+                window.sum_r += ret - old_ret
+                window.sum_r2 += ret * ret - old_ret * old_ret
+        self.times[i] = ts
+        self.prices[i] = price
+        self.volumes[i] = total
+        self.log_returns[i] = ret
+        self._slide(ts)
+
+    def _slide(self, ts: float) -> None:
+        """Expire samples older than each window's span before ``ts``."""
+        for window in self.windows.values():
+            cutoff = ts - window.span
+            while window.n > 1 and self.times[self._idx(window.start)] < cutoff:
+                self._expire(window)
+
+    def _expire(self, window: _Window) -> None:
+        """Drop the oldest sample of ``window``."""
+        i = self._idx(window.start)
+        price = self.prices[i]
+        window.n -= 1
+        window.sum_p -= price
+        window.sum_pv -= price * self.volumes[i]
+        window.sum_v -= self.volumes[i]
+        window.start += 1
+        # The new oldest sample's return reaches outside the window
+        if window.n_r:
+            r = self.log_returns[self._idx(window.start)]
+            window.n_r -= 1
+            window.sum_r -= r
+            window.sum_r2 -= r * r
+
+    @property
+    def last_price(self) -> float:
+        return self.prices[self._idx(self.seq - 1)] if self.seq else 0.0
+
+    @property
+    def last_time(self) -> float:
+        return self.times[self._idx(self.seq - 1)] if self.seq else 0.0
+
+    def covers(self, span: float) -> bool:
+        """True if the buffer holds data at least ``span`` seconds old."""
+        if self.seq < 2:
+            return False
+        oldest = self.times[self._idx(max(0, self.seq - self.capacity))]
+        return self.last_time - oldest >= span
+
+    def return_pct(self, span: float) -> float:
+        """Percent change over ``span`` seconds.
+
+        Anchored on the last price seen before the window opened when it is
+        still buffered, otherwise on the oldest price inside the window.
+        """
+        window = self.windows[span]
+        anchor = window.start - 1
+        if anchor < 0 or anchor < self.seq - self.capacity:
+            if window.n < 2:
+                return 0.0
+            anchor = window.start
+        first = self.prices[self._idx(anchor)]
+        return (self.last_price / first - 1.0) * 100
+
+    def vwap(self, span: float) -> float:
+        """Volume weighted average price, or the plain mean without volume."""
+        window = self.windows[span]
+        if window.n == 0:
+            return 0.0
+        if window.sum_v > 0:
+            return window.sum_pv / window.sum_v
+        return window.sum_p / window.n
+
+    def volatility(self, span: float) -> float:
+        """Standard deviation of tick log returns in the window, in percent."""
+        window = self.windows[span]
+        if window.n_r < 2:
+            return 0.0
+        mean = window.sum_r / window.n_r
+        return math.sqrt(max(0.0, window.sum_r2 / window.n_r - mean * mean)) * 100
+
+    def nbytes(self) -> int:
+        return sum(a.buffer_info()[1] * a.itemsize for a in (self.times, self.prices, self.volumes, self.log_returns))
+
+    def stats(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for span in self.windows:
+            label = f"{int(span)}s"
+            out[f"return_{label}"] = self.return_pct(span)
+            out[f"vwap_{label}"] = self.vwap(span)
+            out[f"volatility_{label}"] = self.volatility(span)
+        return out
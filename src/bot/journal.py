@@ -0,0 +1,264 @@
+"""Durable journal of positions, PnL and the token universe.
+
+State lives in an embedded SQLite database in WAL mode. The event loop
+only enqueues rows; a writer thread drains the queue and commits whatever
+accumulated within ``flush_interval`` as one transaction, so a burst of
+feed updates costs one fsync-free WAL append instead of one per token.
+
+On startup ``load()`` reads everything back with a single query per table,
+which takes milliseconds even for a large universe, so held tokens are
+monitored again before the first feed tick completes.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+import msgspec
+
+if TYPE_CHECKING:
+    from src.bot.feeds import TokenData
+    from src.bot.trading import Position
+
+logger = logging.getLogger("bot.journal")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    address TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    amount_in REAL NOT NULL,
+    amount_out REAL NOT NULL,
+    entry_price REAL NOT NULL,
+    entry_time TEXT NOT NULL,
+    tx_signature TEXT,
+    wallet TEXT
+);
+CREATE TABLE IF NOT EXISTS totals (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    address TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# TokenData fields worth persisting; the tick history is rebuilt live
+TOKEN_FIELDS = (
+    "address", "symbol", "name", "price", "price_change_5m", "volume_5m", "volume_24h",
+    "market_cap", "liquidity", "holders", "created_at", "score", "last_updated",
+    "decimals", "base_price", "opportunity",
+)
+DATETIME_FIELDS = ("created_at", "last_updated")
+
+# Columns added after the first release: (table, column, type)
+MIGRATIONS = (("positions", "wallet", "TEXT"),)
+
+_encode = msgspec.json.Encoder().encode
+_decode = msgspec.json.Decoder().decode
+
+Op = Tuple[str, List[tuple]]
+
+
+def token_row(token: "TokenData") -> str:
+    return _encode({name: getattr(token, name) for name in TOKEN_FIELDS}).decode()
+
+
+def token_from_row(data: str) -> "TokenData":
+    from src.bot.feeds import TokenData
+
+    fields = _decode(data)
+    for name in DATETIME_FIELDS:
+        if fields.get(name):
+            fields[name] = datetime.fromisoformat(fields[name])
+        else:
+            fields.pop(name, None)
+    return TokenData(**{k: v for k, v in fields.items() if k in TOKEN_FIELDS})
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    """Add columns missing from a database written by an older version."""
+    for table, column, kind in MIGRATIONS:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+            logger.info(f"Journal migrated: added {table}.{column}")
+
+
+@dataclass
+class JournalState:
+    """Everything ``load()`` found on disk."""
+
+    tokens: Dict[str, "TokenData"] = field(default_factory=dict)
+    # address -> (token, amount_in, amount_out, entry_price, entry_time, tx_signature, wallet)
+    positions: Dict[str, tuple] = field(default_factory=dict)
+    totals: Dict[str, float] = field(default_factory=dict)
+
+
+class Journal:
+    """Batched, off-loop writer for bot state.
+
+    Every public write method only queues rows and returns immediately;
+    ``flush()`` blocks until everything queued so far is committed and
+    ``close()`` flushes and stops the writer thread.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.25, max_batch: int = 5000) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            migrate(conn)
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self.commits = 0
+        self.rows = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: durable across process crashes, no fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def position_opened(self, position: "Position") -> None:
+        self._put(
+            "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(
+                position.token.address,
+                token_row(position.token),
+                position.amount_in,
+                position.amount_out,
+                position.entry_price,
+                position.entry_time.isoformat(),
+                position.tx_signature,
+                position.wallet,
+            )],
+        )
+
+    def position_closed(self, address: str) -> None:
+        self._put("DELETE FROM positions WHERE address = ?", [(address,)])
+
+    def save_totals(self, **totals: float) -> None:
+        self._put("INSERT OR REPLACE INTO totals VALUES (?, ?)", list(totals.items()))
+
+    def save_tokens(self, tokens: Iterable["TokenData"]) -> None:
+        rows = [(token.address, token_row(token)) for token in tokens]
+        if rows:
+            self._put("INSERT OR REPLACE INTO tokens VALUES (?, ?)", rows)
+
+    def remove_tokens(self, addresses: Iterable[str]) -> None:
+        rows = [(address,) for address in addresses]
+        if rows:
+            self._put("DELETE FROM tokens WHERE address = ?", rows)
+
+    def _put(self, sql: str, rows: List[tuple]) -> None:
+        self._queue.put((sql, rows))
+
+    def load(self, tokens: bool = True) -> JournalState:
+        """Read back the last committed state (without the universe if not ``tokens``)."""
+        started = time.perf_counter()
+        state = JournalState()
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT address, data FROM tokens") if tokens else ()
+            for address, data in rows:
+                try:
+                    state.tokens[address] = token_from_row(data)
+                except (msgspec.DecodeError, TypeError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable journal row for {address}: {e}")
+            rows = conn.execute(
+                "SELECT address, token, amount_in, amount_out, entry_price, entry_time,"
+                " tx_signature, wallet FROM positions"
+            )
+            for address, token, amount_in, amount_out, entry_price, entry_time, tx, wallet in rows:
+                state.positions[address] = (
+                    token_from_row(token), amount_in, amount_out, entry_price,
+                    datetime.fromisoformat(entry_time), tx, wallet,
+                )
+            state.totals = dict(conn.execute("SELECT key, value FROM totals"))
+        logger.info(
+            f"Journal loaded {len(state.tokens)} tokens and {len(state.positions)} positions "
+            f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return state
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def stats(self) -> dict:
+        return {"commits": self.commits, "rows": self.rows, "errors": self.errors}
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                batch: List[Op] = []
+                waiters: List[threading.Event] = []
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                # Group everything that arrives within the interval into one commit
+                while True:
+                    if item is None:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if stopping or waiters or len(batch) >= self.max_batch:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                # Anything already queued joins this commit without waiting
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                self._commit(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Op]) -> None:
+        if not batch:
+            return
+        try:
+            with conn:
+                for sql, rows in batch:
+                    conn.executemany(sql, rows)
+            self.commits += 1
+            self.rows += sum(len(rows) for _, rows in batch)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error(f"Journal commit failed ({len(batch)} writes dropped): {e}")
@@ -0,0 +1,111 @@
+"""Fast price lane for mints with an open position."""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Set
+
+from src.api.dexscreener import DexScreenerAPI
+from src.bot.config import settings
+from src.bot.feeds import apply_price
+from src.bot.scheduler import TokenBucket
+
+if TYPE_CHECKING:
+    from src.bot.trading import TradingEngine
+
+logger = logging.getLogger("bot.monitor")
+
+
+class PositionMonitor:
+    """Polls prices for held mints at a sub-second cadence.
+
+    Uses its own ``DexScreenerAPI`` whose limiter is a quota reserved for
+    this lane, so discovery traffic cannot starve it. Lookups go through a
+    price chain of their own, so held mints are still priced by Moralis or
+    Jupiter while DEX Screener is unhealthy, on fallback quota that is also
+    reserved for this lane. Every price update is followed
+    by the engine's stop-loss / take-profit check for the mints that moved,
+    without waiting for the trade loop.
+    """
+
+    def __init__(self, engine: "TradingEngine", dex: DexScreenerAPI, interval: float = 0.5) -> None:
+        self.engine = engine
+        self.dex = dex
+        self.prices = engine.feeds.price_chain(
+            dex,
+            moralis_budget=TokenBucket(settings.position_moralis_rps),
+            jupiter_budget=TokenBucket(settings.position_jupiter_rps),
+        )
+        self.interval = interval
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self._checks: Set[asyncio.Task] = set()
+        self.polls = 0
+        self.updates = 0
+        self.errors = 0
+        self.by_source: Dict[str, int] = {}
+        self.last_update = 0.0
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Position monitor started ({self.interval:.2f}s interval)")
+
+    async def stop(self) -> None:
+        self.running = False
+        tasks = list(self._checks)
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while self.running:
+            started = time.monotonic()
+            await self.poll()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def poll(self) -> Set[str]:
+        """Refresh every held mint once and schedule exit checks for them."""
+        held = list(self.engine.positions)
+        if not held:
+            return set()
+        self.polls += 1
+        lookup = await self.prices.fetch(held)
+        if not lookup.found and lookup.errors:
+            self.errors += 1
+            logger.debug(f"Position price poll failed: {lookup.errors}")
+            return set()
+
+        updated: Set[str] = set()
+        for source, address, fresh in lookup.items():
+            position = self.engine.positions.get(address)
+            if position is None:
+                continue
+            apply_price(position.token, fresh)
+            updated.add(address)
+            self.by_source[source] = self.by_source.get(source, 0) + 1
+        if not updated:
+            return updated
+
+        self.updates += len(updated)
+        self.last_update = time.monotonic()
+        self.engine.feeds._touch(updated)
+        self.engine.publish_snapshot()  # fresh PnL for readers
+        # Exits run in their own task so a slow close never delays the next poll
+        task = asyncio.create_task(self.engine._check_exit_conditions(updated))
+        self._checks.add(task)
+        task.add_done_callback(self._checks.discard)
+        return updated
+
+    def stats(self) -> dict:
+        return {
+            "polls": self.polls,
+            "updates": self.updates,
+            "errors": self.errors,
+            "sources": dict(self.by_source),
+            "interval_ms": self.interval * 1000,
+            "price_age_ms": (time.monotonic() - self.last_update) * 1000 if self.last_update else None,
+        }
@@ -0,0 +1,136 @@
+"""Price lookups that fall back across providers in a fixed order.
+
+A ``PriceChain`` asks its sources in turn, each one only for the mints the
+previous ones could not price. Every remote source sits behind its
+provider's circuit breaker and a per-call timeout, so a provider that is
+down or slow is skipped within one timeout and then not at all until its
+breaker lets a probe through; the healthy providers keep answering.
+Fallback sources may also carry a token bucket: they only run on spare
+quota and are skipped (never awaited) when it is exhausted.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.bot.health import OPEN, CircuitOpen, ProviderHealth
+from src.bot.scheduler import TokenBucket
+
+logger = logging.getLogger("bot.prices")
+
+PriceSource = Callable[[List[str]], Awaitable[Mapping[str, Any]]]
+
+
+class StreamPrices:
+    """Latest streamed price per mint, trusted for ``max_age`` seconds."""
+
+    def __init__(self, max_age: float = 2.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_age = max_age
+        self.clock = clock
+        self.prices: Dict[str, Tuple[float, float]] = {}
+
+    def push(self, address: str, price: float) -> None:
+        if price > 0:
+            self.prices[address] = (price, self.clock())
+
+    def forget(self, address: str) -> None:
+        self.prices.pop(address, None)
+
+    async def fetch(self, addresses: Iterable[str]) -> Dict[str, float]:
+        oldest = self.clock() - self.max_age
+        fresh: Dict[str, float] = {}
+        for address in addresses:
+            entry = self.prices.get(address)
+            if entry is not None and entry[1] >= oldest:
+                fresh[address] = entry[0]
+        return fresh
+
+
+@dataclass
+class Source:
+    name: str
+    fetch: PriceSource
+    budget: Optional[TokenBucket] = None
+    guarded: bool = True  # behind the provider's breaker and the chain timeout
+    served: int = 0
+    skipped: int = 0
+    errors: int = 0
+
+
+@dataclass
+class PriceLookup:
+    """Outcome of one ``PriceChain.fetch``."""
+
+    # source name -> {address: value}, in the order the sources were asked
+    found: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+    def items(self) -> Iterable[Tuple[str, str, Any]]:
+        """(source, address, value) for every priced mint."""
+        for source, values in self.found.items():
+            for address, value in values.items():
+                yield source, address, value
+
+
+class PriceChain:
+    """Ordered price sources sharing one ``ProviderHealth``."""
+
+    def __init__(self, health: ProviderHealth, timeout: Optional[float] = None) -> None:
+        self.health = health
+        self.timeout = timeout
+        self.sources: List[Source] = []
+
+    def add(
+        self,
+        name: str,
+        fetch: PriceSource,
+        budget: Optional[TokenBucket] = None,
+        guarded: bool = True,
+    ) -> "PriceChain":
+        """Append a source; sources are asked in the order they were added."""
+        self.sources.append(Source(name, fetch, budget, guarded))
+        return self
+
+    async def fetch(self, addresses: Iterable[str]) -> PriceLookup:
+        lookup = PriceLookup()
+        remaining = list(dict.fromkeys(addresses))
+        for source in self.sources:
+            if not remaining:
+                break
+            if source.guarded and self.health.breaker(source.name).state == OPEN:
+                source.skipped += 1
+                continue
+            if source.budget is not None and not source.budget.try_acquire():
+                source.skipped += 1
+                continue
+            try:
+                if source.guarded:
+                    values = await self.health.call(
+                        source.name, source.fetch, remaining, timeout=self.timeout
+                    )
+                else:
+                    values = await source.fetch(remaining)
+            except CircuitOpen:
+                source.skipped += 1
+                continue
+            except Exception as e:
+                source.errors += 1
+                lookup.errors[source.name] = e
+                logger.debug(f"{source.name} price lookup failed, falling back: {e}")
+                continue
+            wanted = set(remaining)
+            values = {a: v for a, v in values.items() if a in wanted}
+            if values:
+                lookup.found[source.name] = values
+                source.served += len(values)
+                remaining = [a for a in remaining if a not in values]
+        lookup.missing = remaining
+        return lookup
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            source.name: {"served": source.served, "skipped": source.skipped, "errors": source.errors}
+            for source in self.sources
+        }
@@ -0,0 +1,133 @@
+"""Warm Jupiter sell quotes for open positions."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.bot.trading import TradingEngine
+
+logger = logging.getLogger("bot.quotes")
+
+QuoteKey = Tuple[str, str, int]
+
+
+def amount_bucket(amount: int, resolution: float = 0.01) -> int:
+    """Log-scale bucket: amounts within ~``resolution`` share a quote."""
+    if amount <= 0:
+        return 0
+    return int(math.log(amount) / math.log1p(resolution))
+
+
+@dataclass
+class CachedQuote:
+    quote: dict
+    amount: int
+    fetched_at: float
+
+
+class QuoteCache:
+    """Quotes keyed by (input mint, output mint, amount bucket) with a short TTL."""
+
+    def __init__(self, ttl: float = 2.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: Dict[QuoteKey, CachedQuote] = {}
+        self.hits = 0
+        self.misses = 0
+        self.served_ages: Deque[float] = deque(maxlen=500)
+
+    @staticmethod
+    def key(input_mint: str, output_mint: str, amount: int) -> QuoteKey:
+        return (input_mint, output_mint, amount_bucket(amount))
+
+    def put(self, input_mint: str, output_mint: str, amount: int, quote: dict) -> None:
+        self.entries[self.key(input_mint, output_mint, amount)] = CachedQuote(
+            quote, amount, self.clock()
+        )
+
+    def get(
+        self, input_mint: str, output_mint: str, amount: int, max_age: Optional[float] = None
+    ) -> Optional[dict]:
+        """Return a fresh quote or None. Every call counts as a hit or a miss."""
+        entry = self.entries.get(self.key(input_mint, output_mint, amount))
+        max_age = self.ttl if max_age is None else max_age
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age <= max_age:
+                self.hits += 1
+                self.served_ages.append(age)
+                return entry.quote
+        self.misses += 1
+        return None
+
+    def discard(self, input_mint: str, output_mint: Optional[str] = None) -> None:
+        for key in [k for k in self.entries if k[0] == input_mint and output_mint in (None, k[1])]:
+            del self.entries[key]
+
+    def ages(self) -> Dict[QuoteKey, float]:
+        now = self.clock()
+        return {key: now - entry.fetched_at for key, entry in self.entries.items()}
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        ages = list(self.served_ages)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "avg_served_age_ms": (sum(ages) / len(ages) * 1000) if ages else 0.0,
+            "max_cached_age_ms": max(self.ages().values(), default=0.0) * 1000,
+            "entries": len(self.entries),
+        }
+
+
+class ExitQuotePrefetcher:
+    """Background task keeping a sell quote warm for every open position."""
+
+    def __init__(self, engine: "TradingEngine", cache: QuoteCache, interval: float = 1.0) -> None:
+        self.engine = engine
+        self.cache = cache
+        self.interval = interval
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+        self.errors = 0
+
+    async def start(self) -> None:
+        self.running = True
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        self.running = False
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while self.running:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> None:
+        """Fetch a sell quote for every open position concurrently."""
+        positions = list(self.engine.positions.items())
+        await asyncio.gather(*(self._refresh_one(a, p) for a, p in positions))
+
+    async def _refresh_one(self, address: str, position) -> None:
+        from src.bot.trading import jup_quote
+
+        engine = self.engine
+        amount = engine.exit_amount(position)
+        try:
+            quote = await jup_quote(address, engine.USDC_MINT, amount, engine.transport)
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Exit quote prefetch failed for {address}: {e}")
+            return
+        if quote and address in engine.positions:
+            self.cache.put(address, engine.USDC_MINT, amount, quote)
@@ -0,0 +1,72 @@
+"""Incrementally maintained score ranking for the token universe."""
+
+from typing import Callable, Dict, List, Optional
+
+from sortedcontainers import SortedList
+
+
+class RankedIndex:
+    """Addresses ordered by descending score.
+
+    ``update`` and ``remove`` are O(log n). ``top`` walks the ranking from
+    the best score and stops as soon as ``k`` addresses passed the filter,
+    or the scores fall below ``min_score``.
+    """
+
+    def __init__(self) -> None:
+        self._ranking = SortedList()
+        self._scores: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._scores
+
+    def score(self, address: str) -> Optional[float]:
+        return self._scores.get(address)
+
+    def update(self, address: str, score: float) -> None:
+        old = self._scores.get(address)
+        if old == score:
+            return
+        if old is not None:
+            self._ranking.remove((-old, address))
+        self._ranking.add((-score, address))
+        self._scores[address] = score
+
+    def remove(self, address: str) -> None:
+        old = self._scores.pop(address, None)
+        if old is not None:
+            self._ranking.remove((-old, address))
+
+    def top(
+        self,
+        k: int,
+        where: Optional[Callable[[str], bool]] = None,
+        min_score: Optional[float] = None,
+    ) -> List[str]:
+        """Return up to ``k`` addresses with the highest scores."""
+        result: List[str] = []
+        if k <= 0:
+            return result
+        for neg_score, address in self._ranking:
+            if min_score is not None and -neg_score < min_score:
+                break
+            if where is None or where(address):
+                result.append(address)
+                if len(result) >= k:
+                    break
+        return result
+
+    def lowest(self, k: int, where: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """Return up to ``k`` addresses with the lowest scores."""
+        result: List[str] = []
+        if k <= 0:
+            return result
+        for _, address in reversed(self._ranking):
+            if where is None or where(address):
+                result.append(address)
+                if len(result) >= k:
+                    break
+        return result
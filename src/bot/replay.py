@@ -0,0 +1,218 @@
+"""Offline backtesting: replay recorded provider responses on a virtual clock.
+
+The ``FeedAggregator`` and ``TradingEngine`` run unmodified; only their
+transport is swapped for a ``ReplayTransport`` and the ``time`` and
+``datetime`` names of the bot modules are pointed at a ``VirtualClock``
+while the replay runs, so scores, ages and latencies follow recorded time.
+
+Usage::
+
+    python -m src.bot.replay capture.jsonl.gz --tick 5 --speed 0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime as _dt
+import importlib
+import json
+import logging
+import time as _time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from solders.keypair import Keypair
+
+from src.api.recording import ReplayTransport, read_log
+from src.bot.config import settings
+
+logger = logging.getLogger("bot.replay")
+
+# Modules whose ``time`` / ``datetime`` globals follow the virtual clock
+PATCHED_MODULES = (
+    "src.bot.feeds",
+    "src.bot.history",
+    "src.bot.trading",
+    "src.bot.monitor",
+)
+
+
+class VirtualClock:
+    """Settable clock exposing the parts of ``time`` the bot uses."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    perf_counter = monotonic
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_time, name)
+
+    def datetime_class(self) -> type:
+        clock = self
+
+        class VirtualDatetime(_dt.datetime):
+            @classmethod
+            def utcnow(cls) -> "VirtualDatetime":
+                return cls.utcfromtimestamp(clock.now)
+
+            @classmethod
+            def now(cls, tz=None) -> "VirtualDatetime":
+                return cls.fromtimestamp(clock.now, tz)
+
+        return VirtualDatetime
+
+    @contextlib.contextmanager
+    def patch(self) -> Iterator["VirtualClock"]:
+        """Point the bot modules at this clock for the duration of the block."""
+        virtual_datetime = self.datetime_class()
+        saved = []
+        for name in PATCHED_MODULES:
+            module = importlib.import_module(name)
+            for attr, value in (("time", self), ("datetime", virtual_datetime)):
+                if hasattr(module, attr):
+                    saved.append((module, attr, getattr(module, attr)))
+                    setattr(module, attr, value)
+        try:
+            yield self
+        finally:
+            for module, attr, value in reversed(saved):
+                setattr(module, attr, value)
+
+
+@dataclass
+class ReplayResult:
+    ticks: int
+    start: float
+    end: float
+    served: int
+    misses: int
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class Replayer:
+    """Drive a feed/strategy tick every ``tick`` recorded seconds.
+
+    Each tick runs ``_fetch_feeds``, one enrichment batch per registered
+    provider and ``execute_strategy``, in that order, so a log always
+    replays to the same trades.
+
+    ``speed=None`` (or 0) replays as fast as possible; otherwise recorded
+    time is scaled, e.g. ``speed=60`` plays an hour in a minute. Swap
+    transactions are never sent, so the Jupiter ``/swap`` endpoint is
+    stubbed and a throwaway wallet is configured when none is set.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], tick: float = 5.0, speed: Optional[float] = None) -> None:
+        self.entries = entries
+        self.tick = tick
+        self.speed = speed or None
+        self.clock = VirtualClock()
+        self.transport = ReplayTransport(entries, self.clock)
+        self.transport.stub("POST", "/v6/swap", {"swapTransaction": ""})
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs: Any) -> "Replayer":
+        return cls(list(read_log(path)), **kwargs)
+
+    async def run(self) -> ReplayResult:
+        from src.bot.feeds import FeedAggregator
+        from src.bot.trading import TradingEngine
+
+        start, end = self.transport.start_time, self.transport.end_time
+        if start is None:
+            return ReplayResult(0, 0.0, 0.0, 0, 0)
+        self.clock.now = start
+        trades: List[Dict[str, Any]] = []
+        sol_secret = settings.sol_secret
+        if not settings.public_key:
+            settings.sol_secret = json.dumps(list(bytes(Keypair())))
+
+        ticks = 0
+        try:
+            with self.clock.patch():
+                feeds = FeedAggregator(transport=self.transport)
+                # Recorded responses are not rate limited; enrichment follows recorded time
+                feeds.dex.limiter = None
+                feeds.scheduler.clock = self.clock.monotonic
+                # Breakers follow recorded time too; price fallbacks run unthrottled
+                feeds.health.clock = self.clock.monotonic
+                for source in feeds.prices.sources:
+                    source.budget = None
+                engine = TradingEngine(feeds)
+                # A replay never signs or sends, whatever LIVE_TRADING says
+                engine.sender = None
+                while self.clock.now <= end:
+                    held = set(engine.positions)
+                    await feeds._fetch_feeds()
+                    for provider in feeds.scheduler.handlers:
+                        batch = feeds.scheduler.next_batch(provider)
+                        if batch:
+                            await feeds.scheduler.dispatch(provider, batch)
+                    await engine.execute_strategy()
+                    trades.extend(self._trades(engine, held))
+                    ticks += 1
+                    if self.speed:
+                        await asyncio.sleep(self.tick / self.speed)
+                    self.clock.advance(self.tick)
+                stats = engine.get_stats()
+                stats.pop("connections", None)
+                stats.pop("rpc", None)
+                stats.pop("execution", None)
+                stats.pop("wallets", None)
+        finally:
+            settings.sol_secret = sol_secret
+
+        return ReplayResult(
+            ticks=ticks,
+            start=start,
+            end=end,
+            served=self.transport.served,
+            misses=self.transport.misses,
+            trades=trades,
+            stats=stats,
+        )
+
+    def _trades(self, engine: Any, held: set) -> List[Dict[str, Any]]:
+        now = self.clock.now
+        opened = [
+            {"t": now, "side": "buy", "token": a, "price": engine.positions[a].entry_price}
+            for a in sorted(set(engine.positions) - held)
+        ]
+        closed = [{"t": now, "side": "sell", "token": a} for a in sorted(held - set(engine.positions))]
+        return closed + opened
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded provider log")
+    parser.add_argument("log", help="gzip JSONL file written by ResponseRecorder")
+    parser.add_argument("--tick", type=float, default=5.0, help="recorded seconds per tick")
+    parser.add_argument("--speed", type=float, default=0.0, help="time scale, 0 = as fast as possible")
+    args = parser.parse_args()
+
+    result = asyncio.run(Replayer.from_file(args.log, tick=args.tick, speed=args.speed).run())
+    print(json.dumps({
+        "ticks": result.ticks,
+        "recorded_seconds": result.end - result.start,
+        "served": result.served,
+        "misses": result.misses,
+        "trades": result.trades,
+        "stats": result.stats,
+    }, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from .feeds import TokenData
+from .history import PriceHistory
 
 @dataclass
 class RiskManager:
@@ -12,6 +14,7 @@ class RiskManager:
     base_position: float = 10.0
     max_risk: float = 0.5  # 0-1 scale
     stop_loss_percent: float = 15.0
+    fast_drop_percent: float = 10.0  # max drop within 10s of ticks
 
     def assess_token_risk(self, token: TokenData) -> float:
         """Return a risk score between 0 and 1."""
@@ -20,7 +23,7 @@ class RiskManager:
             risk -= 0.2
         if token.holders > 1000:
             risk -= 0.1
-        if token.price_change_5m > 10:
+        if token.momentum_5m > 10:
             risk += 0.2
         return max(0.0, min(1.0, risk))
 
@@ -29,7 +32,15 @@ class RiskManager:
         factor = 1.0 - min(risk_score, self.max_risk)
         return self.base_position * factor
 
-    def stop_loss_triggered(self, entry: float, current: float) -> bool:
-        """Check if stop loss should trigger."""
+    def stop_loss_triggered(
+        self, entry: float, current: float, history: Optional[PriceHistory] = None
+    ) -> bool:
+        """Check if stop loss should trigger.
+
+        With a tick ``history`` a sharp drop over the last 10 seconds also
+        triggers, before the loss from entry reaches the stop.
+        """
         change = (current - entry) / entry * 100
-        return change <= -self.stop_loss_percent
+        if change <= -self.stop_loss_percent:
+            return True
+        return history is not None and history.return_pct(10) <= -self.fast_drop_percent
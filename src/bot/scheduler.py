@@ -0,0 +1,311 @@
+"""Per-provider rate limiting and fair enrichment scheduling."""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import httpx
+
+logger = logging.getLogger("bot.scheduler")
+
+Clock = Callable[[], float]
+# Queue position: (enriched before, virtual time of the turn)
+Turn = Tuple[bool, float]
+BatchHandler = Callable[[List[str]], Awaitable[None]]
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Return True if the exception is an HTTP 429 from a provider."""
+    return (
+        isinstance(exc, httpx.HTTPStatusError)
+        and exc.response.status_code == 429
+    )
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens/sec."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Clock = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.paused_until = 0.0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        if now > self.updated:
+            start = max(self.updated, self.paused_until)
+            if now > start:
+                self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+            self.updated = now
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        self._refill()
+        if self.clock() < self.paused_until or self.tokens < n:
+            return False
+        self.tokens -= n
+        return True
+
+    def delay(self, n: float = 1.0) -> float:
+        """Seconds until ``n`` tokens are available."""
+        self._refill()
+        wait = max(0.0, self.paused_until - self.clock())
+        missing = n - self.tokens
+        if missing > 0 and self.rate > 0:
+            wait += missing / self.rate
+        return wait
+
+    async def acquire(self, n: float = 1.0) -> None:
+        while not self.try_acquire(n):
+            await asyncio.sleep(max(0.001, self.delay(n)))
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` and drain the bucket."""
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
+        self.tokens = 0.0
+
+
+@dataclass
+class ProviderLimiter:
+    """Token bucket plus concurrency cap for one provider.
+
+    The refill rate backs off multiplicatively on 429 responses and creeps
+    back to ``rate`` on success, so the scheduler runs close to the quota
+    without hammering it.
+    """
+
+    name: str
+    rate: float
+    concurrency: int = 4
+    batch_size: int = 1
+    clock: Clock = time.monotonic
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    completed: Deque[float] = field(default_factory=deque)
+
+    def __post_init__(self) -> None:
+        self.bucket = TokenBucket(self.rate, clock=self.clock)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    @property
+    def current_rate(self) -> float:
+        return self.bucket.rate
+
+    def record_success(self) -> None:
+        self.requests += 1
+        self.completed.append(self.clock())
+        self.bucket.rate = min(self.rate, self.bucket.rate + self.rate * 0.05)
+
+    def record_throttled(self, retry_after: float = 1.0) -> None:
+        self.throttled += 1
+        self.bucket.rate = max(self.rate * 0.1, self.bucket.rate * 0.5)
+        self.bucket.pause(retry_after)
+        logger.warning(f"{self.name} rate limited, backing off to {self.bucket.rate:.2f} req/s")
+
+    def achieved_rps(self, window: float = 60.0) -> float:
+        now = self.clock()
+        while self.completed and self.completed[0] < now - window:
+            self.completed.popleft()
+        return len(self.completed) / window
+
+
+class EnrichmentScheduler:
+    """Continuously enriches the whole token universe within provider quotas.
+
+    Each registered provider runs its own worker which takes a bucket token
+    and a concurrency slot, then picks the most overdue tokens. Turns are
+    weighted fair queuing: a token re-queues ``1 / (1 + score / 100)``
+    after the provider's virtual time, so every token is eventually
+    refreshed, high-score tokens proportionally more often, and tokens
+    never enriched go first.
+
+    Turns live in one heap per provider: picking a batch pops its head
+    instead of scanning the universe, and a token is re-queued with its
+    current score when its batch completes.
+    """
+
+    def __init__(self, universe: Callable[[], Mapping[str, object]], clock: Clock = time.monotonic) -> None:
+        self.universe = universe
+        self.clock = clock
+        self.limiters: Dict[str, ProviderLimiter] = {}
+        self.handlers: Dict[str, BatchHandler] = {}
+        self.last_enriched: Dict[str, Dict[str, float]] = {}
+        self.inflight: Dict[str, Set[str]] = {}
+        self.first_seen: Dict[str, float] = {}
+        self.running = False
+        self._tasks: List[asyncio.Task] = []
+        self._dispatching: Set[asyncio.Task] = set()
+        # Per provider: heap of turns, the live turn of every queued token and the virtual time
+        self._queues: Dict[str, List[Tuple[Turn, str]]] = {}
+        self._due: Dict[str, Dict[str, Turn]] = {}
+        self._vtime: Dict[str, float] = {}
+        self.idle_sleep = 0.25
+
+    def register(
+        self,
+        name: str,
+        handler: BatchHandler,
+        rate: float,
+        concurrency: int = 4,
+        batch_size: int = 1,
+    ) -> ProviderLimiter:
+        limiter = ProviderLimiter(name, rate, concurrency, batch_size, clock=self.clock)
+        self.limiters[name] = limiter
+        self.handlers[name] = handler
+        self.last_enriched[name] = {}
+        self.inflight[name] = set()
+        self._queues[name] = []
+        self._due[name] = {}
+        self._vtime[name] = 0.0
+        return limiter
+
+    async def start(self) -> None:
+        self.running = True
+        for name in self.limiters:
+            self._tasks.append(asyncio.create_task(self._worker(name)))
+
+    async def stop(self) -> None:
+        """Stop the workers and wait for the batches already being dispatched."""
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+    def _queue(self, provider: str, address: str, token: object, now: float) -> None:
+        self.first_seen.setdefault(address, now)
+        score = getattr(token, "score", 0.0) or 0.0
+        turn = (
+            address in self.last_enriched[provider],  # never-enriched tokens first
+            self._vtime[provider] + 1.0 / (1.0 + max(score, 0.0) / 100.0),
+        )
+        self._due[provider][address] = turn
+        heapq.heappush(self._queues[provider], (turn, address))
+
+    def _sync(self, provider: str, tokens: Mapping[str, object], now: float) -> None:
+        """Queue tokens that joined the universe; only scans when membership changed."""
+        due, inflight = self._due[provider], self.inflight[provider]
+        if len(due) + len(inflight) == len(tokens):
+            return
+        for address in [a for a in due if a not in tokens]:
+            del due[address]
+        for address, token in list(tokens.items()):
+            if address not in due and address not in inflight:
+                self._queue(provider, address, token, now)
+
+    def next_batch(self, provider: str) -> List[str]:
+        """Pick the most overdue tokens for ``provider`` and mark them in flight."""
+        now = self.clock()
+        tokens = self.universe()
+        self._sync(provider, tokens, now)
+        queue, due = self._queues[provider], self._due[provider]
+        if len(queue) > 2 * len(due) + 64:  # drop entries left behind by forget()
+            queue = self._queues[provider] = [(turn, a) for a, turn in due.items()]
+            heapq.heapify(queue)
+        size = self.limiters[provider].batch_size
+        batch: List[str] = []
+        while queue and len(batch) < size:
+            when, address = heapq.heappop(queue)
+            if due.get(address) != when:
+                continue  # superseded or forgotten
+            del due[address]
+            self._vtime[provider] = max(self._vtime[provider], when[1])
+            if address in tokens:
+                batch.append(address)
+        self.inflight[provider].update(batch)
+        return batch
+
+    def _release(self, provider: str, batch: Iterable[str]) -> None:
+        """Return a batch from flight to the queue for its next turn."""
+        now = self.clock()
+        tokens = self.universe()
+        inflight = self.inflight[provider]
+        for address in batch:
+            inflight.discard(address)
+            token = tokens.get(address)
+            if token is not None:
+                self._queue(provider, address, token, now)
+
+    async def dispatch(self, provider: str, batch: List[str]) -> None:
+        limiter = self.limiters[provider]
+        try:
+            await self.handlers[provider](batch)
+            limiter.record_success()
+            now = self.clock()
+            for address in batch:
+                self.last_enriched[provider][address] = now
+        except Exception as e:
+            if is_rate_limited(e):
+                retry_after = e.response.headers.get("retry-after", "1")
+                try:
+                    limiter.record_throttled(float(retry_after))
+                except ValueError:
+                    limiter.record_throttled()
+            else:
+                limiter.errors += 1
+                logger.debug(f"{provider} enrichment error: {e}")
+        finally:
+            self._release(provider, batch)
+
+    async def _worker(self, provider: str) -> None:
+        limiter = self.limiters[provider]
+        while self.running:
+            await limiter.semaphore.acquire()
+            batch: List[str] = []
+            try:
+                batch = self.next_batch(provider)
+                if not batch:
+                    limiter.semaphore.release()
+                    await asyncio.sleep(self.idle_sleep)
+                    continue
+                await limiter.bucket.acquire()
+            except BaseException:
+                limiter.semaphore.release()
+                self._release(provider, batch)
+                raise
+            task = asyncio.create_task(self.dispatch(provider, batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+            task.add_done_callback(lambda _: limiter.semaphore.release())
+
+    def forget(self, address: str) -> None:
+        """Drop bookkeeping for a token that left the universe."""
+        self.first_seen.pop(address, None)
+        for seen in self.last_enriched.values():
+            seen.pop(address, None)
+        for due in self._due.values():
+            due.pop(address, None)
+
+    def average_staleness(self, provider: str) -> float:
+        now = self.clock()
+        tokens = list(self.universe().keys())
+        if not tokens:
+            return 0.0
+        seen = self.last_enriched[provider]
+        total = sum(
+            now - seen.get(address, self.first_seen.get(address, now))
+            for address in tokens
+        )
+        return total / len(tokens)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Achieved throughput and staleness per provider."""
+        return {
+            name: {
+                "rps": limiter.achieved_rps(),
+                "rate_limit": limiter.current_rate,
+                "requests": limiter.requests,
+                "throttled": limiter.throttled,
+                "errors": limiter.errors,
+                "avg_staleness": self.average_staleness(name),
+            }
+            for name, limiter in self.limiters.items()
+        }
@@ -0,0 +1,96 @@
+"""Immutable, versioned views of bot state for readers off the event loop.
+
+The feed aggregator and the trading engine each publish a ``Snapshot`` once
+per tick by swapping a single attribute, which is atomic. Readers such as
+the Gradio UI (worker threads) or the broadcaster take that reference and
+get a consistent view without locks. Publishing unchanged content keeps the
+old snapshot and version, so readers can skip re-rendering by version.
+"""
+
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Mapping, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from src.bot.feeds import TokenData
+    from src.bot.trading import Position
+
+T = TypeVar("T")
+
+
+def token_view(token: "TokenData") -> Dict[str, Any]:
+    return {
+        "address": token.address,
+        "symbol": token.symbol,
+        "price": token.price,
+        "price_change_5m": token.price_change_5m,
+        "momentum_5m": token.momentum_5m,
+        "volume_5m": token.volume_5m,
+        "liquidity": token.liquidity,
+        "score": token.score,
+        "opportunity": token.opportunity,
+    }
+
+
+def position_view(position: "Position") -> Dict[str, Any]:
+    return {
+        "address": position.token.address,
+        "symbol": position.token.symbol,
+        "entry_price": position.entry_price,
+        "price": position.token.price,
+        "amount_in": position.amount_in,
+        "pnl": position.pnl,
+        "pnl_percent": position.pnl_percent,
+        "entry_time": position.entry_time.isoformat(),
+    }
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def jsonable(value: Any) -> Any:
+    """``json.dumps`` default for frozen snapshot data."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One published state; ``data`` is frozen and never mutated."""
+
+    version: int = 0
+    taken_at: float = 0.0
+    data: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def next(self, data: Dict[str, Any]) -> "Snapshot":
+        """Snapshot of ``data``; ``self`` when the content did not change."""
+        frozen = freeze(data)
+        if self.version and self.data == frozen:
+            return self
+        return Snapshot(self.version + 1, time.time(), frozen)
+
+
+class RenderCache(Generic[T]):
+    """Memoises ``render(snapshot)`` for the latest snapshot version."""
+
+    def __init__(self, render: Callable[[Snapshot], T]) -> None:
+        self.render = render
+        # (version, rendered) swapped as one reference, safe across threads
+        self._entry: Optional[Tuple[int, T]] = None
+
+    def get(self, snapshot: Snapshot) -> T:
+        entry = self._entry
+        if entry is None or entry[0] != snapshot.version:
+            entry = self._entry = (snapshot.version, self.render(snapshot))
+        return entry[1]
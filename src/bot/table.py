@@ -0,0 +1,166 @@
+"""Optional columnar token store with vectorized scoring.
+
+Mirrors ``TokenData.calculate_score``, ``TokenData.analyze_opportunity`` and
+``FeedAggregator._detect_pump_opportunities`` over NumPy arrays so a whole
+universe is scored in a handful of array operations. Requires ``numpy``.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from .feeds import TokenData
+
+EPOCH = datetime(1970, 1, 1)
+OPPORTUNITIES = ("", "3x", "5x", "10x")
+_OPP_CODES = {label: code for code, label in enumerate(OPPORTUNITIES)}
+
+
+def to_epoch(value: Optional[datetime]) -> float:
+    """Naive UTC datetime to epoch seconds, NaN for None."""
+    return (value - EPOCH).total_seconds() if value else math.nan
+
+
+def score_columns(volume_5m, price_change_5m, liquidity, created_ts, now_ts: float):
+    """Vectorized ``TokenData.calculate_score``. NaN ``created_ts`` means unknown age."""
+    score = np.where(volume_5m > 100000, 30.0, np.where(volume_5m > 50000, 20.0, np.where(volume_5m > 10000, 10.0, 0.0)))
+    score += np.where(price_change_5m > 10, 30.0, np.where(price_change_5m > 5, 20.0, np.where(price_change_5m > 2, 10.0, 0.0)))
+    score += np.where(liquidity > 50000, 20.0, np.where(liquidity > 20000, 10.0, 0.0))
+    age_hours = (now_ts - created_ts) / 3600
+    with np.errstate(invalid="ignore"):
+        score += np.where(age_hours < 1, 20.0, np.where(age_hours < 6, 10.0, 0.0))
+    return score
+
+
+def opportunity_codes(volume_5m, price_change_5m):
+    """Vectorized ``TokenData.analyze_opportunity`` as indexes into OPPORTUNITIES."""
+    return np.where(
+        (volume_5m > 100000) & (price_change_5m > 100), 3,
+        np.where(
+            (volume_5m > 50000) & (price_change_5m > 50), 2,
+            np.where((volume_5m > 20000) & (price_change_5m > 20), 1, 0),
+        ),
+    ).astype(np.int8)
+
+
+def pump_bonus(volume_5m, liquidity, price_change_5m):
+    """Vectorized ``FeedAggregator._detect_pump_opportunities`` bonus."""
+    return np.where((volume_5m > 50000) & (liquidity > 10000) & (price_change_5m > 5), 10.0, 0.0)
+
+
+class TokenTable:
+    """Columnar copy of the token universe.
+
+    Rows are kept in sync with ``upsert``; ``score`` recomputes every row at
+    once and writes ``score``/``opportunity`` back only to the ``TokenData``
+    objects whose values changed, so existing callers keep working on them.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if np is None:
+            raise ImportError("TokenTable requires numpy (pip install numpy)")
+        self.capacity = capacity
+        self.size = 0
+        self.index: Dict[str, int] = {}
+        self.tokens: List[TokenData] = []
+        self.price = np.zeros(capacity)
+        self.price_change_5m = np.zeros(capacity)
+        self.volume_5m = np.zeros(capacity)
+        self.liquidity = np.zeros(capacity)
+        self.created_ts = np.full(capacity, np.nan)
+        self.score_col = np.zeros(capacity)
+        self.opportunity = np.zeros(capacity, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for name in ("price", "price_change_5m", "volume_5m", "liquidity", "score_col", "opportunity"):
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+        created = np.full(self.capacity, np.nan)
+        created[: self.size] = self.created_ts[: self.size]
+        self.created_ts = created
+
+    def upsert(self, token: TokenData) -> int:
+        """Insert or refresh the row for ``token`` and return its index."""
+        row = self.index.get(token.address)
+        if row is None:
+            if self.size == self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.index[token.address] = row
+            self.tokens.append(token)
+        else:
+            self.tokens[row] = token
+        self.price[row] = token.price
+        self.price_change_5m[row] = token.momentum_5m
+        self.volume_5m[row] = token.volume_5m
+        self.liquidity[row] = token.liquidity
+        self.created_ts[row] = to_epoch(token.created_at)
+        self.score_col[row] = token.score
+        self.opportunity[row] = _OPP_CODES.get(token.opportunity, 0)
+        return row
+
+    def remove(self, address: str) -> None:
+        """Drop a row by moving the last row into its slot."""
+        row = self.index.pop(address, None)
+        if row is None:
+            return
+        last = self.size - 1
+        if row != last:
+            moved = self.tokens[last]
+            self.tokens[row] = moved
+            self.index[moved.address] = row
+            for column in (self.price, self.price_change_5m, self.volume_5m, self.liquidity,
+                           self.created_ts, self.score_col, self.opportunity):
+                column[row] = column[last]
+        self.tokens.pop()
+        self.size = last
+
+    def sync(self, tokens: Iterable[TokenData]) -> None:
+        for token in tokens:
+            self.upsert(token)
+
+    def view(self, address: str) -> Optional[TokenData]:
+        """Return the TokenData backing a row."""
+        row = self.index.get(address)
+        return self.tokens[row] if row is not None else None
+
+    def score(self, now: Optional[datetime] = None) -> List[TokenData]:
+        """Score, tag and apply the pump bonus to every row.
+
+        Returns the TokenData objects that were updated.
+        """
+        n = self.size
+        if n == 0:
+            return []
+        now_ts = to_epoch(now or datetime.utcnow())
+        volume = self.volume_5m[:n]
+        change = self.price_change_5m[:n]
+        liquidity = self.liquidity[:n]
+
+        scores = score_columns(volume, change, liquidity, self.created_ts[:n], now_ts)
+        scores += pump_bonus(volume, liquidity, change)
+        codes = opportunity_codes(volume, change)
+
+        changed = np.flatnonzero((scores != self.score_col[:n]) | (codes != self.opportunity[:n]))
+        self.score_col[:n] = scores
+        self.opportunity[:n] = codes
+        updated = []
+        for row in changed.tolist():
+            token = self.tokens[row]
+            token.score = float(scores[row])
+            token.opportunity = OPPORTUNITIES[codes[row]]
+            updated.append(token)
+        return updated
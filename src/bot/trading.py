@@ -1,22 +1,34 @@
 # trading.py - Engine complet de trading
 import asyncio
-import httpx
 import logging
 import base64
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional
-from solana.rpc.async_api import AsyncClient
+from typing import Deque, Dict, Iterable, List, Optional
 from solders.transaction import Transaction
 from solders.signature import Signature
 
+from src.api.dexscreener import DexScreenerAPI
+from src.api.metrics import metrics
+from src.api.rpc import RpcPool
+from src.api.transport import HttpTransport, default_transport
 from src.bot.feeds import FeedAggregator, TokenData
 from src.bot.config import settings
+from src.bot.journal import JournalState
+from src.bot.events import DROP_OLDEST, Subscription
+from src.bot.execution import PriorityFeeEstimator, SendResult, TransactionSender
+from src.bot.monitor import PositionMonitor
+from src.bot.quotes import ExitQuotePrefetcher, QuoteCache
 from src.bot.risk import RiskManager
+from src.bot.scheduler import TokenBucket
+from src.bot.snapshot import Snapshot, position_view
+from src.bot.utils import percentile
+from src.bot.wallet import WalletService
 
 logger = logging.getLogger("bot.trading")
 
 JUPITER_URL = "https://quote-api.jup.ag/v6"
-SOLANA_RPC = "https://api.mainnet-beta.solana.com"
 
 class Position:
     """Track an open position."""
@@ -30,6 +42,7 @@ class Position:
         self.exit_price: Optional[float] = None
         self.exit_time: Optional[datetime] = None
         self.tx_signature: Optional[str] = None
+        self.wallet: Optional[str] = None  # public key holding the tokens (live mode)
         
     @property
     def current_value(self) -> float:
@@ -50,7 +63,12 @@ class Position:
             return 0
         return (self.pnl / self.amount_in) * 100
 
-async def jup_quote(input_mint: str, output_mint: str, amount: int) -> dict:
+async def jup_quote(
+    input_mint: str,
+    output_mint: str,
+    amount: int,
+    transport: Optional[HttpTransport] = None,
+) -> dict:
     """Request a swap quote from Jupiter."""
     params = {
         "inputMint": input_mint,
@@ -59,29 +77,38 @@ async def jup_quote(input_mint: str, output_mint: str, amount: int) -> dict:
         "slippageBps": 100  # 1% slippage
     }
     
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.get(f"{JUPITER_URL}/quote", params=params)
-        r.raise_for_status()
-        return r.json()
+    transport = transport or default_transport()
+    r = await transport.get(f"{JUPITER_URL}/quote", params=params, timeout=10)
+    r.raise_for_status()
+    return r.json()
 
-async def jup_swap_tx(quote: dict, user_public_key: str) -> dict:
+async def jup_swap_tx(
+    quote: dict,
+    user_public_key: str,
+    transport: Optional[HttpTransport] = None,
+    compute_unit_price: Optional[int] = None,
+) -> dict:
     """Generate swap transaction from Jupiter."""
     payload = {
         "quoteResponse": quote,
         "userPublicKey": user_public_key,
         "wrapUnwrapSOL": True
     }
+    if compute_unit_price:
+        payload["computeUnitPriceMicroLamports"] = compute_unit_price
     
-    async with httpx.AsyncClient(timeout=10) as client:
-        r = await client.post(f"{JUPITER_URL}/swap", json=payload)
-        r.raise_for_status()
-        return r.json()
+    transport = transport or default_transport()
+    r = await transport.post(f"{JUPITER_URL}/swap", json=payload, timeout=10)
+    r.raise_for_status()
+    return r.json()
 
 class TradingEngine:
     """Advanced trading engine with position management."""
     
     def __init__(self, feeds: FeedAggregator) -> None:
         self.feeds = feeds
+        # Jupiter calls share the aggregator's pooled connections
+        self.transport = feeds.transport
         self.running = False
         self.positions: Dict[str, Position] = {}
         self.total_invested = 0.0
@@ -97,53 +124,233 @@ class TradingEngine:
         # Constants
         self.USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
         self.SOL_MINT = "So11111111111111111111111111111111111111112"
+
+        # Event-driven loop: react to feed updates, full sweep when idle
+        self.updates = None
+        self.idle_sweep = 5.0
+        self.decision_latency: Deque[float] = deque(maxlen=1000)
+
+        # Exits run concurrently; one lock per position so a close is issued once
+        self._exit_locks: Dict[str, asyncio.Lock] = {}
+        self._exit_slots = asyncio.Semaphore(settings.max_parallel_exits)
+        self._exit_signals: Dict[str, float] = {}
+        self.exit_latency: Deque[float] = deque(maxlen=1000)
+
+        # Sell quotes kept warm for open positions
+        self.exit_quotes = QuoteCache(ttl=settings.exit_quote_ttl)
+        self.prefetcher = ExitQuotePrefetcher(
+            self, self.exit_quotes, interval=settings.exit_quote_interval
+        )
+
+        # Read-only view of positions and book totals, swapped when they change
+        self.snapshot = Snapshot()
+        self._published_key: Optional[tuple] = None
+
+        # Solana RPC through the shared transport, fastest healthy endpoint first
+        self.rpc = RpcPool(
+            settings.rpc_urls,
+            self.transport,
+            probe_interval=settings.rpc_probe_interval,
+            max_slot_lag=settings.rpc_max_slot_lag,
+        )
+        feeds.rpc = self.rpc
+        # Keys loaded once; swaps spread over the wallets, balances pushed over WS
+        self.wallet = WalletService(
+            settings.keypairs,
+            self.rpc,
+            settings.ws_url,
+            min_lamports=settings.wallet_min_lamports,
+        )
+
+        # Live mode signs and sends swaps; otherwise positions are tracked on quotes
+        self.sender: Optional[TransactionSender] = None
+        if settings.live_trading:
+            self.sender = TransactionSender(
+                self.rpc,
+                settings.ws_url,
+                rebroadcast_interval=settings.rebroadcast_interval,
+                blockhash_interval=settings.blockhash_refresh_interval,
+                fees=PriorityFeeEstimator(
+                    self.rpc,
+                    settings.priority_fee_percentile,
+                    min_fee=settings.priority_fee_min,
+                    max_fee=settings.priority_fee_max,
+                ),
+            )
+
+        # Held mints are re-priced on their own lane and reserved quota
+        self.monitor = PositionMonitor(
+            self,
+            DexScreenerAPI(
+                transport=self.transport, limiter=TokenBucket(settings.position_rps)
+            ),
+            interval=settings.position_poll_interval,
+        )
         
     async def start(self) -> None:
         self.running = True
-        self.client = AsyncClient(SOLANA_RPC)
+        if self.feeds.journal is not None:
+            self.restore(self.feeds.journal.load(tokens=False))
+        await self.rpc.start()
+        if self.sender is not None:
+            await self.sender.start()
+            await self.wallet.start()
+        self.updates = self._subscribe()
+        await self.prefetcher.start()
+        await self.monitor.start()
         asyncio.create_task(self._trade_loop())
         logger.info("Trading engine started")
         
+    def restore(self, state: JournalState) -> None:
+        """Resume journaled positions and PnL; held tokens are pinned and monitored."""
+        self.total_invested = state.totals.get("total_invested", self.total_invested)
+        self.total_realized_pnl = state.totals.get("total_realized_pnl", self.total_realized_pnl)
+        for address, row in state.positions.items():
+            if address in self.positions:
+                continue
+            token, amount_in, amount_out, entry_price, entry_time, tx, wallet = row
+            # Share the live universe object so feed updates reach the position
+            if address not in self.feeds.tokens:
+                self.feeds.restore({address: token})
+            position = Position(self.feeds.tokens[address], amount_in, amount_out)
+            position.entry_price = entry_price
+            position.entry_time = entry_time
+            position.tx_signature = tx
+            position.wallet = wallet
+            self.positions[address] = position
+            self.feeds.pin(address)
+        if state.positions:
+            logger.info(f"Restored {len(state.positions)} open positions from the journal")
+        self.publish_snapshot()
+
+    def _journal_totals(self) -> None:
+        if self.feeds.journal is not None:
+            self.feeds.journal.save_totals(
+                total_invested=self.total_invested, total_realized_pnl=self.total_realized_pnl
+            )
+
+    def _subscribe(self) -> Subscription:
+        """Coalescing inbox that never blocks the feed loop or the listener.
+
+        Sized to the whole universe; if it still overflows the oldest update
+        is dropped, and the idle sweep re-checks everything anyway.
+        """
+        return self.feeds.events.subscribe(
+            maxsize=max(1024, self.feeds.max_tokens), overflow=DROP_OLDEST
+        )
+
     async def stop(self) -> None:
         self.running = False
-        await self.client.close()
+        if self.updates:
+            self.feeds.events.unsubscribe(self.updates)
+        await self.prefetcher.stop()
+        await self.monitor.stop()
+        if self.sender is not None:
+            await self.wallet.stop()
+            await self.sender.stop()
+        await self.rpc.stop()
         logger.info("Trading engine stopped")
         
     async def _trade_loop(self) -> None:
         while self.running:
             try:
-                await self.execute_strategy()
-                await asyncio.sleep(5)
+                try:
+                    batch = await asyncio.wait_for(
+                        self.updates.get_batch(), timeout=self.idle_sweep
+                    )
+                except asyncio.TimeoutError:
+                    batch = None
+                started = time.perf_counter()
+                await self.execute_strategy(batch.keys() if batch else None)
+                if metrics.enabled:
+                    metrics.strategy_cycle.observe(time.perf_counter() - started)
+                if not batch:
+                    continue
+                now = time.monotonic()
+                for event in batch.values():
+                    self.decision_latency.append(now - event.published_at)
             except Exception as e:
                 logger.error(f"Trading loop error: {e}")
                 await asyncio.sleep(10)
                 
-    async def execute_strategy(self) -> None:
-        """Main trading strategy."""
+    async def execute_strategy(self, changed: Optional[Iterable[str]] = None) -> None:
+        """Main trading strategy.
+
+        With ``changed`` only those tokens are re-evaluated, otherwise the
+        whole book and the top of the scanner are checked.
+        """
+        changed = set(changed) if changed is not None else None
         
         # 1. Check existing positions for exit
-        await self._check_exit_conditions()
+        await self._check_exit_conditions(changed)
         
         # 2. Find new opportunities if we have slots
         if len(self.positions) < self.max_positions:
-            await self._find_entries()
-            
-    async def _check_exit_conditions(self) -> None:
-        """Check if any position should be closed."""
-        for address, position in list(self.positions.items()):
+            if changed is None:
+                await self._find_entries()
+            else:
+                candidates = [
+                    self.feeds.tokens[a] for a in changed if a in self.feeds.tokens
+                ]
+                candidates.sort(key=lambda t: t.score, reverse=True)
+                await self._find_entries(candidates[:10])
+        self.publish_snapshot()
+
+    def publish_snapshot(self) -> Snapshot:
+        """Swap in a frozen view of positions and book totals.
+
+        Only state goes in (no latencies, ages or counters), and the view is
+        rebuilt only when a position, a held price or a total changed, so
+        a strategy cycle that touched nothing costs one tuple compare.
+        """
+        key = (
+            self.total_invested,
+            self.total_realized_pnl,
+            tuple(
+                (address, p.amount_out, p.entry_price, p.token.price, p.exit_price)
+                for address, p in self.positions.items()
+            ),
+        )
+        if key == self._published_key:
+            return self.snapshot
+        self._published_key = key
+        positions = [position_view(p) for p in self.positions.values()]
+        self.snapshot = self.snapshot.next({"positions": positions, "stats": self.book_stats()})
+        return self.snapshot
+
+    async def _check_exit_conditions(self, addresses: Optional[set] = None) -> None:
+        """Check if any position should be closed and close them concurrently."""
+        exits = []
+        for address, position in list(self.positions.items()):
+            if addresses is not None and address not in addresses:
+                continue
             pnl_percent = position.pnl_percent
 
             # Check take profit or stop loss via risk manager
             if (pnl_percent >= self.take_profit or
-                self.risk.stop_loss_triggered(position.entry_price, position.token.price)):
+                self.risk.stop_loss_triggered(
+                    position.entry_price, position.token.price, position.token.history
+                )):
                 logger.info(
                     f"Closing position {position.token.symbol}: {pnl_percent:.2f}%"
                 )
-                await self._close_position(address)
+                self._exit_signals.setdefault(address, time.monotonic())
+                exits.append(self._close_position(address))
+        if exits:
+            await asyncio.gather(*exits)
+            self.publish_snapshot()
                 
-    async def _find_entries(self) -> None:
+    async def _find_entries(self, candidates: Optional[List[TokenData]] = None) -> None:
         """Find new tokens to buy."""
-        top_tokens = self.feeds.get_top_tokens(10)
+        if candidates is None:
+            # Only the head of the ranking that can pass the entry rules
+            candidates = self.feeds.get_top_tokens(
+                10,
+                min_liquidity=20000,
+                min_score=60,
+                where=lambda t: t.address not in self.positions,
+            )
+        top_tokens = candidates
         
         for token in top_tokens:
             # Skip if already in position
@@ -154,7 +361,7 @@ class TradingEngine:
             if (token.score >= 60 and 
                 token.volume_5m > 50000 and 
                 token.liquidity > 20000 and
-                token.price_change_5m > 5):
+                token.momentum_5m > 5):
                 
                 logger.info(f"Entry signal for {token.symbol} (score: {token.score})")
                 await self._open_position(token)
@@ -164,7 +371,7 @@ class TradingEngine:
                 
     async def _open_position(self, token: TokenData) -> None:
         """Open a new position."""
-        if not settings.public_key:
+        if not self.wallet.wallets:
             logger.error("No wallet configured")
             return
 
@@ -177,7 +384,9 @@ class TradingEngine:
             amount_lamports = int(pos_size * 1_000_000)
             
             # Get quote
-            quote = await jup_quote(self.USDC_MINT, token.address, amount_lamports)
+            quote = await jup_quote(
+                self.USDC_MINT, token.address, amount_lamports, self.transport
+            )
             
             if not quote:
                 logger.error(f"No quote for {token.symbol}")
@@ -186,17 +395,23 @@ class TradingEngine:
             # Expected output amount
             out_amount = int(quote["outAmount"]) / (10 ** token.decimals)
             
-            # Generate transaction
-            swap_data = await jup_swap_tx(quote, settings.public_key)
-            
-            # Send transaction (simplified - needs proper signing)
-            # tx_sig = await self._send_transaction(swap_data)
-            
+            # Send transaction (live mode only)
+            result = await self._swap(quote)
+            if result is not None and not result.landed:
+                logger.error(f"Buy of {token.symbol} did not land: {result.error}")
+                return
+
             # Create position
-            position = Position(token, pos_size, out_amount)
-            # position.tx_signature = tx_sig
+            position = Position(token, pos_size, out_amount)
+            if result is not None:
+                position.tx_signature = result.signature
+                position.wallet = result.wallet
             self.positions[token.address] = position
+            self.feeds.pin(token.address)
             self.total_invested += pos_size
+            if self.feeds.journal is not None:
+                self.feeds.journal.position_opened(position)
+            self._journal_totals()
 
             logger.info(f"Opened position: {pos_size} USDC -> {out_amount} {token.symbol}")
             
@@ -204,24 +419,51 @@ class TradingEngine:
             logger.error(f"Failed to open position: {e}")
             
     async def _close_position(self, address: str) -> None:
-        """Close an existing position."""
+        """Close an existing position.
+
+        Safe to call concurrently: a second call for a position that is
+        already closing returns immediately.
+        """
+        if address not in self.positions:
+            return
+        lock = self._exit_locks.setdefault(address, asyncio.Lock())
+        if lock.locked():
+            return
+        try:
+            async with lock, self._exit_slots:
+                signal_at = self._exit_signals.get(address, time.monotonic())
+                await self._do_close(address, signal_at)
+        finally:
+            if not lock.locked():
+                self._exit_locks.pop(address, None)
+                self._exit_signals.pop(address, None)
+
+    async def _do_close(self, address: str, signal_at: float) -> None:
         if address not in self.positions:
             return
             
         position = self.positions[address]
         
         try:
-            # Get quote for selling
-            amount_lamports = int(position.amount_out * (10 ** position.token.decimals))
-            quote = await jup_quote(address, self.USDC_MINT, amount_lamports)
+            # Get quote for selling: warm one if fresh enough, else live
+            amount_lamports = self.exit_amount(position)
+            quote = self.exit_quotes.get(address, self.USDC_MINT, amount_lamports)
+            if quote is None:
+                quote = await jup_quote(
+                    address, self.USDC_MINT, amount_lamports, self.transport
+                )
+            self.exit_latency.append(time.monotonic() - signal_at)
             
             if quote:
                 # Expected USDC output
                 usdc_out = int(quote["outAmount"]) / 1_000_000
                 
-                # Send transaction (simplified)
-                # tx_sig = await self._send_transaction(swap_data)
-                
+                # Send transaction (live mode only); keep the position if it failed
+                result = await self._swap(quote, position.wallet)
+                if result is not None and not result.landed:
+                    logger.error(f"Sell of {position.token.symbol} did not land: {result.error}")
+                    return
+
                 # Update position
                 position.exit_price = position.token.price
                 position.exit_time = datetime.utcnow()
@@ -234,20 +476,71 @@ class TradingEngine:
                 
             # Remove position
             del self.positions[address]
+            self.feeds.unpin(address)
+            self.exit_quotes.discard(address)
+            if self.feeds.journal is not None:
+                self.feeds.journal.position_closed(address)
+            self._journal_totals()
             
         except Exception as e:
             logger.error(f"Failed to close position: {e}")
             
-    def get_stats(self) -> dict:
-        """Get trading statistics."""
+    async def _swap(self, quote: dict, wallet: Optional[str] = None) -> Optional[SendResult]:
+        """Build, sign and send the swap for ``quote``; None when not trading live.
+
+        Sells pass the ``wallet`` holding the tokens (the primary one for
+        positions opened while paper trading); buys take the least busy
+        funded wallet.
+        """
+        if self.sender is None:
+            return None
+        async with self.wallet.lease(wallet) as payer:
+            if payer is None:
+                return SendResult("", landed=False, error="no funded wallet")
+            swap_data = await jup_swap_tx(
+                quote, payer.pubkey, self.transport, self.sender.fees.estimate()
+            )
+            raw = base64.b64decode(swap_data["swapTransaction"])
+            result = await self.sender.submit(raw, payer.keypair)
+        if result.landed:
+            logger.info(f"Swap {result.signature[:8]} landed in {result.time_to_land * 1000:.0f}ms")
+        return result
+
+    def exit_amount(self, position: Position) -> int:
+        """Token amount to sell when closing ``position``, in base units."""
+        return int(position.amount_out * (10 ** position.token.decimals))
+
+    def book_stats(self) -> dict:
+        """Positions and PnL totals: the published part of the statistics."""
         open_pnl = sum(p.pnl for p in self.positions.values())
         total_pnl = self.total_realized_pnl + open_pnl
-        
         return {
             "positions": len(self.positions),
             "total_invested": self.total_invested,
             "open_pnl": open_pnl,
             "realized_pnl": self.total_realized_pnl,
             "total_pnl": total_pnl,
-            "roi_percent": (total_pnl / self.total_invested * 100) if self.total_invested > 0 else 0
+            "roi_percent": (total_pnl / self.total_invested * 100) if self.total_invested > 0 else 0,
+        }
+
+    def get_stats(self) -> dict:
+        """Get trading statistics."""
+        return {
+            **self.book_stats(),
+            "connections": self.transport.connection_stats(),
+            "decision_latency_ms": {
+                "p50": percentile(self.decision_latency, 50) * 1000,
+                "p99": percentile(self.decision_latency, 99) * 1000,
+                "samples": len(self.decision_latency),
+            },
+            "exit_quotes": self.exit_quotes.stats(),
+            "position_monitor": self.monitor.stats(),
+            "rpc": self.rpc.stats(),
+            "execution": self.sender.stats() if self.sender is not None else None,
+            "wallets": self.wallet.stats() if self.sender is not None else None,
+            "exit_signal_to_quote_ms": {
+                "p50": percentile(self.exit_latency, 50) * 1000,
+                "p99": percentile(self.exit_latency, 99) * 1000,
+                "samples": len(self.exit_latency),
+            },
         }
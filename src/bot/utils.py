@@ -1,4 +1,5 @@
 import logging
+from typing import Sequence
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -8,3 +9,12 @@ def setup_logging(level: int = logging.INFO) -> None:
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q`` percentile (0-100) of ``values`` by nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1))))
+    return ordered[rank]
@@ -0,0 +1,189 @@
+"""Trading wallets and their SOL balances.
+
+Keys are loaded once and each public key is kept as a string. Concurrent
+swaps are spread over the wallets (least busy first) so simultaneous
+entries do not queue behind one account's transactions, and wallets
+below ``min_lamports`` get no new swaps.
+
+Balances are fetched once at start and then kept current by
+``accountSubscribe`` notifications on one shared WebSocket, so trading
+never waits on a balance call. Without a WebSocket endpoint the view is
+re-polled every ``poll_interval`` seconds instead.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+import websockets
+from solders.keypair import Keypair
+
+from src.api.rpc import RpcPool
+
+logger = logging.getLogger("bot.wallet")
+
+
+@dataclass
+class Wallet:
+    keypair: Keypair
+    pubkey: str
+    lamports: Optional[int] = None  # None until the first balance arrives
+    slot: int = 0  # context slot of ``lamports``
+    in_flight: int = 0
+    swaps: int = 0
+
+
+class WalletService:
+    """Hands out wallets for swaps and tracks their balances."""
+
+    def __init__(
+        self,
+        keypairs: Sequence[Keypair],
+        rpc: Optional[RpcPool] = None,
+        ws_url: Optional[str] = None,
+        min_lamports: int = 0,
+        poll_interval: float = 30.0,
+        commitment: str = "confirmed",
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.wallets = [Wallet(kp, str(kp.pubkey())) for kp in keypairs]
+        self.by_pubkey: Dict[str, Wallet] = {w.pubkey: w for w in self.wallets}
+        self.rpc = rpc
+        self.ws_url = ws_url
+        self.min_lamports = min_lamports
+        self.poll_interval = poll_interval
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.notifications = 0
+        self._ws: Any = None
+        self._requests: Dict[int, Wallet] = {}
+        self._subscriptions: Dict[int, Wallet] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def primary(self) -> Optional[Wallet]:
+        return self.wallets[0] if self.wallets else None
+
+    def get(self, pubkey: Optional[str]) -> Optional[Wallet]:
+        """The wallet for ``pubkey``, or the primary one if it is unknown."""
+        return self.by_pubkey.get(pubkey or "") or self.primary
+
+    def funded(self, wallet: Wallet) -> bool:
+        return wallet.lamports is None or wallet.lamports >= self.min_lamports
+
+    def pick(self) -> Optional[Wallet]:
+        """Least busy funded wallet, fewest swaps so far breaking ties."""
+        candidates = [w for w in self.wallets if self.funded(w)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: (w.in_flight, w.swaps))
+
+    @asynccontextmanager
+    async def lease(self, pubkey: Optional[str] = None) -> AsyncIterator[Optional[Wallet]]:
+        """Reserve a wallet for one swap: ``pubkey``'s if given, else ``pick()``."""
+        wallet = self.get(pubkey) if pubkey else self.pick()
+        if wallet is None:
+            yield None
+            return
+        wallet.in_flight += 1
+        wallet.swaps += 1
+        try:
+            yield wallet
+        finally:
+            wallet.in_flight -= 1
+
+    async def start(self) -> None:
+        if self.rpc is None or not self.wallets:
+            return
+        await self.refresh()
+        loop = self._ws_loop() if self.ws_url else self._poll_loop()
+        self._task = asyncio.create_task(loop)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def refresh(self) -> None:
+        """Fetch every balance once, concurrently."""
+        assert self.rpc is not None
+        balances = await asyncio.gather(
+            *(self.rpc.get_balance(w.pubkey, self.commitment) for w in self.wallets),
+            return_exceptions=True,
+        )
+        for wallet, balance in zip(self.wallets, balances):
+            if isinstance(balance, BaseException):
+                logger.debug(f"Balance of {wallet.pubkey[:8]} unavailable: {balance}")
+            elif wallet.slot == 0:  # a notification is always fresher
+                wallet.lamports = balance
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.refresh()
+
+    async def _ws_loop(self) -> None:
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    self._ws = ws
+                    self._requests.clear()
+                    self._subscriptions.clear()
+                    for request_id, wallet in enumerate(self.wallets, 1):
+                        self._requests[request_id] = wallet
+                        await ws.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": "accountSubscribe",
+                            "params": [wallet.pubkey, {"encoding": "base64", "commitment": self.commitment}],
+                        }))
+                    async for raw in ws:
+                        self._handle_message(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Wallet socket disconnected: {e}")
+            finally:
+                self._ws = None
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _handle_message(self, raw: Any) -> None:
+        msg = json.loads(raw)
+        if "id" in msg and "result" in msg:
+            wallet = self._requests.pop(msg["id"], None)
+            if wallet is not None:
+                self._subscriptions[msg["result"]] = wallet
+            return
+        if msg.get("method") != "accountNotification":
+            return
+        params = msg.get("params", {})
+        wallet = self._subscriptions.get(params.get("subscription"))
+        result = params.get("result", {})
+        value = result.get("value")
+        if wallet is None or not isinstance(value, dict):
+            return
+        slot = result.get("context", {}).get("slot", 0)
+        if slot >= wallet.slot:
+            wallet.lamports = int(value.get("lamports", 0))
+            wallet.slot = slot
+            self.notifications += 1
+
+    def stats(self) -> dict:
+        return {
+            "connected": self._ws is not None,
+            "notifications": self.notifications,
+            "wallets": [
+                {
+                    "pubkey": w.pubkey,
+                    "sol": w.lamports / 1e9 if w.lamports is not None else None,
+                    "in_flight": w.in_flight,
+                    "swaps": w.swaps,
+                    "funded": self.funded(w),
+                }
+                for w in self.wallets
+            ],
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api.dexscreener import DexScreenerAPI
+from src.api.moralis import MoralisAPI
+from src.api.transport import HttpTransport
+from src.bot.feeds import FeedAggregator, TokenData
+
+
+def make_pair(address: str, price: float, liquidity: float) -> dict:
+    return {
+        "chainId": "solana",
+        "baseToken": {"address": address, "symbol": address.upper()},
+        "priceUsd": str(price),
+        "volume": {"m5": 1000, "h24": 5000},
+        "liquidity": {"usd": liquidity},
+        "priceChange": {"m5": 3.5},
+    }
+
+
+@pytest_asyncio.fixture
+async def provider():
+    calls = {"dex": [], "moralis": []}
+
+    async def tokens(request: web.Request) -> web.Response:
+        addresses = request.match_info["addresses"].split(",")
+        calls["dex"].append(addresses)
+        pairs = []
+        for a in addresses:
+            pairs.append(make_pair(a, 1.0, 500))
+            pairs.append(make_pair(a, 2.0, 9000))  # deeper pool wins
+        return web.json_response({"pairs": pairs})
+
+    async def prices(request: web.Request) -> web.Response:
+        body = await request.json()
+        calls["moralis"].append(body["addresses"])
+        return web.json_response(
+            [{"tokenAddress": a, "usdPrice": 3.0} for a in body["addresses"]]
+        )
+
+    app = web.Application()
+    app.router.add_get("/latest/dex/tokens/{addresses}", tokens)
+    app.router.add_post("/token/mainnet/prices", prices)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", calls
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_dexscreener_batches_by_max_size(provider):
+    base, calls = provider
+    api = DexScreenerAPI()
+    api.BASE_URL = f"{base}/latest"
+    addresses = [f"mint{i}" for i in range(65)]
+    pairs = await api.get_token_pairs(addresses)
+    await api.close()
+    assert sorted(len(c) for c in calls["dex"]) == [5, 30, 30]
+    assert len(pairs) == 130
+
+
+@pytest.mark.asyncio
+async def test_moralis_batches_by_max_size(provider):
+    base, calls = provider
+    api = MoralisAPI("key")
+    api.BASE_URL = base
+    prices = await api.get_token_prices("mainnet", [f"m{i}" for i in range(250)])
+    await api.close()
+    assert sorted(len(c) for c in calls["moralis"]) == [50, 100, 100]
+    assert len(prices) == 250
+
+
+@pytest.mark.asyncio
+async def test_refresh_prices_merges_into_universe(provider):
+    base, calls = provider
+    feeds = FeedAggregator(transport=HttpTransport())
+    feeds.dex.BASE_URL = f"{base}/latest"
+    for i in range(40):
+        feeds.tokens[f"mint{i}"] = TokenData(address=f"mint{i}", price=0.5, holders=7)
+
+    changed = await feeds._refresh_prices(list(feeds.tokens))
+    assert changed == set(feeds.tokens)
+    # Same market data again: nothing to re-score or publish
+    assert await feeds._refresh_prices(list(feeds.tokens)) == set()
+    await feeds.transport.close()
+
+    assert len(calls["dex"]) == 4
+    token = feeds.tokens["mint3"]
+    assert token.price == 2.0
+    assert token.liquidity == 9000
+    assert token.price_change_5m == 3.5
+    assert token.holders == 7  # enrichment data is preserved
+
+
+@pytest.mark.asyncio
+async def test_lane_batch_is_scored_and_published_at_once(provider):
+    base, calls = provider
+    feeds = FeedAggregator(transport=HttpTransport())
+    feeds.dex.BASE_URL = f"{base}/latest"
+    for i in range(3):
+        feeds.tokens[f"mint{i}"] = TokenData(address=f"mint{i}", price=0.5)
+    inbox = feeds.events.subscribe()
+    version = feeds.snapshot.version
+    before = time.monotonic()
+
+    await feeds._enrich_dexscreener(list(feeds.tokens))
+    await feeds.transport.close()
+
+    batch = await asyncio.wait_for(inbox.get_batch(), 1)
+    assert set(batch) == set(feeds.tokens) and not feeds._dirty
+    for update in batch.values():
+        # Stamped when the prices arrived, not when they were published
+        assert update.source == "dexscreener" and update.published_at >= before
+    assert all(feeds.tokens[a].score > 0 for a in batch)
+    assert feeds.snapshot.version > version
+    assert {t["price"] for t in feeds.snapshot.data["tokens"]} == {2.0}
+
+
+@pytest.mark.asyncio
+async def test_fetch_feeds_only_searches(provider):
+    base, calls = provider
+    feeds = FeedAggregator(transport=HttpTransport())
+    feeds.dex.BASE_URL = f"{base}/latest"
+    for i in range(40):
+        feeds.tokens[f"mint{i}"] = TokenData(address=f"mint{i}", price=0.5)
+    await feeds._fetch_feeds()  # the search itself 404s on the fake provider
+    # Refreshes are paced by the scheduler lane, 30 tokens per request
+    assert calls["dex"] == []
+    assert feeds.scheduler.limiters["dexscreener"].batch_size == 30
+    await feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_moralis_keeps_successful_chunks(provider, monkeypatch):
+    base, calls = provider
+    api = MoralisAPI("key")
+    api.BASE_URL = base
+    post = api._post
+
+    async def flaky_post(path, payload):
+        if "m0" in payload["addresses"]:
+            raise RuntimeError("chunk failed")
+        return await post(path, payload)
+
+    monkeypatch.setattr(api, "_post", flaky_post)
+    prices = await api.get_token_prices("mainnet", [f"m{i}" for i in range(150)])
+    assert len(prices) == 50  # the second chunk survives the first one failing
+    with pytest.raises(RuntimeError):
+        await api.get_token_prices("mainnet", ["m0"])
+    await api.close()
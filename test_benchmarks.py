@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.fakes import build_universe
+from benchmarks.run import bench_size, compare
+
+
+@pytest.mark.asyncio
+async def test_fake_universe_serves_feed_ticks():
+    engine = build_universe(200)
+    await engine.feeds._fetch_feeds()
+    assert len(engine.feeds.tokens) == 200
+    assert engine.feeds.transport.requests >= 1
+    assert len(engine.positions) == 4
+    await engine.feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_bench_size_reports_percentiles_and_allocations():
+    results = await bench_size(100, iterations=3)
+    assert set(results) == {
+        "fetch_feeds", "get_top_tokens", "execute_strategy", "execute_strategy_changed", "get_stats",
+    }
+    for scenario in results.values():
+        assert scenario["p50_ms"] <= scenario["p99_ms"]
+        assert scenario["alloc_peak_kb"] >= 0
+
+    slower = {"100": {name: dict(r, p50_ms=r["p50_ms"] / 2) for name, r in results.items()}}
+    assert compare({"100": results}, slower, max_regression=20.0)
+    assert not compare({"100": results}, {"100": results}, max_regression=20.0)
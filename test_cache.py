@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api.cache import CachePolicy, TieredCache
+from src.api.helius import HeliusAPI
+from src.api.schemas import Holders
+from src.api.transport import HttpTransport
+
+POLICY = CachePolicy(ttl=10.0, stale=50.0)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counting_fetch(values):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return values[len(calls) - 1]
+
+    return fetch, calls
+
+
+@pytest.mark.asyncio
+async def test_fresh_stale_and_expired_lookups():
+    clock = Clock()
+    cache = TieredCache(clock=clock)
+    fetch, calls = counting_fetch(["v1", "v2", "v3"])
+
+    assert await cache.get("ns", "k", fetch, POLICY) == "v1"
+    clock.now += 5
+    assert await cache.get("ns", "k", fetch, POLICY) == "v1"
+    assert len(calls) == 1
+
+    # Stale: the old value comes back at once, one refresh runs behind it
+    clock.now += 10
+    assert await cache.get("ns", "k", fetch, POLICY) == "v1"
+    assert await cache.get("ns", "k", fetch, POLICY) == "v1"
+    await asyncio.sleep(0.01)
+    assert len(calls) == 2
+    assert await cache.get("ns", "k", fetch, POLICY) == "v2"
+
+    clock.now += 100  # past ttl + stale: fetched inline
+    assert await cache.get("ns", "k", fetch, POLICY) == "v3"
+    assert cache.stats()["namespaces"]["ns"] == {
+        "hit": 2, "stale": 2, "miss": 2, "hit_ratio": round(4 / 6, 3)
+    }
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch():
+    cache = TieredCache()
+    fetch, calls = counting_fetch(["v1", "v2"])
+    results = await asyncio.gather(*(cache.get("ns", "k", fetch, POLICY) for _ in range(5)))
+    assert results == ["v1"] * 5 and len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache" / "cache.db")
+    clock = Clock()
+    cache = TieredCache(path, clock=clock)
+    fetch, calls = counting_fetch([Holders(total=42)])
+    await cache.get("helius_holders", "mint", fetch, POLICY, Holders)
+    await cache.close()
+
+    restarted = TieredCache(path, clock=clock)
+    value = await restarted.get("helius_holders", "mint", fetch, POLICY, Holders)
+    assert value == Holders(total=42) and len(calls) == 1
+    await restarted.close()
+
+
+@pytest_asyncio.fixture
+async def helius_server():
+    calls = []
+
+    async def holders(request: web.Request) -> web.Response:
+        calls.append(request.match_info["mint"])
+        return web.json_response({"total": 7, "items": []})
+
+    app = web.Application()
+    app.router.add_get("/v0/tokens/{mint}/holders", holders)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", calls
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_helius_holders_are_cached(helius_server):
+    base, calls = helius_server
+    cache = TieredCache()
+    api = HeliusAPI("key", transport=HttpTransport(), cache=cache)
+    api.BASE_URL = base
+    for _ in range(3):
+        assert (await api.get_holders("mint")).total == 7
+    assert calls == ["mint"]
+    assert cache.stats()["namespaces"]["helius_holders"]["hit_ratio"] == round(2 / 3, 3)
+    await api.transport.close()
+    await cache.close()
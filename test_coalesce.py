@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api import dexscreener
+from src.api.coalesce import MicroBatcher, SingleFlight
+from src.api.dexscreener import DexScreenerAPI
+from src.api.transport import HttpTransport
+from src.bot import trading
+
+
+def pair(address: str) -> dict:
+    return {
+        "chainId": "solana",
+        "pairAddress": f"pair-{address}",
+        "baseToken": {"address": address, "symbol": address.upper()},
+        "priceUsd": "1.0",
+        "liquidity": {"usd": 1000},
+    }
+
+
+@pytest_asyncio.fixture
+async def server():
+    calls = []
+
+    async def slow(request: web.Request) -> web.Response:
+        calls.append((request.method, request.path, request.query_string))
+        await asyncio.sleep(0.05)
+        return web.json_response({"ok": True})
+
+    async def tokens(request: web.Request) -> web.Response:
+        addresses = request.match_info["addresses"].split(",")
+        calls.append(("GET", "/dex/tokens", tuple(addresses)))
+        return web.json_response({"pairs": [pair(a) for a in addresses]})
+
+    app = web.Application()
+    app.router.add_get("/quote", slow)
+    app.router.add_post("/quote", slow)
+    app.router.add_get("/dex/tokens/{addresses}", tokens)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", calls
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_identical_gets_share_one_request(server):
+    base, calls = server
+    transport = HttpTransport()
+    responses = await asyncio.gather(
+        *(transport.get(f"{base}/quote", params={"amount": 1}) for _ in range(5))
+    )
+    assert all(r.json() == {"ok": True} for r in responses)
+    assert len(calls) == 1
+    assert transport.connection_stats()[base]["coalesced"] == 4
+
+    # Different params are different requests
+    await asyncio.gather(
+        transport.get(f"{base}/quote", params={"amount": 1}),
+        transport.get(f"{base}/quote", params={"amount": 2}),
+    )
+    assert len(calls) == 3
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_posts_are_not_coalesced_unless_asked(server):
+    base, calls = server
+    transport = HttpTransport()
+    await asyncio.gather(*(transport.post(f"{base}/quote", json={"a": 1}) for _ in range(3)))
+    assert len(calls) == 3
+    await asyncio.gather(
+        *(transport.post(f"{base}/quote", json={"a": 1}, coalesce=True) for _ in range(3))
+    )
+    assert len(calls) == 4
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jupiter_quotes_share_one_request(server, monkeypatch):
+    base, calls = server
+    monkeypatch.setattr(trading, "JUPITER_URL", base)
+    transport = HttpTransport()
+    quotes = await asyncio.gather(
+        *(trading.jup_quote("in", "out", 1000, transport) for _ in range(4))
+    )
+    assert quotes == [{"ok": True}] * 4 and len(calls) == 1
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "value"
+
+    first = asyncio.create_task(flights.do("k", fetch))
+    await started.wait()
+    second = asyncio.create_task(flights.do("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "value"
+    assert flights.stats() == {"calls": 1, "shared": 1, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_then_retries():
+    flights = SingleFlight()
+    attempts = []
+
+    async def failing():
+        attempts.append(1)
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        *(flights.do("k", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results) and len(attempts) == 1
+    with pytest.raises(RuntimeError):
+        await flights.do("k", failing)
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_merges_keys_within_a_window():
+    batches = []
+
+    async def fetch(keys):
+        batches.append(keys)
+        return {k: k.upper() for k in keys}
+
+    batcher = MicroBatcher(fetch, window=0.01)
+    results = await asyncio.gather(
+        batcher.submit(["a", "b"]), batcher.submit(["b", "c"]), batcher.submit(["d"])
+    )
+    assert batches == [["a", "b", "c", "d"]]
+    assert all(r == {"a": "A", "b": "B", "c": "C", "d": "D"} for r in results)
+
+    # max_keys closes the window early
+    batcher = MicroBatcher(fetch, window=10.0, max_keys=2)
+    assert await batcher.submit(["x", "y"]) == {"x": "X", "y": "Y"}
+    assert batcher.stats() == {"batches": 1, "submits": 1, "keys": 2}
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_propagates_errors_to_every_caller():
+    async def fetch(keys):
+        raise ValueError("down")
+
+    batcher = MicroBatcher(fetch, window=0.01)
+    results = await asyncio.gather(
+        batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_dexscreener_batches_concurrent_lookups(server, monkeypatch):
+    base, calls = server
+    monkeypatch.setattr(dexscreener.DexScreenerAPI, "BASE_URL", base)
+    api = DexScreenerAPI(transport=HttpTransport(), batch_window=0.01)
+    first, second = await asyncio.gather(
+        api.get_pairs(["mintA", "mintB"]), api.get_pairs(["mintB", "mintC"])
+    )
+    assert calls == [("GET", "/dex/tokens", ("mintA", "mintB", "mintC"))]
+    assert [p.base_token.address for p in first] == ["mintA", "mintB"]
+    assert [p.base_token.address for p in second] == ["mintB", "mintC"]
+    await api.transport.close()
@@ -0,0 +1,186 @@
+import asyncio
+import base64
+import json
+import struct
+
+import base58
+import pytest
+import websockets
+from aiohttp import web
+from solders.keypair import Keypair
+
+from src.api.rpc import RpcPool
+from src.api.transport import HttpTransport
+from src.bot.config import Settings
+from src.bot.discovery import (
+    PUMP_CREATE_EVENT,
+    PUMP_FUN,
+    RAYDIUM_AMM_V4,
+    PoolListener,
+    RpcMintResolver,
+    parse_pump_create,
+)
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import TradingEngine
+
+
+def _borsh_string(value: str) -> bytes:
+    raw = value.encode()
+    return struct.pack("<I", len(raw)) + raw
+
+
+def pump_create_logs(name: str, symbol: str, mint: bytes) -> list:
+    data = (
+        PUMP_CREATE_EVENT
+        + _borsh_string(name)
+        + _borsh_string(symbol)
+        + _borsh_string("https://ipfs.io/x")
+        + mint
+        + bytes(64)  # bonding curve + creator
+    )
+    return [
+        f"Program {PUMP_FUN} invoke [1]",
+        "Program log: Instruction: Create",
+        "Program data: " + base64.b64encode(data).decode(),
+        f"Program {PUMP_FUN} success",
+    ]
+
+
+def notification(subscription: int, signature: str, logs: list) -> str:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": "logsNotification",
+        "params": {
+            "subscription": subscription,
+            "result": {
+                "context": {"slot": 1},
+                "value": {"signature": signature, "err": None, "logs": logs},
+            },
+        },
+    })
+
+
+def test_parse_pump_create():
+    mint = Keypair().pubkey()
+    token = parse_pump_create(pump_create_logs("Dog Wif Hat", "WIF", bytes(mint)))
+    assert token.address == str(mint)
+    assert token.symbol == "WIF"
+    assert token.name == "Dog Wif Hat"
+    assert parse_pump_create(["Program log: Instruction: Buy"]) is None
+
+
+@pytest.mark.asyncio
+async def test_listener_replays_and_resubscribes_after_disconnect():
+    pump_mint = Keypair().pubkey()
+    ray_mint = Keypair().pubkey()
+    recorded = [
+        # first connection: one pump.fun create, then the socket drops
+        [(PUMP_FUN, "sig-1", pump_create_logs("Alpha", "ALP", bytes(pump_mint)))],
+        # second connection: a duplicate and a Raydium pool init
+        [
+            (PUMP_FUN, "sig-1", pump_create_logs("Alpha", "ALP", bytes(pump_mint))),
+            (RAYDIUM_AMM_V4, "sig-2", ["Program log: initialize2: InitializeInstruction2 { nonce: 254 }"]),
+        ],
+    ]
+    subscribe_counts = []
+
+    async def handler(ws):
+        subscriptions = {}
+        for _ in range(2):
+            request = json.loads(await ws.recv())
+            assert request["method"] == "logsSubscribe"
+            sub_id = len(subscriptions) + 100
+            subscriptions[request["params"][0]["mentions"][0]] = sub_id
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": sub_id}))
+        subscribe_counts.append(len(subscriptions))
+        for program, signature, logs in recorded.pop(0) if recorded else []:
+            await ws.send(notification(subscriptions[program], signature, logs))
+        if recorded:
+            await ws.close()
+        else:
+            await ws.wait_closed()
+
+    async def resolver(signature):
+        assert signature == "sig-2"
+        return TokenData(address=str(ray_mint))
+
+    found = []
+
+    async def on_token(token):
+        found.append(token.address)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        listener = PoolListener(
+            f"ws://127.0.0.1:{port}", on_token, resolver=resolver, reconnect_delay=0.01
+        )
+        await listener.start()
+        for _ in range(200):
+            if len(found) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await listener.stop()
+
+    assert found == [str(pump_mint), str(ray_mint)]
+    assert subscribe_counts == [2, 2]
+    assert listener.stats["connections"] == 2
+
+
+def raydium_init_tx(lp: str, coin: str, pc: str) -> dict:
+    accounts = [str(Keypair().pubkey()) for _ in range(7)] + [lp, coin, pc]
+    accounts += [str(Keypair().pubkey()) for _ in range(11)]
+    return {
+        "transaction": {"message": {"instructions": [
+            {"programId": "ComputeBudget111111111111111111111111111111", "accounts": [], "data": "3"},
+            {"programId": RAYDIUM_AMM_V4, "accounts": accounts,
+             "data": base58.b58encode(bytes([1, 254]) + bytes(24)).decode()},
+        ]}},
+        "meta": {"postTokenBalances": [
+            # LP mint listed first: balance order must not decide the token
+            {"mint": lp, "uiTokenAmount": {"decimals": 9}},
+            {"mint": coin, "uiTokenAmount": {"decimals": 6}},
+            {"mint": pc, "uiTokenAmount": {"decimals": 9}},
+        ]},
+    }
+
+
+@pytest.mark.asyncio
+async def test_resolver_retries_until_confirmed_and_reads_instruction():
+    lp, coin = str(Keypair().pubkey()), str(Keypair().pubkey())
+    sol = "So11111111111111111111111111111111111111112"
+    requests = []
+
+    async def rpc(request: web.Request) -> web.Response:
+        body = await request.json()
+        requests.append(body)
+        result = None if len(requests) < 3 else raydium_init_tx(lp, coin, sol)
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    app = web.Application()
+    app.router.add_post("/", rpc)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    transport = HttpTransport()
+    resolver = RpcMintResolver(RpcPool([f"http://127.0.0.1:{port}/"], transport), retry_delay=0.01)
+    token = await resolver("sig")
+    await transport.close()
+    await runner.cleanup()
+
+    assert token.address == coin and token.decimals == 6
+    assert len(requests) == 3
+    assert requests[0]["params"][1]["commitment"] == "confirmed"
+
+
+@pytest.mark.asyncio
+async def test_stream_discovery_is_opt_in_and_resolves_through_the_engine_pool():
+    config = Settings(helius_key="key", solana_ws_url="ws://127.0.0.1:1")
+    assert config.ws_url and not config.stream_discovery  # an endpoint alone does not enable it
+
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    assert feeds.rpc is engine.rpc
+    await feeds.transport.close()
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from src.bot.events import DROP_OLDEST, EventBus, Subscription, TokenUpdate
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import Position, TradingEngine
+
+
+@pytest.mark.asyncio
+async def test_updates_for_same_token_are_coalesced():
+    sub = Subscription(maxsize=4)
+    first = TokenUpdate("a", "dexscreener", published_at=1.0)
+    await sub.put(first)
+    await sub.put(TokenUpdate("a", "moralis", published_at=2.0))
+    await sub.put(TokenUpdate("b", "dexscreener", published_at=3.0))
+    batch = await sub.get_batch()
+    assert list(batch) == ["a", "b"]
+    assert batch["a"].published_at == 1.0  # latency counts from the first update
+    assert batch["a"].source == "moralis"
+    assert sub.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_overflow():
+    sub = Subscription(maxsize=2, overflow=DROP_OLDEST)
+    for address in "abc":
+        await sub.put(TokenUpdate(address))
+    assert list(await sub.get_batch()) == ["b", "c"]
+    assert sub.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_block_overflow_applies_backpressure():
+    bus = EventBus()
+    sub = bus.subscribe(maxsize=1)
+    await bus.publish(TokenUpdate("a"))
+    blocked = asyncio.create_task(bus.publish(TokenUpdate("b")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert list(await sub.get_batch()) == ["a"]
+    await asyncio.wait_for(blocked, 1)
+    assert list(await sub.get_batch()) == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_engine_reacts_to_published_updates():
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    token = TokenData(address="mint", symbol="MINT", price=1.0)
+    feeds.tokens["mint"] = token
+    engine.positions["mint"] = Position(token, 10.0, 10.0)
+    closed = []
+
+    async def fake_close(address):
+        closed.append(address)
+        engine.positions.pop(address, None)
+
+    engine._close_position = fake_close
+    engine.updates = engine._subscribe()
+    engine.running = True
+    loop_task = asyncio.create_task(engine._trade_loop())
+
+    token.price = 0.5  # stop loss
+    await feeds.events.publish_many(["mint"], "test")
+    for _ in range(100):
+        if closed:
+            break
+        await asyncio.sleep(0.01)
+
+    engine.running = False
+    loop_task.cancel()
+    await asyncio.gather(loop_task, return_exceptions=True)
+    await feeds.transport.close()
+    assert closed == ["mint"]
+    assert engine.get_stats()["decision_latency_ms"]["samples"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_engine_never_blocks_publishers():
+    feeds = FeedAggregator()
+    feeds.max_tokens = 10
+    engine = TradingEngine(feeds)
+    engine.updates = engine._subscribe()
+    # Nobody consumes: publishing far more than the inbox holds must not wait
+    await asyncio.wait_for(
+        feeds.events.publish_many([f"t{i}" for i in range(5000)], "test"), 1
+    )
+    assert len(engine.updates) == 1024
+    assert engine.updates.dropped == 5000 - 1024
+    await feeds.transport.close()
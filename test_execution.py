@@ -0,0 +1,234 @@
+import asyncio
+import base64
+import json
+import threading
+
+import pytest
+import pytest_asyncio
+import websockets
+from aiohttp import web
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.signature import Signature
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+from src.api.rpc import RpcPool
+from src.api.transport import HttpTransport
+from src.bot import execution
+from src.bot.execution import PriorityFeeEstimator, TransactionSender, sign_transaction
+
+
+def unsigned_swap(payer: Keypair, lamports: int = 1) -> bytes:
+    """Unsigned v0 transaction as Jupiter returns it (stale blockhash, empty signature)."""
+    ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=lamports))
+    message = MessageV0.try_compile(payer.pubkey(), [ix], [], Hash.default())
+    return bytes(VersionedTransaction.populate(message, [Signature.default()]))
+
+
+class MockNode:
+    """JSON-RPC + signatureSubscribe node; a transaction lands on its n-th broadcast."""
+
+    def __init__(self) -> None:
+        self.height = 100
+        self.blockhash = str(Hash.new_unique())
+        self.land_after = 1
+        self.err = None
+        self.fees = []
+        self.broadcasts = {}
+        self.statuses = {}
+        self.subscriptions = {}
+        self.calls = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        method, params = body["method"], body["params"]
+        self.calls.append(method)
+        if method == "getLatestBlockhash":
+            result = {"context": {"slot": 1}, "value": {"blockhash": self.blockhash, "lastValidBlockHeight": 250}}
+        elif method == "getBlockHeight":
+            result = self.height
+        elif method == "getSlot":
+            result = 1000
+        elif method == "getRecentPrioritizationFees":
+            result = self.fees
+        elif method == "sendTransaction":
+            tx = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+            result = str(tx.signatures[0])
+            self.broadcasts[result] = self.broadcasts.get(result, 0) + 1
+            if self.broadcasts[result] >= self.land_after:
+                await self.land(result)
+        elif method == "getSignatureStatuses":
+            result = {"context": {"slot": 1}, "value": [self.statuses.get(s) for s in params[0]]}
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    async def land(self, signature: str) -> None:
+        self.statuses[signature] = {"slot": 1, "confirmations": 0, "err": self.err, "confirmationStatus": "confirmed"}
+        if signature in self.subscriptions:
+            await self.notify(signature)
+
+    async def notify(self, signature: str) -> None:
+        ws, subscription = self.subscriptions.pop(signature)
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "signatureNotification",
+            "params": {"subscription": subscription, "result": {"context": {"slot": 1}, "value": {"err": self.err}}},
+        }))
+
+    async def ws_handler(self, ws) -> None:
+        async for raw in ws:
+            msg = json.loads(raw)
+            signature = msg["params"][0]
+            subscription = len(self.subscriptions) + 1000 + msg["id"]
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": subscription}))
+            self.subscriptions[signature] = (ws, subscription)
+            if signature in self.statuses:
+                await self.notify(signature)
+
+
+@pytest_asyncio.fixture
+async def node():
+    node = MockNode()
+    app = web.Application()
+    app.router.add_post("/", node.handle)
+    runner = web.AppRunner(app, handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    ws_server = await websockets.serve(node.ws_handler, "127.0.0.1", 0)
+    node.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+    node.ws_url = f"ws://127.0.0.1:{ws_server.sockets[0].getsockname()[1]}"
+    transport = HttpTransport()
+    node.rpc = RpcPool([node.url], transport)
+    yield node
+    ws_server.close()
+    await ws_server.wait_closed()
+    await transport.close()
+    await runner.cleanup()
+
+
+def test_signing_restamps_the_blockhash():
+    payer = Keypair()
+    blockhash = Hash.new_unique()
+    signed, signature = sign_transaction(unsigned_swap(payer), payer, str(blockhash))
+    tx = VersionedTransaction.from_bytes(signed)
+    assert tx.message.recent_blockhash == blockhash
+    assert str(tx.signatures[0]) == signature and tx.verify_with_results() == [True]
+
+
+@pytest.mark.asyncio
+async def test_fee_estimate_is_a_clamped_percentile_of_recent_fees(node):
+    fees = PriorityFeeEstimator(node.rpc, q=50, window=4, min_fee=50, max_fee=10_000)
+    assert fees.estimate() == 50  # nothing sampled yet
+    node.fees = [{"slot": s, "prioritizationFee": f} for s, f in enumerate([0, 0, 100, 300, 500, 900])]
+    await fees.refresh()
+    assert sorted(fees.fees) == [2, 3, 4, 5]  # only the newest slots are kept
+    assert fees.estimate() == 500  # nearest-rank median of 100, 300, 500, 900
+    node.fees = [{"slot": s, "prioritizationFee": 90_000} for s in range(6, 10)]
+    await fees.refresh()
+    assert fees.estimate() == 10_000
+
+
+@pytest.mark.asyncio
+async def test_rebroadcasts_until_the_signature_notification(node, monkeypatch):
+    payer = Keypair()
+    node.land_after = 3
+    sender = TransactionSender(node.rpc, node.ws_url, rebroadcast_interval=0.05)
+    sender.tracker.poll_interval = 60  # confirmations must come over the socket
+    await sender.start()
+    while not sender.stats()["confirmations"]["connected"]:
+        await asyncio.sleep(0.01)
+
+    signer_threads = []
+    real_sign = sign_transaction
+
+    def recording_sign(*args):
+        signer_threads.append(threading.current_thread().name)
+        return real_sign(*args)
+
+    monkeypatch.setattr(execution, "sign_transaction", recording_sign)
+    try:
+        result = await sender.submit(unsigned_swap(payer), payer)
+    finally:
+        await sender.stop()
+
+    assert result.landed and result.broadcasts == 3 and result.time_to_land > 0
+    assert node.broadcasts == {result.signature: 3}
+    assert signer_threads[0].startswith("signer")
+    stats = sender.stats()
+    assert stats["landed"] == 1 and stats["confirmations"]["via_ws"] == 1
+    assert stats["time_to_land_ms"]["samples"] == 1 and not sender.tracker.pending
+    assert not sender.tracker._subscribing  # subscribe tasks are tracked and reaped
+
+
+@pytest.mark.asyncio
+async def test_gives_up_once_the_blockhash_expires(node):
+    payer = Keypair()
+    node.land_after = 10**6
+    sender = TransactionSender(node.rpc, rebroadcast_interval=0.05, blockhash_interval=0.02)
+    await sender.start()
+    task = asyncio.create_task(sender.submit(unsigned_swap(payer), payer))
+    await asyncio.sleep(0.15)
+    node.height = 251  # past lastValidBlockHeight
+    result = await asyncio.wait_for(task, 2)
+    await sender.stop()
+    assert not result.landed and result.error == "blockhash expired"
+    assert result.broadcasts >= 2 and sender.expired == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_are_confirmed_by_batched_polls(node):
+    payer = Keypair()
+    sender = TransactionSender(node.rpc, rebroadcast_interval=0.5)
+    sender.tracker.poll_interval = 0.05
+    await sender.start()
+    results = await asyncio.gather(*(
+        sender.submit(unsigned_swap(payer, lamports), payer) for lamports in range(1, 9)
+    ))
+    node.err = {"InstructionError": [0, "Custom"]}
+    failed = await sender.submit(unsigned_swap(payer, 99), payer)
+    await sender.stop()
+
+    assert all(r.landed for r in results) and len({r.signature for r in results}) == 8
+    assert node.calls.count("getSignatureStatuses") < 8  # one poll covers every pending signature
+    assert not failed.landed and failed.error == node.err and sender.failed == 1
+    assert sender.stats()["confirmations"]["via_poll"] == 9
+
+
+class StalledRpc:
+    """Serves one blockhash, then every call fails as in an RPC outage."""
+
+    def __init__(self) -> None:
+        self.down = False
+
+    async def get_latest_blockhash(self, commitment="confirmed"):
+        if self.down:
+            raise ConnectionError("rpc down")
+        return {"blockhash": str(Hash.new_unique()), "lastValidBlockHeight": 250}
+
+    async def get_block_height(self, commitment="confirmed"):
+        if self.down:
+            raise ConnectionError("rpc down")
+        self.down = True  # the outage starts right after the first refresh
+        return 100
+
+    async def fail(self, *args, **kwargs):
+        raise ConnectionError("rpc down")
+
+    send_transaction = get_signature_statuses = get_recent_prioritization_fees = fail
+
+
+@pytest.mark.asyncio
+async def test_gives_up_on_the_clock_when_block_height_stops_moving():
+    payer = Keypair()
+    sender = TransactionSender(StalledRpc(), rebroadcast_interval=0.05, blockhash_interval=0.02, max_pending=0.3)
+    sender.tracker.poll_interval = 0.02
+    await sender.start()
+    while sender.blockhash.blockhash is None:  # the last refresh before the outage
+        await asyncio.sleep(0.01)
+    result = await asyncio.wait_for(sender.submit(unsigned_swap(payer), payer), 2)
+    await sender.stop()
+    assert sender.blockhash.block_height == 100 and sender.blockhash.errors > 0
+    assert not result.landed and result.error == "blockhash expired" and sender.expired == 1
+    assert not sender.tracker.pending
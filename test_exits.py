@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+import src.bot.trading as trading
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import Position, TradingEngine
+
+
+def engine_with_crashed_positions(n: int) -> TradingEngine:
+    engine = TradingEngine(FeedAggregator())
+    for i in range(n):
+        token = TokenData(address=f"m{i}", symbol=f"M{i}", price=0.5, decimals=6)
+        position = Position(token, 10.0, 10.0)
+        position.entry_price = 1.0
+        engine.positions[token.address] = position
+    return engine
+
+
+@pytest.fixture
+def slow_quotes(monkeypatch):
+    calls = []
+
+    async def fake_quote(input_mint, output_mint, amount, transport=None):
+        calls.append(input_mint)
+        await asyncio.sleep(0.1)
+        return {"outAmount": str(5_000_000)}
+
+    monkeypatch.setattr(trading, "jup_quote", fake_quote)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_stop_losses_exit_concurrently(slow_quotes):
+    engine = engine_with_crashed_positions(5)
+    start = time.monotonic()
+    await engine._check_exit_conditions()
+    elapsed = time.monotonic() - start
+
+    assert not engine.positions
+    assert sorted(slow_quotes) == [f"m{i}" for i in range(5)]
+    assert elapsed < 0.3  # one quote round trip, not five
+    latency = engine.get_stats()["exit_signal_to_quote_ms"]
+    assert latency["samples"] == 5
+    assert latency["p99"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_parallel_exit_limit(slow_quotes):
+    engine = engine_with_crashed_positions(4)
+    engine._exit_slots = asyncio.Semaphore(2)
+    start = time.monotonic()
+    await engine._check_exit_conditions()
+    assert time.monotonic() - start >= 0.2
+    assert not engine.positions
+
+
+@pytest.mark.asyncio
+async def test_close_is_issued_once(slow_quotes):
+    engine = engine_with_crashed_positions(1)
+    await asyncio.gather(
+        engine._close_position("m0"),
+        engine._close_position("m0"),
+        engine._check_exit_conditions(),
+    )
+    assert slow_quotes == ["m0"]
+    assert engine.total_realized_pnl == pytest.approx(-5.0)
+    assert not engine._exit_locks and not engine._exit_signals
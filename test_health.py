@@ -0,0 +1,214 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+import src.bot.trading as trading
+from src.bot import feeds as feeds_module
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.health import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ProviderHealth
+from src.bot.prices import PriceChain, StreamPrices
+from src.bot.trading import Position, TradingEngine
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def rate_limited(retry_after: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.dexscreener.com/latest")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return httpx.HTTPStatusError("429", request=request, response=response)
+
+
+def test_breaker_opens_then_probes_with_growing_backoff():
+    clock = Clock()
+    breaker = CircuitBreaker("dex", failure_threshold=3, reset_timeout=5, max_reset_timeout=12, clock=clock)
+    for _ in range(2):
+        breaker.record_failure(RuntimeError("down"))
+    assert breaker.state == CLOSED
+    breaker.record_failure(RuntimeError("down"))
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() and not breaker.allow()  # a single probe
+    breaker.record_failure(RuntimeError("still down"))
+    assert breaker.state == OPEN and breaker.open_for == 10
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure(RuntimeError("still down"))
+    assert breaker.open_for == 12  # capped
+
+    clock.now += 12
+    assert breaker.allow()
+    breaker.record_success(0.05)
+    assert breaker.state == CLOSED and breaker.open_for == 5
+    assert breaker.stats()["opened"] == 1 and breaker.stats()["rejected"] == 2
+
+
+def test_rate_limit_opens_for_retry_after():
+    clock = Clock()
+    breaker = CircuitBreaker("dex", reset_timeout=1, clock=clock)
+    breaker.record_failure(rate_limited("30"))
+    assert breaker.state == OPEN and breaker.stats()["retry_in"] == 30
+
+
+def source(values, calls, name, delay=0.0, error=None):
+    async def fetch(addresses):
+        calls.append((name, list(addresses)))
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return {a: v for a, v in values.items() if a in addresses}
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_back_in_order_and_skips_open_breakers():
+    health = ProviderHealth(failure_threshold=2)
+    stream = StreamPrices(max_age=2.0)
+    stream.push("a", 1.0)
+    calls = []
+    chain = PriceChain(health)
+    chain.add("stream", stream.fetch, guarded=False)
+    chain.add("dexscreener", source({}, calls, "dexscreener", error=RuntimeError("500")))
+    chain.add("moralis", source({"b": 2.0}, calls, "moralis"))
+    chain.add("jupiter", source({"b": 9.0, "c": 3.0}, calls, "jupiter"))
+
+    lookup = await chain.fetch(["a", "b", "c", "d"])
+    assert lookup.found == {"stream": {"a": 1.0}, "moralis": {"b": 2.0}, "jupiter": {"c": 3.0}}
+    assert list(lookup.errors) == ["dexscreener"] and lookup.missing == ["d"]
+    assert calls == [
+        ("dexscreener", ["b", "c", "d"]), ("moralis", ["b", "c", "d"]), ("jupiter", ["c", "d"])
+    ]
+
+    await chain.fetch(["b"])  # second failure opens the breaker
+    calls.clear()
+    lookup = await chain.fetch(["b"])
+    assert lookup.found == {"moralis": {"b": 2.0}} and calls == [("moralis", ["b"])]
+    assert chain.stats()["dexscreener"]["skipped"] == 1
+    assert health.stats()["dexscreener"]["state"] == OPEN
+
+
+@pytest.mark.asyncio
+async def test_slow_provider_times_out_and_falls_back():
+    calls = []
+    chain = PriceChain(ProviderHealth(), timeout=0.05)
+    chain.add("dexscreener", source({"a": 1.0}, calls, "dexscreener", delay=1.0))
+    chain.add("jupiter", source({"a": 2.0}, calls, "jupiter"))
+    started = asyncio.get_running_loop().time()
+    lookup = await chain.fetch(["a"])
+    assert lookup.found == {"jupiter": {"a": 2.0}}
+    assert isinstance(lookup.errors["dexscreener"], asyncio.TimeoutError)
+    assert asyncio.get_running_loop().time() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_fallback_budget_is_never_awaited():
+    calls = []
+    chain = PriceChain(ProviderHealth())
+    budget = feeds_module.TokenBucket(rate=0.001, burst=1)
+    chain.add("jupiter", source({"a": 2.0}, calls, "jupiter"), budget=budget)
+    assert (await chain.fetch(["a"])).found == {"jupiter": {"a": 2.0}}
+    lookup = await chain.fetch(["a"])
+    assert lookup.missing == ["a"] and len(calls) == 1
+
+
+@pytest_asyncio.fixture
+async def degraded_dex():
+    calls = {"dex": 0, "jupiter": []}
+
+    async def tokens(request: web.Request) -> web.Response:
+        calls["dex"] += 1
+        return web.json_response({"error": "overloaded"}, status=503)
+
+    async def prices(request: web.Request) -> web.Response:
+        ids = request.query["ids"].split(",")
+        calls["jupiter"].append(ids)
+        return web.json_response({"data": {i: {"id": i, "price": "0.5"} for i in ids}})
+
+    app = web.Application()
+    app.router.add_get("/latest/dex/tokens/{addresses}", tokens)
+    app.router.add_get("/price/v2", prices)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", calls
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_held_mints_are_priced_while_dexscreener_is_down(degraded_dex, monkeypatch):
+    base, calls = degraded_dex
+
+    async def fake_quote(input_mint, output_mint, amount, transport=None):
+        return {"outAmount": str(4_000_000)}
+
+    monkeypatch.setattr(trading, "jup_quote", fake_quote)
+    feeds = FeedAggregator()
+    feeds.jupiter.BASE_URL = f"{base}/price/v2"
+    engine = TradingEngine(feeds)
+    engine.monitor.dex.BASE_URL = f"{base}/latest"
+    token = TokenData(address="held", symbol="HELD", price=1.0, decimals=6)
+    feeds.tokens["held"] = token
+    engine.positions["held"] = Position(token, 10.0, 10.0)
+
+    assert await engine.monitor.poll() == {"held"}
+    assert token.price == 0.5 and calls["dex"] == 1 and calls["jupiter"] == [["held"]]
+    await asyncio.gather(*engine.monitor._checks)
+    assert "held" not in engine.positions  # the stop-loss still fired
+    assert engine.monitor.stats()["sources"] == {"jupiter": 1}
+    assert feeds.get_stats()["providers"]["dexscreener"]["failures"] == 1
+    await feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_loop_keeps_its_cadence_after_errors(monkeypatch):
+    feeds = FeedAggregator()
+    ticks, sleeps = [], []
+    real_sleep = asyncio.sleep
+
+    async def failing_tick():
+        ticks.append(1)
+        raise RuntimeError("boom")
+
+    async def fake_sleep(seconds, *args):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            feeds.running = False
+        await real_sleep(0)
+
+    monkeypatch.setattr(feeds, "_fetch_feeds", failing_tick)
+    monkeypatch.setattr(feeds_module.asyncio, "sleep", fake_sleep)
+    feeds.running = True
+    await feeds._fetch_loop()
+    assert len(ticks) == 2 and sleeps == [5, 5]
+    await feeds.transport.close()
+
+
+def test_position_lane_has_its_own_fallback_quota(monkeypatch):
+    monkeypatch.setenv("MORALIS_KEY", "test")
+    monkeypatch.setattr(trading.settings, "moralis_rps", 5.0)
+    monkeypatch.setattr(trading.settings, "position_moralis_rps", 1.0)
+    monkeypatch.setattr(trading.settings, "jupiter_price_rps", 1.0)
+    monkeypatch.setattr(trading.settings, "position_jupiter_rps", 0.5)
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    shared = {s.name: s.budget for s in feeds.prices.sources}
+    held = {s.name: s.budget for s in engine.monitor.prices.sources}
+
+    assert shared["moralis"] is feeds.scheduler.limiters["moralis"].bucket
+    assert held["moralis"] is not shared["moralis"] and held["jupiter"] is not shared["jupiter"]
+    assert feeds.scheduler.limiters["moralis"].rate == 4.0 and held["moralis"].rate == 1.0
+    assert shared["jupiter"].rate == 0.5 and held["jupiter"].rate == 0.5
@@ -0,0 +1,133 @@
+import math
+import random
+
+import pytest
+
+from src.bot.feeds import TokenData
+from src.bot import history as history_module
+from src.bot.history import PriceHistory
+from src.bot.risk import RiskManager
+
+
+def brute_force(samples, span):
+    last_ts = samples[-1][0]
+    window = [s for s in samples if s[0] >= last_ts - span]
+    before = [s for s in samples if s[0] < last_ts - span]
+    prices = [p for _, p, _ in window]
+    volumes = [v for _, _, v in window]
+    anchor = before[-1][1] if before else prices[0]
+    ret = (prices[-1] / anchor - 1) * 100
+    vwap = sum(p * v for p, v in zip(prices, volumes)) / sum(volumes)
+    logs = [math.log(b / a) for a, b in zip(prices, prices[1:])]
+    vol = 0.0
+    if len(logs) > 1:
+        mean = sum(logs) / len(logs)
+        vol = math.sqrt(sum(r * r for r in logs) / len(logs) - mean * mean) * 100
+    return ret, vwap, vol
+
+
+@pytest.mark.parametrize("capacity", [64, 4096])
+def test_rolling_stats_match_brute_force(capacity):
+    rng = random.Random(11)
+    history = PriceHistory(capacity=capacity)
+    samples = []
+    ts, price = 1000.0, 1.0
+    for _ in range(2000):
+        ts += rng.uniform(0.1, 3.0)
+        price *= math.exp(rng.gauss(0, 0.01))
+        volume = rng.uniform(1, 100)
+        history.record(price, volume, ts)
+        samples.append((ts, price, volume))
+
+    kept = samples[-capacity:]
+    for span in (10.0, 30.0, 60.0, 300.0):
+        ret, vwap, vol = brute_force(kept, span)
+        assert history.return_pct(span) == pytest.approx(ret, rel=1e-6, abs=1e-9)
+        assert history.vwap(span) == pytest.approx(vwap, rel=1e-6)
+        assert history.volatility(span) == pytest.approx(vol, rel=1e-4, abs=1e-6)
+    assert history.last_price == price
+    assert len(history) == min(capacity, 2000)
+
+
+def test_momentum_prefers_local_ticks_when_covered():
+    token = TokenData(address="x", price_change_5m=1.0)
+    assert token.momentum_5m == 1.0
+    token.history = PriceHistory()
+    token.history.record(1.0, ts=0)
+    token.history.record(1.2, ts=301)
+    assert token.momentum_5m == pytest.approx(20.0)
+
+
+def test_stop_loss_reacts_to_tick_crash():
+    risk = RiskManager(stop_loss_percent=15.0, fast_drop_percent=10.0)
+    history = PriceHistory()
+    history.record(1.0, ts=100)
+    history.record(0.88, ts=105)
+    # Only -12% from entry: the fixed stop would not fire yet
+    assert not risk.stop_loss_triggered(1.0, 0.88)
+    assert risk.stop_loss_triggered(1.0, 0.88, history)
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_token_history_stays_small(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(history_module, "time", clock)
+    token = TokenData(address="x")
+    for i in range(1000):
+        clock.now += 5.0
+        token.observe(1.0 + i / 1000)
+    assert len(token.history) == 64
+    assert token.history.nbytes() < 4 * 64 * 8 * 1.2  # four float arrays, little slack
+
+
+def test_held_token_cadence_still_spans_five_minutes(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(history_module, "time", clock)
+    token = TokenData(address="held")
+    prices = {}
+    for i in range(1200):  # ten minutes of position-monitor ticks
+        clock.now += 0.5
+        prices[clock.now] = 1.0 + i / 1000
+        token.observe(prices[clock.now], volume=1.0)
+
+    history = token.history
+    assert len(history) == 64 and history.covers(300)
+    assert history.last_price == prices[clock.now]
+    # The 5m anchor is at most one merged sample (300s / 64) older than 5m ago
+    anchor = history.last_price / (1 + history.return_pct(300) / 100)
+    ago = clock.now - min(prices, key=lambda t: abs(prices[t] - anchor))
+    assert 300 <= ago <= 300 + 300 / 64 + 0.5
+    assert token.momentum_5m == pytest.approx(history.return_pct(300))
+    # Merged samples keep the full 1m window: VWAP sits inside its price range
+    assert prices[clock.now - 60] < history.vwap(60) < history.last_price
+    assert history.volatility(60) > 0
+
+
+def test_merged_samples_match_brute_force():
+    rng = random.Random(5)
+    history = PriceHistory(capacity=64, resolution=2.0)
+    merged = []  # [opened_at, ts, price, volume]
+    ts, price = 1000.0, 1.0
+    for _ in range(3000):
+        ts += rng.uniform(0.05, 1.5)
+        price *= math.exp(rng.gauss(0, 0.01))
+        volume = rng.uniform(1, 100)
+        history.record(price, volume, ts)
+        if merged and ts - merged[-1][0] < 2.0:
+            merged[-1][1:] = [ts, price, merged[-1][3] + volume]
+        else:
+            merged.append([ts, ts, price, volume])
+
+    kept = [(t, p, v) for _, t, p, v in merged[-64:]]
+    for span in (10.0, 30.0, 60.0):
+        ret, vwap, vol = brute_force(kept, span)
+        assert history.return_pct(span) == pytest.approx(ret, rel=1e-6, abs=1e-9)
+        assert history.vwap(span) == pytest.approx(vwap, rel=1e-6)
+        assert history.volatility(span) == pytest.approx(vol, rel=1e-4, abs=1e-6)
@@ -0,0 +1,93 @@
+import sqlite3
+import time
+from contextlib import closing
+
+import pytest
+
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.journal import Journal, token_row
+from src.bot.trading import Position, TradingEngine
+
+
+def make_engine(path):
+    feeds = FeedAggregator()
+    feeds.journal = Journal(str(path), flush_interval=0.05)
+    return feeds, TradingEngine(feeds)
+
+
+def test_writes_are_grouped_into_few_commits(tmp_path):
+    journal = Journal(str(tmp_path / "bot.db"), flush_interval=0.2)
+    for i in range(500):
+        journal.save_tokens([TokenData(address=f"mint{i}", price=float(i))])
+    journal.remove_tokens(["mint0"])
+    assert journal.flush(5)
+    assert journal.stats()["rows"] == 501 and journal.stats()["commits"] <= 3
+    journal.close()
+
+    tokens = Journal(str(tmp_path / "bot.db")).load().tokens
+    assert len(tokens) == 499 and tokens["mint7"].price == 7.0
+
+
+@pytest.mark.asyncio
+async def test_warm_restart_restores_positions_pnl_and_universe(tmp_path):
+    path = tmp_path / "bot.db"
+    feeds, engine = make_engine(path)
+    for i in range(3):
+        token = TokenData(address=f"mint{i}", symbol=f"M{i}", price=1.0 + i, score=50 + i)
+        feeds.tokens[token.address] = token
+    feeds.journal.save_tokens(feeds.tokens.values())
+    for address in ("mint1", "mint2"):
+        position = Position(feeds.tokens[address], 10.0, 5.0)
+        engine.positions[address] = position
+        feeds.journal.position_opened(position)
+    engine.total_invested = 20.0
+    engine._journal_totals()
+
+    # Closing through the engine journals the exit and the realised PnL
+    amount = engine.exit_amount(engine.positions["mint2"])
+    engine.exit_quotes.put("mint2", engine.USDC_MINT, amount, {"outAmount": "25000000"})
+    await engine._do_close("mint2", time.monotonic())
+    assert engine.total_realized_pnl == 15.0
+    await feeds.stop()  # flushes and closes the journal
+
+    feeds, engine = make_engine(path)
+    started = time.perf_counter()
+    feeds.restore(feeds.journal.load().tokens)
+    engine.restore(feeds.journal.load(tokens=False))
+    assert time.perf_counter() - started < 0.5
+    assert set(feeds.tokens) == {"mint0", "mint1", "mint2"}
+    assert [t.address for t in feeds.get_top_tokens(3)][0] == "mint2"
+    assert list(engine.positions) == ["mint1"] and "mint1" in feeds.pinned
+    position = engine.positions["mint1"]
+    assert position.token is feeds.tokens["mint1"] and position.amount_out == 5.0
+    assert engine.total_invested == 20.0 and engine.total_realized_pnl == 15.0
+    assert engine.snapshot["positions"][0]["address"] == "mint1"
+    await feeds.stop()
+
+
+def test_position_wallet_round_trips_and_old_databases_migrate(tmp_path):
+    path = tmp_path / "bot.db"
+    with closing(sqlite3.connect(path)) as conn:  # schema before the wallet column
+        conn.execute(
+            "CREATE TABLE positions (address TEXT PRIMARY KEY, token TEXT NOT NULL,"
+            " amount_in REAL NOT NULL, amount_out REAL NOT NULL, entry_price REAL NOT NULL,"
+            " entry_time TEXT NOT NULL, tx_signature TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO positions VALUES ('old', ?, 10.0, 5.0, 1.0, '2024-01-01T00:00:00', 'sig0')",
+            (token_row(TokenData(address="old", price=1.0)),),
+        )
+        conn.commit()
+
+    feeds, engine = make_engine(path)
+    position = Position(TokenData(address="new", price=2.0), 10.0, 5.0)
+    position.tx_signature, position.wallet = "sig1", "Wallet2"
+    feeds.journal.position_opened(position)
+    assert feeds.journal.flush(5)
+    feeds.journal.close()
+
+    feeds, engine = make_engine(path)
+    engine.restore(feeds.journal.load(tokens=False))
+    assert engine.positions["new"].wallet == "Wallet2"
+    assert engine.positions["old"].wallet is None and engine.positions["old"].tx_signature == "sig0"
+    feeds.journal.close()
@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from fastapi.testclient import TestClient
+
+from src.api.main import create_app
+
+from src.api.metrics import (
+    LoopLagMonitor,
+    MetricsRegistry,
+    MetricsServer,
+    metrics,
+    provider_name,
+)
+from src.api.rpc import RpcPool
+from src.api.transport import HttpTransport
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    registry = MetricsRegistry()
+    for name in ("provider_latency", "feed_tick", "strategy_cycle", "loop_lag",
+                 "errors", "rate_limited", "timeouts", "cache_requests", "enabled", "last_scrape"):
+        monkeypatch.setattr(metrics, name, getattr(registry, name))
+    return metrics
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    async def ok(request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def limited(request: web.Request) -> web.Response:
+        return web.json_response({}, status=429)
+
+    async def slow(request: web.Request) -> web.Response:
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def rpc(request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": 42})
+
+    app_ = web.Application()
+    app_.router.add_get("/ok", ok)
+    app_.router.add_get("/limited", limited)
+    app_.router.add_get("/slow", slow)
+    app_.router.add_post("/rpc", rpc)
+    runner = web.AppRunner(app_, handler_cancellation=True)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+def test_provider_names():
+    assert provider_name("https://api.dexscreener.com/latest/dex/tokens/a,b") == "dexscreener"
+    assert provider_name("https://solana-gateway.moralis.io/token/mainnet/prices") == "moralis"
+    assert provider_name("https://api.helius.xyz/v0/token-metadata") == "helius"
+    assert provider_name("https://mainnet.helius-rpc.com/?api-key=x") == "rpc"
+    assert provider_name("https://quote-api.jup.ag/v6/quote") == "jupiter_quote"
+    assert provider_name("https://quote-api.jup.ag/v6/swap") == "jupiter_swap"
+
+
+@pytest.mark.asyncio
+async def test_nothing_recorded_until_scraped(fresh_metrics, local_server):
+    async with HttpTransport() as transport:
+        await transport.get(f"{local_server}/ok")
+        assert not fresh_metrics.provider_latency.series
+
+        fresh_metrics.render()
+        await transport.get(f"{local_server}/ok")
+        await transport.get(f"{local_server}/limited")
+        with pytest.raises(httpx.TimeoutException):
+            await transport.get(f"{local_server}/slow", timeout=0.05)
+
+    text = fresh_metrics.render()
+    label = '{provider="127.0.0.1"}'
+    assert f"provider_request_seconds_count{label} 3" in text
+    assert f"provider_rate_limited_total{label} 1" in text
+    assert f"provider_timeouts_total{label} 1" in text
+    assert f"provider_errors_total{label} 2" in text
+    assert 'provider_request_seconds_bucket{provider="127.0.0.1",le="+Inf"} 3' in text
+
+
+@pytest.mark.asyncio
+async def test_recording_turns_off_when_idle(fresh_metrics):
+    fresh_metrics.render()
+    fresh_metrics.idle_after = 0.0
+    monitor = LoopLagMonitor(fresh_metrics, interval=0.01)
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    assert not fresh_metrics.enabled
+
+
+def test_metrics_endpoint(fresh_metrics):
+    fresh_metrics.feed_tick.observe(0.2)  # recorded directly, regardless of state
+    with TestClient(create_app(start_bot=False)) as client:
+        resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "# TYPE feed_tick_seconds histogram" in resp.text
+    assert 'feed_tick_seconds_bucket{le="0.25"} 1' in resp.text
+    assert fresh_metrics.enabled
+
+
+@pytest.mark.asyncio
+async def test_rpc_calls_are_recorded(fresh_metrics, local_server):
+    async with HttpTransport() as transport:
+        pool = RpcPool([f"{local_server}/rpc"], transport)
+        fresh_metrics.render()
+        assert await pool.get_slot() == 42
+    assert 'provider_request_seconds_count{provider="127.0.0.1"} 1' in fresh_metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_standalone_metrics_server(fresh_metrics):
+    server = MetricsServer(fresh_metrics, host="127.0.0.1", port=0)
+    await server.start()
+    try:
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(f"http://127.0.0.1:{server.port}/metrics")
+    finally:
+        await server.stop()
+    assert resp.status_code == 200
+    assert "# TYPE provider_request_seconds histogram" in resp.text
+    assert fresh_metrics.enabled
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+import src.bot.trading as trading
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.scheduler import TokenBucket
+from src.bot.trading import Position, TradingEngine
+
+
+@pytest_asyncio.fixture
+async def dex_server():
+    prices = {"held": 1.0}
+    calls = []
+
+    async def tokens(request: web.Request) -> web.Response:
+        addresses = request.match_info["addresses"].split(",")
+        calls.append(addresses)
+        pairs = [
+            {
+                "chainId": "solana",
+                "baseToken": {"address": a, "symbol": a.upper()},
+                "priceUsd": str(prices.get(a, 1.0)),
+                "liquidity": {"usd": 30000},
+            }
+            for a in addresses
+        ]
+        return web.json_response({"pairs": pairs})
+
+    app = web.Application()
+    app.router.add_get("/latest/dex/tokens/{addresses}", tokens)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/latest", prices, calls
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def engine(dex_server, monkeypatch):
+    base, _, _ = dex_server
+
+    async def fake_quote(input_mint, output_mint, amount, transport=None):
+        return {"outAmount": str(5_000_000)}
+
+    monkeypatch.setattr(trading, "jup_quote", fake_quote)
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    engine.monitor.dex.BASE_URL = base
+    token = TokenData(address="held", symbol="HELD", price=1.0, decimals=6)
+    feeds.tokens["held"] = token
+    engine.positions["held"] = Position(token, 10.0, 10.0)
+    yield engine
+    await engine.monitor.stop()
+    await feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_poll_updates_price_and_triggers_stop_loss(engine, dex_server):
+    _, prices, calls = dex_server
+    assert await engine.monitor.poll() == {"held"}
+    assert engine.positions["held"].token.price == 1.0
+
+    prices["held"] = 0.5
+    await engine.monitor.poll()
+    await asyncio.gather(*engine.monitor._checks)
+    assert "held" not in engine.positions
+    assert calls == [["held"], ["held"]]  # only held mints on this lane
+    assert engine.get_stats()["position_monitor"]["updates"] == 2
+
+
+@pytest.mark.asyncio
+async def test_discovery_cannot_starve_the_position_lane(engine, dex_server):
+    # Drain the discovery share; the reserved lane still gets through
+    discovery = engine.feeds.dex.limiter
+    discovery.pause(60)
+    assert not discovery.try_acquire()
+    engine.monitor.interval = 0.05
+    await engine.monitor.start()
+    await asyncio.sleep(0.3)
+    assert engine.monitor.polls >= 2
+    assert engine.monitor.errors == 0
+    assert isinstance(engine.monitor.dex.limiter, TokenBucket)
+    assert engine.monitor.dex.limiter is not discovery
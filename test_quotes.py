@@ -0,0 +1,59 @@
+import pytest
+
+import src.bot.trading as trading
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.quotes import QuoteCache, amount_bucket
+from src.bot.trading import Position, TradingEngine
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_amount_bucket_groups_close_amounts():
+    assert amount_bucket(1_000_000) == amount_bucket(1_004_000)
+    assert amount_bucket(1_000_000) != amount_bucket(1_100_000)
+
+
+def test_quote_cache_ttl_and_hit_rate():
+    clock = FakeClock()
+    cache = QuoteCache(ttl=2.0, clock=clock)
+    assert cache.get("a", "usdc", 100) is None
+    cache.put("a", "usdc", 100, {"outAmount": "5"})
+    clock.now = 1.5
+    assert cache.get("a", "usdc", 100) == {"outAmount": "5"}
+    clock.now = 3.0
+    assert cache.get("a", "usdc", 100) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["avg_served_age_ms"] == pytest.approx(1500)
+
+
+@pytest.mark.asyncio
+async def test_close_uses_warm_quote(monkeypatch):
+    calls = []
+
+    async def fake_quote(input_mint, output_mint, amount, transport=None):
+        calls.append(input_mint)
+        return {"outAmount": str(12_000_000)}
+
+    monkeypatch.setattr(trading, "jup_quote", fake_quote)
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    token = TokenData(address="mint", symbol="M", price=1.0, decimals=6)
+    engine.positions["mint"] = Position(token, 10.0, 10.0)
+
+    await engine.prefetcher.refresh()
+    assert calls == ["mint"]
+    await engine._close_position("mint")
+
+    assert calls == ["mint"]  # no live quote on the exit path
+    assert engine.total_realized_pnl == pytest.approx(2.0)
+    assert engine.get_stats()["exit_quotes"]["hits"] == 1
+    assert not engine.exit_quotes.entries
+    await feeds.transport.close()
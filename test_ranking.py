@@ -0,0 +1,42 @@
+import random
+
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.ranking import RankedIndex
+
+
+def test_ranked_index_updates_and_filters():
+    index = RankedIndex()
+    for address, score in [("a", 10), ("b", 50), ("c", 30), ("d", 70)]:
+        index.update(address, score)
+    assert index.top(2) == ["d", "b"]
+    index.update("a", 90)
+    index.remove("d")
+    assert index.top(10) == ["a", "b", "c"]
+    assert index.top(10, where=lambda a: a != "b") == ["a", "c"]
+    assert index.top(10, min_score=40) == ["a", "b"]
+    assert len(index) == 3 and "d" not in index
+
+
+def test_get_top_tokens_matches_full_sort():
+    rng = random.Random(3)
+    feeds = FeedAggregator()
+    for i in range(500):
+        feeds.tokens[f"m{i}"] = TokenData(
+            address=f"m{i}",
+            volume_5m=rng.uniform(0, 200000),
+            price_change_5m=rng.uniform(-10, 30),
+            liquidity=rng.uniform(0, 100000),
+        )
+    feeds._score_tokens()
+
+    expected = sorted(feeds.tokens.values(), key=lambda t: t.score, reverse=True)[:10]
+    top = feeds.get_top_tokens(10)
+    assert [t.score for t in top] == [t.score for t in expected]
+
+    rich = feeds.get_top_tokens(5, min_liquidity=80000, min_score=60)
+    assert all(t.liquidity > 80000 and t.score >= 60 for t in rich)
+    expected_rich = [
+        t for t in sorted(feeds.tokens.values(), key=lambda t: t.score, reverse=True)
+        if t.liquidity > 80000 and t.score >= 60
+    ][:5]
+    assert [t.score for t in rich] == [t.score for t in expected_rich]
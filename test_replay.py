@@ -0,0 +1,139 @@
+import gzip
+
+import httpx
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api.recording import REDACTED, ReplayTransport, ResponseRecorder, read_log
+from src.api.transport import HttpTransport
+from src.bot.replay import Replayer, VirtualClock
+
+SEARCH = "https://api.dexscreener.com/latest/dex/search"
+QUOTE = "https://quote-api.jup.ag/v6/quote"
+
+
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def search_entry(t: float, price: float, change: float) -> dict:
+    pair = {
+        "chainId": "solana",
+        "baseToken": {"address": "pump", "symbol": "PUMP"},
+        "priceUsd": str(price),
+        "volume": {"m5": 200000, "h24": 900000},
+        "liquidity": {"usd": 60000},
+        "priceChange": {"m5": change},
+    }
+    return {
+        "t": t, "method": "GET", "url": SEARCH, "params": {"q": "solana"}, "json": None,
+        "status": 200, "content_type": "application/json",
+        "body": '{"pairs": [%s]}' % __import__("json").dumps(pair),
+    }
+
+
+def quote_entry(t: float, input_mint: str, output_mint: str, out_amount: int) -> dict:
+    params = {"inputMint": input_mint, "outputMint": output_mint, "amount": 1, "slippageBps": 100}
+    return {
+        "t": t, "method": "GET", "url": QUOTE, "params": params, "json": None,
+        "status": 200, "content_type": "application/json",
+        "body": '{"outAmount": "%d"}' % out_amount,
+    }
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    async def search(request: web.Request) -> web.Response:
+        return web.json_response({"pairs": [], "q": request.query["q"]})
+
+    app = web.Application()
+    app.router.add_get("/latest/dex/search", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_recorder_round_trip(local_server, tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    transport = HttpTransport()
+    transport.recorder = ResponseRecorder(path, clock=lambda: 100.0)
+    await transport.get(f"{local_server}/latest/dex/search", params={"q": "solana"})
+    await transport.close()
+    transport.recorder.close()
+
+    entries = list(read_log(path))
+    assert len(entries) == 1 and entries[0]["t"] == 100.0
+
+    clock = VirtualClock(99.0)
+    replay = ReplayTransport(entries, clock)
+    url = f"{local_server}/latest/dex/search"
+    assert (await replay.get(url, params={"q": "solana"})).status_code == 404
+    clock.now = 100.0
+    resp = await replay.get(url, params={"q": "solana"})
+    assert resp.json() == {"pairs": [], "q": "solana"}
+    assert replay.served == 1 and replay.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_is_deterministic():
+    t0 = 1_700_000_000.0
+    entries = [
+        search_entry(t0, 1.0, 20),
+        quote_entry(t0, USDC, "pump", 5_000_000_000),  # 5 USDC -> 5 PUMP
+        search_entry(t0 + 5, 0.5, -40),  # dump: stop loss on the next tick
+        quote_entry(t0 + 5, "pump", USDC, 2_500_000),
+        search_entry(t0 + 10, 0.5, -40),
+    ]
+
+    results = [await Replayer(entries, tick=5.0).run() for _ in range(2)]
+    first, second = results
+    assert first.ticks == 3
+    assert [(t["side"], t["t"] - t0) for t in first.trades] == [("buy", 0.0), ("sell", 5.0)]
+    assert first.trades == second.trades
+    assert first.stats["realized_pnl"] == second.stats["realized_pnl"]
+    assert first.stats["realized_pnl"] == pytest.approx(-2.5)
+    assert first.misses > 0  # /dex/tokens refreshes were never recorded
+
+
+@pytest.mark.asyncio
+async def test_recorder_redacts_keys(local_server, tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    transport = HttpTransport()
+    transport.recorder = ResponseRecorder(path, clock=lambda: 100.0)
+    url = f"{local_server}/latest/dex/search"
+    await transport.get(f"{url}?api-key=secret1", params={"q": "solana", "api_key": "secret2"})
+    await transport.close()
+    transport.recorder.close()
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        raw = f.read()
+    assert "secret" not in raw and REDACTED in raw
+
+    # A different live key still finds the recording
+    replay = ReplayTransport(list(read_log(path)), VirtualClock(100.0))
+    resp = await replay.get(f"{url}?api-key=other", params={"q": "solana", "api_key": "x"})
+    assert resp.status_code == 200 and replay.misses == 0
+
+
+def test_read_log_stops_at_truncated_tail(tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    recorder = ResponseRecorder(path, flush_every=2)
+    for i in range(5):
+        recorder.record("GET", SEARCH, {"q": str(i)}, None, httpx.Response(200, json={}))
+    # Simulate a crash: the last record is buffered and the member never closed
+    with open(path, "rb") as f:
+        data = f.read()
+    crashed = tmp_path / "crashed.jsonl.gz"
+    crashed.write_bytes(data)
+    recorder.close()
+
+    entries = list(read_log(str(crashed)))
+    assert [e["params"]["q"] for e in entries] == ["0", "1", "2", "3"]
+
+    crashed.write_bytes(data[:-3])
+    assert len(list(read_log(str(crashed)))) <= 4
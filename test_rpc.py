@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api.rpc import RpcError, RpcPool
+from src.api.transport import HttpTransport
+
+
+class MockRpc:
+    """Local JSON-RPC node with injectable latency, slot and failures."""
+
+    def __init__(self, slot: int = 1000, delay: float = 0.0) -> None:
+        self.slot = slot
+        self.delay = delay
+        self.status = 200
+        self.error = None
+        self.calls = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.calls.append(body["method"])
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.json_response({"error": "unavailable"}, status=self.status)
+        if self.error is not None:
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"], "error": self.error})
+        results = {
+            "getSlot": self.slot,
+            "getBalance": {"context": {"slot": self.slot}, "value": 5_000_000},
+            "getLatestBlockhash": {
+                "context": {"slot": self.slot},
+                "value": {"blockhash": f"hash{self.slot}", "lastValidBlockHeight": self.slot + 150},
+            },
+        }
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": results[body["method"]]})
+
+
+@pytest_asyncio.fixture
+async def nodes():
+    runners, servers = [], []
+
+    async def make(**kwargs):
+        node = MockRpc(**kwargs)
+        app = web.Application()
+        app.router.add_post("/", node.handle)
+        runner = web.AppRunner(app, handler_cancellation=True)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        node.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+        servers.append(node)
+        return node
+
+    transport = HttpTransport()
+    yield make, transport
+    await transport.close()
+    for runner in runners:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_fastest_healthy_endpoint(nodes):
+    make, transport = nodes
+    slow, fast, lagging = await make(delay=0.15), await make(delay=0.0), await make(slot=900)
+    pool = RpcPool([slow.url, fast.url, lagging.url], transport)
+    await pool.probe()
+
+    assert [e.url for e in pool.ranked()] == [fast.url, slow.url, lagging.url]
+    assert not pool.healthy(pool.ranked()[-1])  # 100 slots behind
+    assert await pool.get_slot() == 1000
+    assert fast.calls == ["getSlot", "getSlot"] and slow.calls == ["getSlot"]
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_fails_over_and_drops_out(nodes):
+    make, transport = nodes
+    broken, backup = await make(), await make(delay=0.02)
+    pool = RpcPool([broken.url, backup.url], transport, failure_limit=2)
+    await pool.probe()
+    broken_endpoint, backup_endpoint = pool.endpoints
+    broken_endpoint.latency, backup_endpoint.latency = 0.001, 0.01
+    broken.status = 503
+
+    assert await pool.get_slot() == 1000
+    assert pool.failovers == 1
+    await pool.get_slot()
+    # Two consecutive failures: the broken node now ranks last and is skipped
+    assert pool.ranked()[0] is backup_endpoint and not pool.healthy(broken_endpoint)
+    await pool.get_slot()
+    assert broken.calls.count("getSlot") == 3
+
+
+@pytest.mark.asyncio
+async def test_hedged_calls_take_the_first_answer(nodes):
+    make, transport = nodes
+    first, second = await make(), await make()
+    pool = RpcPool([first.url, second.url], transport)
+    await pool.probe()
+    first.delay = 0.5  # became slow after ranking
+
+    started = time.perf_counter()
+    blockhash = await pool.get_latest_blockhash()
+    assert time.perf_counter() - started < 0.4
+    assert blockhash["blockhash"] == "hash1000"
+    assert "getLatestBlockhash" in first.calls and "getLatestBlockhash" in second.calls
+    assert pool.stats()["hedged"] == 1
+
+    # One hedge leg failing is invisible to the caller
+    first.delay, first.status = 0.0, 500
+    assert await pool.get_balance("wallet") == 5_000_000
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_retried(nodes):
+    make, transport = nodes
+    first, second = await make(), await make()
+    pool = RpcPool([first.url, second.url], transport)
+    first.error = second.error = {"code": -32602, "message": "Invalid params"}
+    with pytest.raises(RpcError) as raised:
+        await pool.get_slot()
+    assert raised.value.code == -32602
+    assert len(first.calls) + len(second.calls) == 1
+
+    # A node reporting itself unhealthy is skipped like a transport failure
+    first.error = {"code": -32005, "message": "Node is behind"}
+    second.error = None
+    pool.endpoints[0].latency, pool.endpoints[1].latency = 0.001, 0.01
+    assert await pool.get_slot() == 1000 and pool.failovers == 1
+
+
+@pytest.mark.asyncio
+async def test_background_probes_track_slot_lag(nodes):
+    make, transport = nodes
+    first, second = await make(), await make(delay=0.01)
+    pool = RpcPool([first.url, second.url], transport, probe_interval=0.02, max_slot_lag=5)
+    await pool.start()
+    first.slot = 980  # falls behind
+    second.slot = 1010
+    await asyncio.sleep(0.15)
+    await pool.stop()
+    assert pool.best_slot == 1010
+    assert pool.ranked()[0].url == second.url
+    stats = pool.stats()["endpoints"]
+    assert stats[1]["slot_lag"] == 30 and stats[1]["healthy"] is False
@@ -0,0 +1,198 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.bot.feeds import TokenData
+from src.bot.scheduler import EnrichmentScheduler, ProviderLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2.0, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire()
+
+
+def test_limiter_backs_off_on_429():
+    clock = FakeClock()
+    limiter = ProviderLimiter("moralis", rate=10.0, clock=clock)
+    limiter.record_throttled(retry_after=2.0)
+    assert limiter.current_rate == pytest.approx(5.0)
+    assert not limiter.bucket.try_acquire()
+    clock.now += 2.5
+    assert limiter.bucket.try_acquire()
+    limiter.record_success()
+    assert limiter.current_rate > 5.0
+
+
+def test_next_batch_prefers_stale_high_score_tokens():
+    clock = FakeClock()
+    tokens = {f"t{i}": TokenData(address=f"t{i}", score=i * 10) for i in range(5)}
+    scheduler = EnrichmentScheduler(lambda: tokens, clock=clock)
+
+    async def handler(batch):
+        pass
+
+    scheduler.register("helius", handler, rate=100, batch_size=2)
+    first = scheduler.next_batch("helius")
+    assert first == ["t4", "t3"]
+    # In-flight tokens are skipped until they complete
+    assert scheduler.next_batch("helius") == ["t2", "t1"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_covers_whole_universe():
+    tokens = {f"t{i}": TokenData(address=f"t{i}") for i in range(30)}
+    seen = []
+
+    async def handler(batch):
+        seen.extend(batch)
+
+    scheduler = EnrichmentScheduler(lambda: tokens)
+    scheduler.register("moralis", handler, rate=500, concurrency=8)
+    await scheduler.start()
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+
+    assert set(seen) == set(tokens)
+    stats = scheduler.stats()["moralis"]
+    assert stats["requests"] >= 30
+    assert stats["throttled"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_rate_limit():
+    tokens = {"a": TokenData(address="a")}
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(429, headers={"retry-after": "3"}, request=request)
+
+    async def handler(batch):
+        raise httpx.HTTPStatusError("429", request=request, response=response)
+
+    scheduler = EnrichmentScheduler(lambda: tokens)
+    limiter = scheduler.register("helius", handler, rate=4)
+    await scheduler.dispatch("helius", scheduler.next_batch("helius"))
+    assert limiter.throttled == 1
+    assert limiter.current_rate == pytest.approx(2.0)
+    assert "a" not in scheduler.last_enriched["helius"]
+    assert not scheduler.inflight["helius"]
+
+
+@pytest.mark.asyncio
+async def test_helius_errors_are_counted_not_marked_enriched(monkeypatch):
+    from src.bot.feeds import FeedAggregator
+
+    feeds = FeedAggregator()
+    feeds.tokens["a"] = TokenData(address="a")
+
+    async def failing(address):
+        raise httpx.ConnectError("down")
+
+    monkeypatch.setattr(feeds.helius, "get_holders", failing)
+    scheduler = EnrichmentScheduler(lambda: feeds.tokens)
+    limiter = scheduler.register("helius", feeds._enrich_helius, rate=4)
+    await scheduler.dispatch("helius", scheduler.next_batch("helius"))
+    assert limiter.errors == 1 and limiter.requests == 0
+    assert "a" not in scheduler.last_enriched["helius"]
+    await feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_malformed_holders_are_an_error_not_zero_holders(monkeypatch):
+    from src.bot.feeds import FeedAggregator
+
+    feeds = FeedAggregator()
+    feeds.tokens["a"] = TokenData(address="a", holders=250)
+
+    async def malformed(url, **kwargs):
+        return httpx.Response(200, content=b'{"total": "many"}', request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(feeds.helius.transport, "get", malformed)
+    scheduler = EnrichmentScheduler(lambda: feeds.tokens)
+    limiter = scheduler.register("helius", feeds._enrich_helius, rate=4)
+    await scheduler.dispatch("helius", scheduler.next_batch("helius"))
+    assert limiter.errors == 1 and feeds.tokens["a"].holders == 250
+    assert "a" not in scheduler.last_enriched["helius"]
+    await feeds.transport.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_worker_releases_inflight_batch():
+    tokens = {"a": TokenData(address="a")}
+
+    async def handler(batch):
+        pass
+
+    scheduler = EnrichmentScheduler(lambda: tokens)
+    limiter = scheduler.register("moralis", handler, rate=1)
+    limiter.bucket.pause(60)  # the worker picks a batch, then waits for a token
+    await scheduler.start()
+    await asyncio.sleep(0.05)
+    assert scheduler.inflight["moralis"] == {"a"}
+    await scheduler.stop()
+    assert not scheduler.inflight["moralis"]
+
+
+class CountingUniverse(dict):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.scans = 0
+
+    def items(self):
+        self.scans += 1
+        return super().items()
+
+
+@pytest.mark.asyncio
+async def test_batches_come_off_a_heap_weighted_by_score():
+    tokens = CountingUniverse({"hot": TokenData(address="hot", score=100), "cold": TokenData(address="cold")})
+    scheduler = EnrichmentScheduler(lambda: tokens, clock=FakeClock())
+
+    async def handler(batch):
+        pass
+
+    scheduler.register("helius", handler, rate=100)
+    picks = []
+    for _ in range(30):
+        batch = scheduler.next_batch("helius")
+        picks.extend(batch)
+        await scheduler.dispatch("helius", batch)
+    assert tokens.scans == 1  # the universe is only walked when it changes
+    assert picks.count("hot") == 2 * picks.count("cold")
+
+    tokens["new"] = TokenData(address="new")
+    assert scheduler.next_batch("helius") == ["new"]  # never enriched goes first
+    del tokens["cold"]
+    scheduler.forget("cold")
+    assert "cold" not in scheduler.next_batch("helius") + scheduler.next_batch("helius")
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_batches_in_flight():
+    tokens = {"a": TokenData(address="a")}
+    done = []
+
+    async def handler(batch):
+        await asyncio.sleep(0.05)
+        done.extend(batch)
+
+    scheduler = EnrichmentScheduler(lambda: tokens)
+    scheduler.register("moralis", handler, rate=100)
+    await scheduler.start()
+    await asyncio.sleep(0.01)
+    await scheduler.stop()
+    assert done == ["a"] and "a" in scheduler.last_enriched["moralis"]
+    assert not scheduler._dispatching
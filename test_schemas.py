@@ -0,0 +1,62 @@
+import json
+
+import msgspec
+import pytest
+
+from benchmarks.decoding import decode_dicts, decode_typed, response_body
+from src.api.schemas import decode_holders, decode_pairs, decode_prices
+from src.bot.feeds import deepest_pairs
+
+
+def pair(address: str, liquidity, price="1.5", chain="solana") -> dict:
+    return {
+        "chainId": chain,
+        "dexId": "raydium",
+        "baseToken": {"address": address, "symbol": "TK", "name": "Token"},
+        "priceUsd": price,
+        "volume": {"m5": 10, "h24": "200.5"},
+        "liquidity": {"usd": liquidity},
+        "priceChange": {"m5": -2.5},
+        "txns": {"m5": {"buys": 3, "sells": 1}},
+    }
+
+
+def test_pairs_decode_with_lax_numbers():
+    body = json.dumps({"pairs": [pair("a", 500), pair("b", None, price=None)]}).encode()
+    a, b = decode_pairs(body)
+    assert a.base_token.address == "a" and a.price_usd == 1.5
+    assert a.volume.h24 == 200.5 and a.liquidity_usd == 500.0
+    assert b.price_usd is None and b.liquidity_usd == 0.0
+    assert decode_pairs(b'{"schemaVersion": "1.0.0", "pairs": null}') == []
+
+
+def test_malformed_entries_are_dropped_alone():
+    body = json.dumps({"pairs": [pair("a", 1), pair("b", {"oops": 1}), pair("c", 2)]}).encode()
+    assert [p.base_token.address for p in decode_pairs(body)] == ["a", "c"]
+
+    prices = decode_prices(b'[{"tokenAddress": "a", "usdPrice": "0.25"}, {"tokenAddress": 7}]')
+    assert [(p.token_address, p.usd_price) for p in prices] == [("a", 0.25)]
+    assert decode_holders(b'{"total": 42, "items": []}').total == 42
+    with pytest.raises(msgspec.ValidationError):
+        decode_holders(b'{"total": "many"}')
+    with pytest.raises(msgspec.DecodeError):
+        decode_pairs(b'{"pairs": [')
+
+
+def test_deepest_pool_wins_and_other_chains_are_ignored():
+    body = json.dumps({"pairs": [
+        pair("a", 100), pair("a", 900, price="2"), pair("a", 5000, chain="bsc"), pair("z", 1),
+    ]}).encode()
+    best = deepest_pairs(decode_pairs(body), {"a"})
+    assert list(best) == ["a"] and best["a"].liquidity == 900.0 and best["a"].price == 2.0
+
+
+def test_typed_path_matches_dict_path():
+    body = response_body(50)
+    fields = ("address", "symbol", "price", "price_change_5m", "volume_5m", "volume_24h",
+              "liquidity", "created_at")
+
+    def rows(tokens):
+        return [tuple(getattr(t, f) for f in fields) for t in tokens]
+
+    assert rows(decode_typed(body)) == rows(decode_dicts(body))
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.main import create_app
+from src.bot.broadcast import StateBroadcaster
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import Position, TradingEngine
+
+
+def make_bot():
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    for i, score in enumerate((80, 60, 40)):
+        token = TokenData(address=f"mint{i}", symbol=f"M{i}", price=1.0, score=score)
+        feeds.tokens[token.address] = token
+        feeds.ranking.update(token.address, score)
+    publish(feeds, engine)
+    return feeds, engine
+
+
+def publish(feeds, engine):
+    feeds.publish_snapshot()
+    engine.publish_snapshot()
+
+
+def test_deltas_only_carry_changes():
+    feeds, engine = make_bot()
+    broadcaster = StateBroadcaster(feeds, engine, top=2)
+    first = json.loads(broadcaster.tick())
+    assert set(first["tokens"]["upsert"]) == {"mint0", "mint1"}
+    assert broadcaster.tick() is None  # nothing changed
+
+    feeds.tokens["mint1"].price = 2.0
+    feeds.ranking.update("mint0", 10)
+    engine.positions["mint2"] = Position(feeds.tokens["mint2"], 10.0, 10.0)
+    assert broadcaster.tick() is None  # not published yet
+    publish(feeds, engine)
+    delta = json.loads(broadcaster.tick())
+    assert delta["version"] == 2
+    assert set(delta["tokens"]["upsert"]) == {"mint1", "mint2"}
+    assert delta["tokens"]["remove"] == ["mint0"]
+    assert list(delta["positions"]["upsert"]) == ["mint2"]
+    assert "positions" in delta["stats"]["upsert"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_resynced():
+    feeds, engine = make_bot()
+    broadcaster = StateBroadcaster(feeds, engine)
+    subscriber = broadcaster.subscribe(maxsize=2)
+    for price in (2.0, 3.0, 4.0):
+        feeds.tokens["mint0"].price = price
+        publish(feeds, engine)
+        broadcaster.tick()
+    assert subscriber.resyncs == 1
+    # The backlog was replaced by the state at overflow, then deltas resume
+    snapshot = json.loads(await subscriber.get())
+    assert snapshot["type"] == "snapshot" and snapshot["version"] == 2
+    assert snapshot["tokens"]["mint0"]["price"] == 3.0
+    delta = json.loads(await subscriber.get())
+    assert delta["version"] == 3
+    assert delta["tokens"]["upsert"]["mint0"]["price"] == 4.0
+
+
+def test_websocket_and_state_endpoints():
+    feeds, engine = make_bot()
+    app = create_app(feeds, engine, start_bot=False)
+    broadcaster = app.state.broadcaster
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            snapshot = json.loads(ws.receive_text())
+            assert snapshot["type"] == "snapshot"
+            feeds.tokens["mint0"].price = 5.0
+            publish(feeds, engine)
+            broadcaster.tick()
+            delta = json.loads(ws.receive_text())
+            while "tokens" not in delta:  # the periodic tick may have sent stats first
+                delta = json.loads(ws.receive_text())
+            assert delta["tokens"]["upsert"]["mint0"]["price"] == 5.0
+        state = client.get("/state").json()
+        assert state["tokens"]["mint0"]["price"] == 5.0
+        assert not broadcaster.subscribers
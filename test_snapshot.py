@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.snapshot import RenderCache, Snapshot, jsonable
+from src.bot.trading import Position, TradingEngine
+
+
+def test_unchanged_content_keeps_version():
+    first = Snapshot().next({"tokens": [{"address": "a", "price": 1.0}]})
+    assert first.version == 1
+    assert first.next({"tokens": [{"address": "a", "price": 1.0}]}) is first
+    second = first.next({"tokens": [{"address": "a", "price": 2.0}]})
+    assert second.version == 2 and first["tokens"][0]["price"] == 1.0
+
+    with pytest.raises(TypeError):
+        second["tokens"][0]["price"] = 3.0
+    assert json.loads(json.dumps(second.data, default=jsonable)) == {
+        "tokens": [{"address": "a", "price": 2.0}]
+    }
+
+
+def test_render_cache_renders_once_per_version():
+    calls = []
+    cache = RenderCache(lambda s: calls.append(s.version) or f"v{s.version}")
+    snapshot = Snapshot().next({"x": 1})
+    assert cache.get(snapshot) == "v1" and cache.get(snapshot) == "v1"
+    assert cache.get(snapshot.next({"x": 2})) == "v2"
+    assert calls == [1, 2]
+
+
+def test_published_views_are_detached_from_live_state():
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    token = TokenData(address="mint", symbol="M", price=1.0, score=80)
+    feeds.tokens[token.address] = token
+    feeds.ranking.update(token.address, token.score)
+    engine.positions[token.address] = Position(token, 10.0, 10.0)
+
+    scanner, book = feeds.publish_snapshot(), engine.publish_snapshot()
+    token.price = 2.0
+    del engine.positions[token.address]
+    assert scanner["tokens"][0]["price"] == 1.0
+    assert book["positions"][0]["pnl"] == 0.0 and book["stats"]["positions"] == 1
+    assert feeds.publish_snapshot().version == 2
+    assert engine.publish_snapshot()["positions"] == ()
+
+
+def test_engine_version_moves_only_with_the_book():
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    token = TokenData(address="mint", symbol="M", price=1.0, score=80)
+    feeds.tokens[token.address] = token
+    engine.positions[token.address] = Position(token, 10.0, 10.0)
+
+    first = engine.publish_snapshot()
+    engine.monitor.last_update = 1.0  # price age and counters keep moving
+    engine.monitor.polls += 1
+    engine.decision_latency.append(0.001)
+    assert engine.publish_snapshot() is first
+    assert set(first["stats"]) == {
+        "positions", "total_invested", "open_pnl", "realized_pnl", "total_pnl", "roi_percent"
+    }
+
+    token.price = 1.5
+    assert engine.publish_snapshot().version == first.version + 1
@@ -0,0 +1,70 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.table import TokenTable
+
+
+def random_tokens(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    tokens = []
+    for i in range(n):
+        created = None if rng.random() < 0.2 else now - timedelta(hours=rng.uniform(0, 12))
+        tokens.append(TokenData(
+            address=f"mint{i}",
+            volume_5m=rng.choice([0, 5000, 10000, 20001, 50001, 100001, rng.uniform(0, 2e5)]),
+            price_change_5m=rng.choice([-5, 2, 2.5, 5, 20.5, 50.5, 100.5, rng.uniform(-50, 150)]),
+            liquidity=rng.choice([0, 10001, 20000, 20001, 50001, rng.uniform(0, 1e5)]),
+            created_at=created,
+        ))
+    return tokens
+
+
+def scalar_reference(tokens: list, now: datetime) -> dict:
+    feeds = FeedAggregator()
+    feeds.tokens = {t.address: t for t in tokens}
+    for token in tokens:
+        token.calculate_score(now)
+        token.analyze_opportunity()
+    feeds._detect_pump_opportunities()
+    return {t.address: (t.score, t.opportunity) for t in tokens}
+
+
+def test_vectorized_scoring_matches_scalar_rules():
+    now = datetime.utcnow()
+    expected = scalar_reference(random_tokens(2000), now)
+
+    table = TokenTable(capacity=16)  # forces growth
+    table.sync(random_tokens(2000))
+    table.score(now)
+    actual = {t.address: (t.score, t.opportunity) for t in table.tokens}
+    assert actual == expected
+
+
+def test_remove_keeps_rows_consistent():
+    table = TokenTable()
+    tokens = random_tokens(10)
+    table.sync(tokens)
+    table.remove("mint3")
+    table.remove("missing")
+    assert len(table) == 9
+    assert table.view("mint3") is None
+    assert table.view("mint9") is tokens[9]
+    row = table.index["mint9"]
+    assert table.volume_5m[row] == tokens[9].volume_5m
+
+
+def test_feed_aggregator_uses_table_for_dirty_tokens():
+    feeds = FeedAggregator()
+    feeds.table = TokenTable()
+    token = TokenData(address="a", volume_5m=150000, price_change_5m=12, liquidity=60000)
+    feeds.tokens["a"] = token
+    feeds._touch(["a"])
+    feeds._score_tokens()
+    assert token.score == 90  # 30 + 30 + 20 + 10 pump bonus
+    assert feeds.table.view("a") is token
@@ -0,0 +1,47 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.api.dexscreener import DexScreenerAPI
+from src.api.transport import HttpTransport
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    async def search(request: web.Request) -> web.Response:
+        return web.json_response({"pairs": [{"q": request.query.get("q")}]})
+
+    app = web.Application()
+    app.router.add_get("/latest/dex/search", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_transport_reuses_connections(local_server):
+    transport = HttpTransport()
+    for _ in range(3):
+        resp = await transport.get(f"{local_server}/latest/dex/search", params={"q": "x"})
+        assert resp.status_code == 200
+    stats = transport.connection_stats()[local_server]
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_clients_share_transport(local_server):
+    transport = HttpTransport()
+    api = DexScreenerAPI(transport=transport)
+    api.BASE_URL = f"{local_server}/latest"
+    assert await api.search_tokens("solana") == [{"q": "solana"}]
+    assert await api.search_tokens("bonk") == [{"q": "bonk"}]
+    await api.close()  # does not own the transport
+    assert transport.connection_stats()[local_server]["new_connections"] == 1
+    await transport.close()
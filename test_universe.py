@@ -0,0 +1,54 @@
+import time
+
+from src.bot.feeds import FeedAggregator, TokenData
+
+
+def make_feeds(n: int, **limits) -> FeedAggregator:
+    feeds = FeedAggregator()
+    for name, value in limits.items():
+        setattr(feeds, name, value)
+    for i in range(n):
+        feeds.tokens[f"m{i}"] = TokenData(address=f"m{i}", volume_5m=i * 1000.0, liquidity=i * 1000.0)
+    feeds._touch(list(feeds.tokens))
+    feeds._score_tokens()
+    return feeds
+
+
+def test_token_data_is_slotted():
+    token = TokenData(address="x")
+    assert not hasattr(token, "__dict__")
+
+
+def test_cap_evicts_lowest_scores_but_keeps_pinned():
+    feeds = make_feeds(100, max_tokens=10)
+    feeds.pin("m0")
+    scores = {a: t.score for a, t in feeds.tokens.items()}
+    feeds._evict()
+    assert len(feeds.tokens) == 10
+    assert "m0" in feeds.tokens  # lowest score, but held in a position
+    kept = [scores[a] for a in feeds.tokens if a != "m0"]
+    evicted = [s for a, s in scores.items() if a not in feeds.tokens]
+    assert min(kept) >= max(evicted)
+    assert "m1" not in feeds.tokens and "m1" not in feeds.ranking
+    assert feeds.evicted == 90
+
+
+def test_ttl_evicts_stale_tokens():
+    feeds = make_feeds(5, token_ttl=60)
+    feeds.pin("m1")
+    stale = time.monotonic() - 120
+    for address in ("m0", "m1", "m2"):
+        feeds._touched[address] = stale
+        feeds._touched.move_to_end(address, last=False)
+    feeds._evict()
+    assert set(feeds.tokens) == {"m1", "m3", "m4"}
+
+
+def test_memory_report_and_memory_cap():
+    feeds = make_feeds(50)
+    report = feeds.memory_report()
+    assert report["tokens"] == 50
+    assert report["bytes_per_token"] > 0
+    feeds.max_universe_mb = report["bytes_per_token"] * 20 / 1_000_000
+    feeds._evict()
+    assert len(feeds.tokens) <= 21
@@ -0,0 +1,178 @@
+import asyncio
+import base64
+import json
+
+import pytest
+import pytest_asyncio
+import websockets
+from aiohttp import web
+from solders.keypair import Keypair
+
+import src.bot.trading as trading
+from src.api.rpc import RpcPool
+from src.api.transport import HttpTransport
+from src.bot.config import Settings, load_keys, settings
+from src.bot.execution import SendResult
+from src.bot.feeds import FeedAggregator, TokenData
+from src.bot.trading import TradingEngine
+from src.bot.wallet import WalletService
+
+
+def secret(*keypairs: Keypair) -> str:
+    return json.dumps([list(bytes(kp)) for kp in keypairs])
+
+
+def test_keys_are_parsed_once():
+    first, second = Keypair(), Keypair()
+    config = Settings(sol_secret=json.dumps(list(bytes(first))))
+    misses = load_keys.cache_info().misses
+    assert config.public_key == str(first.pubkey())
+    assert config.keypair is config.keypair
+    assert load_keys.cache_info().misses == misses + 1
+
+    config.sol_secret = secret(first, second)
+    assert [str(kp.pubkey()) for kp in config.keypairs] == [str(first.pubkey()), str(second.pubkey())]
+    assert config.public_key == str(first.pubkey())
+    config.sol_secret = "not json"
+    assert config.keypair is None and config.keypairs == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_leases_spread_over_funded_wallets():
+    wallets = WalletService([Keypair(), Keypair(), Keypair()], min_lamports=1_000)
+    poor = wallets.wallets[2]
+    poor.lamports = 10
+    seen = []
+
+    async def swap():
+        async with wallets.lease() as wallet:
+            seen.append(wallet.pubkey)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(swap(), swap())
+    assert sorted(seen) == sorted(w.pubkey for w in wallets.wallets[:2])
+    assert poor.swaps == 0 and all(w.in_flight == 0 for w in wallets.wallets)
+
+    # Sells use the wallet that holds the tokens, even when it is busy
+    async with wallets.lease(wallets.wallets[0].pubkey) as first:
+        async with wallets.lease(wallets.wallets[0].pubkey) as again:
+            assert first is again and first.in_flight == 2
+
+    for wallet in wallets.wallets:
+        wallet.lamports = 0
+    async with wallets.lease() as wallet:
+        assert wallet is None
+
+
+class BalanceNode:
+    """getBalance over HTTP and accountSubscribe over WebSocket."""
+
+    def __init__(self) -> None:
+        self.balance_calls = []
+        self.sockets = {}
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.balance_calls.append(body["params"][0])
+        result = {"context": {"slot": 10}, "value": 1_000_000}
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    async def ws_handler(self, ws) -> None:
+        async for raw in ws:
+            msg = json.loads(raw)
+            subscription = 500 + msg["id"]
+            self.sockets[msg["params"][0]] = (ws, subscription)
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": subscription}))
+
+    async def push(self, pubkey: str, lamports: int, slot: int) -> None:
+        ws, subscription = self.sockets[pubkey]
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "subscription": subscription,
+                "result": {"context": {"slot": slot}, "value": {"lamports": lamports, "owner": "11111111111111111111111111111111"}},
+            },
+        }))
+
+
+@pytest_asyncio.fixture
+async def balance_node():
+    node = BalanceNode()
+    app = web.Application()
+    app.router.add_post("/", node.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    ws_server = await websockets.serve(node.ws_handler, "127.0.0.1", 0)
+    transport = HttpTransport()
+    node.rpc = RpcPool([f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"], transport)
+    node.ws_url = f"ws://127.0.0.1:{ws_server.sockets[0].getsockname()[1]}"
+    yield node
+    ws_server.close()
+    await ws_server.wait_closed()
+    await transport.close()
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_balances_follow_account_notifications(balance_node):
+    node = balance_node
+    wallets = WalletService([Keypair(), Keypair()], node.rpc, node.ws_url, min_lamports=500_000)
+    await wallets.start()
+    first, second = wallets.wallets
+    assert first.lamports == second.lamports == 1_000_000
+    while len(node.sockets) < 2:
+        await asyncio.sleep(0.01)
+
+    await node.push(first.pubkey, 200_000, slot=12)
+    await node.push(first.pubkey, 900_000, slot=11)  # older than what we have
+    await node.push(second.pubkey, 3_000_000, slot=12)
+    while wallets.notifications < 2:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    await wallets.stop()
+
+    assert first.lamports == 200_000 and second.lamports == 3_000_000
+    assert wallets.pick() is second  # the first one is below the minimum
+    assert len(node.balance_calls) == 2  # only the initial fetch
+    assert wallets.stats()["wallets"][0]["funded"] is False
+
+
+@pytest.mark.asyncio
+async def test_live_entries_use_different_wallets_and_exits_the_same(monkeypatch):
+    keypairs = [Keypair(), Keypair()]
+    monkeypatch.setattr(settings, "sol_secret", secret(*keypairs))
+    monkeypatch.setattr(settings, "live_trading", True)
+    payers = []
+
+    async def fake_quote(input_mint, output_mint, amount, transport=None):
+        return {"outAmount": str(amount)}
+
+    async def fake_swap_tx(quote, user_public_key, transport=None, compute_unit_price=None):
+        payers.append(user_public_key)
+        return {"swapTransaction": base64.b64encode(b"tx").decode()}
+
+    async def fake_submit(raw, keypair):
+        await asyncio.sleep(0.01)
+        return SendResult(f"sig{len(payers)}", landed=True, time_to_land=0.01, wallet=str(keypair.pubkey()))
+
+    monkeypatch.setattr(trading, "jup_quote", fake_quote)
+    monkeypatch.setattr(trading, "jup_swap_tx", fake_swap_tx)
+    feeds = FeedAggregator()
+    engine = TradingEngine(feeds)
+    monkeypatch.setattr(engine.sender, "submit", fake_submit)
+    tokens = [TokenData(address=a, symbol=a.upper(), price=1.0, decimals=6) for a in ("a", "b")]
+    for token in tokens:
+        feeds.tokens[token.address] = token
+
+    await asyncio.gather(*(engine._open_position(t) for t in tokens))
+    holders = {engine.positions[a].wallet for a in ("a", "b")}
+    assert holders == {str(kp.pubkey()) for kp in keypairs}
+
+    holder = engine.positions["b"].wallet
+    payers.clear()
+    await engine._close_position("b")
+    assert payers == [holder] and "b" not in engine.positions
+    await feeds.transport.close()